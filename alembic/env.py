@@ -18,7 +18,20 @@ if config.config_file_name is not None:
 # add your model's MetaData object here
 # for 'autogenerate' support
 from app.core.database import Base
-from app.models import refresh_token, role, task, user, user_role
+from app.models import (
+    archived_task,
+    refresh_token,
+    revoked_token,
+    role,
+    task,
+    task_counter,
+    task_daily_stat,
+    task_system_counter,
+    task_system_daily_stat,
+    task_tombstone,
+    user,
+    user_role,
+)
 
 target_metadata = Base.metadata
 
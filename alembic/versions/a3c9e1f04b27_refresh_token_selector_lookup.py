@@ -0,0 +1,53 @@
+"""add selector to refresh tokens for indexed lookup
+
+Revision ID: a3c9e1f04b27
+Revises: 7b41c7f2ead9
+Create Date: 2026-10-18 09:12:40.118204
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a3c9e1f04b27"
+down_revision: Union[str, Sequence[str], None] = "7b41c7f2ead9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing rows hold bcrypt hashes without a selector and can no longer be
+    # looked up, so they are revoked; affected clients simply log in again.
+    op.execute("DELETE FROM refresh_tokens")
+    op.add_column(
+        "refresh_tokens", sa.Column("selector", sa.String(length=32), nullable=False)
+    )
+    op.create_index(
+        op.f("ix_refresh_tokens_selector"), "refresh_tokens", ["selector"], unique=True
+    )
+    op.alter_column(
+        "refresh_tokens",
+        "token_hash",
+        type_=sa.String(length=64),
+        existing_type=sa.String(),
+        existing_nullable=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DELETE FROM refresh_tokens")
+    op.alter_column(
+        "refresh_tokens",
+        "token_hash",
+        type_=sa.String(),
+        existing_type=sa.String(length=64),
+        existing_nullable=False,
+    )
+    op.drop_index(op.f("ix_refresh_tokens_selector"), table_name="refresh_tokens")
+    op.drop_column("refresh_tokens", "selector")
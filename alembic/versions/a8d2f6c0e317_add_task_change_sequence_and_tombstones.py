@@ -0,0 +1,71 @@
+"""add task change sequence and tombstones for delta sync
+
+Revision ID: a8d2f6c0e317
+Revises: f7a1e3c95d20
+Create Date: 2026-10-18 19:12:40.318206
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a8d2f6c0e317"
+down_revision: Union[str, Sequence[str], None] = "f7a1e3c95d20"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing tasks start at 0, which a sync without a token still returns
+    op.add_column(
+        "tasks",
+        sa.Column("change_seq", sa.BigInteger(), server_default="0", nullable=False),
+    )
+    op.add_column(
+        "task_counters",
+        sa.Column("change_seq", sa.BigInteger(), server_default="0", nullable=False),
+    )
+    op.create_index(
+        "ix_tasks_user_id_change_seq_id",
+        "tasks",
+        ["user_id", "change_seq", "id"],
+        unique=False,
+    )
+    op.create_table(
+        "task_tombstones",
+        sa.Column("task_id", sa.UUID(), nullable=False),
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("change_seq", sa.BigInteger(), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("task_id"),
+    )
+    op.create_index(
+        "ix_task_tombstones_user_id_change_seq_task_id",
+        "task_tombstones",
+        ["user_id", "change_seq", "task_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_task_tombstones_deleted_at",
+        "task_tombstones",
+        ["deleted_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_task_tombstones_deleted_at", table_name="task_tombstones")
+    op.drop_index(
+        "ix_task_tombstones_user_id_change_seq_task_id", table_name="task_tombstones"
+    )
+    op.drop_table("task_tombstones")
+    op.drop_index("ix_tasks_user_id_change_seq_id", table_name="tasks")
+    op.drop_column("task_counters", "change_seq")
+    op.drop_column("tasks", "change_seq")
@@ -0,0 +1,75 @@
+"""create archived_tasks table for long-completed tasks
+
+Revision ID: b3e9c1d47f52
+Revises: a8d2f6c0e317
+Create Date: 2026-10-18 20:41:07.592114
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b3e9c1d47f52"
+down_revision: Union[str, Sequence[str], None] = "a8d2f6c0e317"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "archived_tasks",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("title", sa.String(length=200), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("is_completed", sa.Boolean(), nullable=False),
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("change_seq", sa.BigInteger(), server_default="0", nullable=False),
+        sa.Column("archived_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_archived_tasks_user_id_created_at_id",
+        "archived_tasks",
+        ["user_id", "created_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_archived_tasks_user_id_title_id",
+        "archived_tasks",
+        ["user_id", "title", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_archived_tasks_user_id_modified_at_id",
+        "archived_tasks",
+        ["user_id", sa.text("coalesce(updated_at, created_at)"), "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_tasks_completed_modified_at",
+        "tasks",
+        [sa.text("coalesce(updated_at, created_at)")],
+        unique=False,
+        postgresql_where=sa.text("is_completed IS true"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_tasks_completed_modified_at", table_name="tasks")
+    op.drop_index(
+        "ix_archived_tasks_user_id_modified_at_id", table_name="archived_tasks"
+    )
+    op.drop_index("ix_archived_tasks_user_id_title_id", table_name="archived_tasks")
+    op.drop_index(
+        "ix_archived_tasks_user_id_created_at_id", table_name="archived_tasks"
+    )
+    op.drop_table("archived_tasks")
@@ -0,0 +1,32 @@
+"""index tasks on (user_id, created_at, id)
+
+Revision ID: b6e3d0a58f19
+Revises: f2d86b1c47a0
+Create Date: 2026-10-18 14:02:51.318204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b6e3d0a58f19"
+down_revision: Union[str, Sequence[str], None] = "f2d86b1c47a0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_tasks_user_id_created_at_id",
+        "tasks",
+        ["user_id", "created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_tasks_user_id_created_at_id", table_name="tasks")
@@ -0,0 +1,62 @@
+"""add task statistics rollup tables
+
+Revision ID: c71f4a9e20b8
+Revises: b3e9c1d47f52
+Create Date: 2026-10-18 21:58:33.104527
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c71f4a9e20b8"
+down_revision: Union[str, Sequence[str], None] = "b3e9c1d47f52"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "task_counters",
+        sa.Column("archived", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.create_table(
+        "task_daily_stats",
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("created", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("completed", sa.Integer(), server_default="0", nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id", "day"),
+    )
+    op.create_table(
+        "task_system_counters",
+        sa.Column("shard", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("total", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("completed", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("archived", sa.Integer(), server_default="0", nullable=False),
+        sa.PrimaryKeyConstraint("shard"),
+    )
+    op.create_table(
+        "task_system_daily_stats",
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("shard", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("created", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("completed", sa.Integer(), server_default="0", nullable=False),
+        sa.PrimaryKeyConstraint("day", "shard"),
+    )
+    # The reconciliation job fills task_counters.archived and the system
+    # counters on its first run; daily history starts from the upgrade
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("task_system_daily_stats")
+    op.drop_table("task_system_counters")
+    op.drop_table("task_daily_stats")
+    op.drop_column("task_counters", "archived")
@@ -0,0 +1,32 @@
+"""add token_version to users
+
+Revision ID: c81f2d6a9e53
+Revises: a3c9e1f04b27
+Create Date: 2026-10-18 10:02:11.530917
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c81f2d6a9e53"
+down_revision: Union[str, Sequence[str], None] = "a3c9e1f04b27"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "users",
+        sa.Column("token_version", sa.Integer(), nullable=False, server_default="0"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("users", "token_version")
@@ -0,0 +1,48 @@
+"""create task_counters table
+
+Revision ID: d93a5c7e21f4
+Revises: b6e3d0a58f19
+Create Date: 2026-10-18 14:47:19.804415
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d93a5c7e21f4"
+down_revision: Union[str, Sequence[str], None] = "b6e3d0a58f19"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "task_counters",
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("total", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("completed", sa.Integer(), server_default="0", nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id"),
+    )
+    # Backfill every existing user from the tasks table
+    op.execute(
+        """
+        INSERT INTO task_counters (user_id, total, completed)
+        SELECT users.id,
+               COUNT(tasks.id),
+               COUNT(tasks.id) FILTER (WHERE tasks.is_completed)
+        FROM users
+        LEFT JOIN tasks ON tasks.user_id = users.id
+        GROUP BY users.id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("task_counters")
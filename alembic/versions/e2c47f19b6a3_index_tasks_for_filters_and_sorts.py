@@ -0,0 +1,45 @@
+"""index tasks for list filters and sorts
+
+Revision ID: e2c47f19b6a3
+Revises: d93a5c7e21f4
+Create Date: 2026-10-18 16:20:44.107392
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e2c47f19b6a3"
+down_revision: Union[str, Sequence[str], None] = "d93a5c7e21f4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_tasks_user_id_is_completed_created_at_id",
+        "tasks",
+        ["user_id", "is_completed", "created_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_tasks_user_id_title_id", "tasks", ["user_id", "title", "id"], unique=False
+    )
+    op.create_index(
+        "ix_tasks_user_id_modified_at_id",
+        "tasks",
+        ["user_id", sa.text("coalesce(updated_at, created_at)"), "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_tasks_user_id_modified_at_id", table_name="tasks")
+    op.drop_index("ix_tasks_user_id_title_id", table_name="tasks")
+    op.drop_index("ix_tasks_user_id_is_completed_created_at_id", table_name="tasks")
@@ -0,0 +1,32 @@
+"""index refresh_tokens.expires_at for the expiry sweeper
+
+Revision ID: e4b7a2c913d8
+Revises: c81f2d6a9e53
+Create Date: 2026-10-18 11:20:54.402716
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e4b7a2c913d8"
+down_revision: Union[str, Sequence[str], None] = "c81f2d6a9e53"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        op.f("ix_refresh_tokens_expires_at"),
+        "refresh_tokens",
+        ["expires_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_refresh_tokens_expires_at"), table_name="refresh_tokens")
@@ -0,0 +1,19 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_db
+from app.dependencies.rbac import require_admin
+from app.schemas.task import TaskStats
+from app.schemas.user import Principal
+from app.services.stats_service import get_system_task_stats
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+@router.get("/stats", response_model=TaskStats)
+async def get_system_stats(
+    days: int = Query(30, ge=1, le=366, description="Days of daily counts"),
+    _: Principal = Depends(require_admin()),
+    db: AsyncSession = Depends(get_db),
+):
+    return await get_system_task_stats(db, days)
@@ -1,12 +1,28 @@
+from typing import Optional
+
 from fastapi import APIRouter, Depends, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
-from app.dependencies.auth import get_current_user
-from app.schemas.token import RefreshTokenRequest, Token
-from app.schemas.user import User, UserCreate
-from app.services.auth_service import authenticate_user, refresh_access_token
+from app.dependencies.auth import (
+    get_client_ip,
+    get_current_principal,
+    get_token_payload,
+)
+from app.schemas.token import (
+    LogoutRequest,
+    RefreshTokenRequest,
+    RevokeTokenRequest,
+    Token,
+)
+from app.schemas.user import Principal, User, UserCreate
+from app.services.auth_service import (
+    authenticate_user,
+    logout,
+    refresh_access_token,
+    revoke_access_token,
+)
 from app.services.user_service import create_user
 
 router = APIRouter(prefix="/auth", tags=["auth"])
@@ -14,9 +30,13 @@ router = APIRouter(prefix="/auth", tags=["auth"])
 
 @router.post("/login", status_code=status.HTTP_200_OK, response_model=Token)
 async def handle_login(
-    form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    client_ip: Optional[str] = Depends(get_client_ip),
+    db: AsyncSession = Depends(get_db),
 ):
-    return await authenticate_user(db, form_data.username, form_data.password)
+    return await authenticate_user(
+        db, form_data.username, form_data.password, client_ip=client_ip
+    )
 
 
 @router.post("/refresh", status_code=status.HTTP_200_OK, response_model=Token)
@@ -29,3 +49,22 @@ async def handle_refresh_token(
 @router.post("/register", status_code=status.HTTP_201_CREATED, response_model=User)
 async def handle_register(user: UserCreate, db: AsyncSession = Depends(get_db)):
     return await create_user(user, db)
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def handle_logout(
+    request: Optional[LogoutRequest] = None,
+    payload: dict = Depends(get_token_payload),
+    db: AsyncSession = Depends(get_db),
+):
+    refresh_token = request.refresh_token if request else None
+    await logout(db, payload, refresh_token=refresh_token)
+
+
+@router.post("/revoke", status_code=status.HTTP_204_NO_CONTENT)
+async def handle_revoke(
+    request: RevokeTokenRequest,
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
+):
+    await revoke_access_token(db, request.token, current_user)
@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends, status
+
+from app.core.background import jobs
+from app.core.cache import principal_cache
+from app.core.events import task_events
+from app.core.rate_limit import login_shield
+from app.core.response_cache import task_list_cache
+from app.core.security import password_hashing_params
+from app.core.workers import hashing_pool
+from app.dependencies.rbac import require_admin
+from app.schemas.user import Principal
+from app.services.archive_service import task_archiver
+from app.services.revocation_service import revocation_list
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@router.get("/", status_code=status.HTTP_200_OK)
+async def get_metrics(_: Principal = Depends(require_admin())):
+    return {
+        "hashing_pool": hashing_pool.stats(),
+        "password_hashing": password_hashing_params,
+        "login_shield": login_shield.stats(),
+        "revocation_filter": revocation_list.stats(),
+        "principal_cache": principal_cache.stats(),
+        "task_list_cache": task_list_cache.stats(),
+        "task_events": task_events.stats(),
+        "task_archive": task_archiver.stats(),
+        "background_jobs": {name: job.stats() for name, job in jobs.items()},
+    }
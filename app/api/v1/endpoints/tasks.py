@@ -1,55 +1,390 @@
+import asyncio
+import json
 import math
+import time
+from datetime import datetime
+from typing import List, Literal, Optional
+from urllib.parse import urlencode
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.core.database import get_db
-from app.dependencies.auth import get_current_user
+from app.core.config import settings
+from app.core.database import get_db, get_session_factory
+from app.core.etag import etag_matches
+from app.core.events import CLOSED, RESYNC, task_events
+from app.core.response_cache import task_list_cache
+from app.dependencies.auth import (
+    get_current_principal,
+    get_token_payload,
+    token_still_valid,
+)
 from app.dependencies.rbac import require_admin
 from app.schemas.task import (
     PaginatedTaskResponse,
     PaginationMeta,
     Task,
+    TaskBulkCreate,
+    TaskBulkDelete,
+    TaskBulkResponse,
+    TaskBulkUpdate,
+    TaskChanges,
     TaskCreate,
+    TaskFilter,
+    TaskImportResult,
+    TaskSort,
+    TaskStats,
     TaskUpdate,
+    UserTaskPage,
+    UserTaskPages,
 )
-from app.schemas.user import User
+from app.schemas.user import Principal
+from app.services.stats_service import get_user_task_stats
 from app.services.task_service import (
     create_task,
+    create_tasks_bulk,
     delete_task,
+    delete_tasks_bulk,
+    encode_task_cursor,
     get_task_by_id,
+    get_task_changes,
+    get_tasks_by_ids,
     get_tasks_by_user,
+    get_tasks_for_users,
+    import_tasks,
     mark_task_completed,
     mark_task_incomplete,
+    search_tasks,
+    stream_tasks_export,
+    task_etag,
+    task_list_etag,
     update_task,
+    update_tasks_bulk,
 )
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
+CURSOR_DESCRIPTION = "Opaque cursor from meta.next_cursor; takes precedence over page"
+
+
+def task_filters(
+    is_completed: Optional[bool] = Query(None),
+    created_after: Optional[datetime] = Query(None),
+    created_before: Optional[datetime] = Query(None),
+    updated_after: Optional[datetime] = Query(
+        None, description="Last modified at or after (creation if never updated)"
+    ),
+    updated_before: Optional[datetime] = Query(None),
+    title_prefix: Optional[str] = Query(
+        None, min_length=1, max_length=200, description="Case-sensitive"
+    ),
+    sort: TaskSort = Query(TaskSort.created_at),
+    order: Literal["asc", "desc"] = Query("desc"),
+    include_archived: bool = Query(
+        False, description="Also list long-completed tasks moved to the archive"
+    ),
+) -> TaskFilter:
+    return TaskFilter(
+        is_completed=is_completed,
+        created_after=created_after,
+        created_before=created_before,
+        updated_after=updated_after,
+        updated_before=updated_before,
+        title_prefix=title_prefix,
+        sort=sort,
+        order=order,
+        include_archived=include_archived,
+    )
+
+
+def _page_meta(
+    tasks, total: int, page: Optional[int], size: int, filters: TaskFilter
+) -> PaginationMeta:
+    return PaginationMeta(
+        page=page,
+        size=size,
+        total=total,
+        pages=math.ceil(total / size) if total > 0 else 1,
+        next_cursor=(
+            encode_task_cursor(tasks[-1], filters.sort) if len(tasks) == size else None
+        ),
+    )
+
+
+async def _paginated_tasks(
+    user_id: UUID,
+    db: AsyncSession,
+    page: int,
+    size: int,
+    cursor: Optional[str],
+    filters: TaskFilter,
+) -> PaginatedTaskResponse:
+    tasks, total = await get_tasks_by_user(
+        user_id, db, page, size, cursor=cursor, filters=filters
+    )
+    return PaginatedTaskResponse(
+        items=list(tasks),
+        meta=_page_meta(
+            tasks, total, None if cursor is not None else page, size, filters
+        ),
+    )
+
 
 @router.post("/", response_model=Task, status_code=status.HTTP_201_CREATED)
 async def create_user_task(
     task: TaskCreate,
-    current_user: User = Depends(get_current_user),
+    response: Response,
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
-    return await create_task(task, current_user.id, db)
+    db_task = await create_task(task, current_user.id, db)
+    response.headers["ETag"] = task_etag(db_task)
+    return db_task
 
 
 @router.get("/", response_model=PaginatedTaskResponse)
 async def get_user_tasks(
+    request: Request,
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(10, ge=1, le=100, description="Page size"),
-    current_user: User = Depends(get_current_user),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    ids: Optional[List[UUID]] = Query(
+        None, description="Fetch exactly these tasks (repeat the parameter)"
+    ),
+    filters: TaskFilter = Depends(task_filters),
+    if_none_match: Optional[str] = Header(None),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
-    tasks, total = await get_tasks_by_user(current_user.id, db, page, size)
-    pages = math.ceil(total / size) if total > 0 else 1
+    variant = urlencode(sorted(request.query_params.multi_items()))
+    # Both the cache key and the tag are taken before the page is read, so a
+    # concurrent write can only make them older than the body, never newer
+    cache_key = await task_list_cache.key(current_user.id, variant)
+    cached = await task_list_cache.get(cache_key)
+    if cached is not None:
+        etag, body = cached.decode().split("\n", 1)
+    else:
+        etag, body = await task_list_etag(current_user.id, db, variant), None
+    if etag_matches(if_none_match, etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+        )
+
+    if body is None:
+        if ids:
+            tasks = await get_tasks_by_ids(ids, current_user.id, db)
+            result = PaginatedTaskResponse(
+                items=tasks,
+                meta=PaginationMeta(
+                    page=None, size=len(ids), total=len(tasks), pages=1
+                ),
+            )
+        else:
+            result = await _paginated_tasks(
+                current_user.id, db, page, size, cursor, filters
+            )
+        body = result.model_dump_json()
+        await task_list_cache.set(cache_key, f"{etag}\n{body}".encode())
+    return Response(body, media_type="application/json", headers={"ETag": etag})
+
 
+@router.get("/search", response_model=PaginatedTaskResponse)
+async def search_user_tasks(
+    q: str = Query(..., min_length=1, max_length=200, description="Search terms"),
+    size: int = Query(10, ge=1, le=100, description="Page size"),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
+):
+    tasks, total, next_cursor = await search_tasks(
+        current_user.id, q, db, size=size, cursor=cursor
+    )
     return PaginatedTaskResponse(
         items=list(tasks),
-        meta=PaginationMeta(page=page, size=size, total=total, pages=pages),
+        meta=PaginationMeta(
+            page=None,
+            size=size,
+            total=total,
+            pages=math.ceil(total / size) if total > 0 else 1,
+            next_cursor=next_cursor,
+        ),
+    )
+
+
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_user_tasks(
+    export_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    current_user: Principal = Depends(get_current_principal),
+    session_factory: async_sessionmaker = Depends(get_session_factory),
+):
+    async def body():
+        async with session_factory() as db:
+            async for chunk in stream_tasks_export(current_user.id, db, export_format):
+                yield chunk
+
+    return StreamingResponse(
+        body(),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="tasks.{export_format}"'
+        },
+    )
+
+
+@router.get("/stats", response_model=TaskStats)
+async def get_user_task_stats_endpoint(
+    days: int = Query(30, ge=1, le=366, description="Days of daily counts"),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
+):
+    return await get_user_task_stats(current_user.id, db, days)
+
+
+@router.get("/changes", response_model=TaskChanges)
+async def get_task_changes_since(
+    since: Optional[str] = Query(
+        None, description="sync_token from the previous response; omit for a full sync"
+    ),
+    size: int = Query(100, ge=1, le=1000, description="Most changes per response"),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
+):
+    return await get_task_changes(current_user.id, db, since=since, size=size)
+
+
+def _sse(event: dict) -> bytes:
+    return f"event: {event['type']}\ndata: {json.dumps(event)}\n\n".encode()
+
+
+@router.get("/stream", response_class=StreamingResponse)
+async def stream_task_changes(
+    payload: dict = Depends(get_token_payload),
+    current_user: Principal = Depends(get_current_principal),
+    session_factory: async_sessionmaker = Depends(get_session_factory),
+):
+    if task_events.full:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many open task streams, please retry shortly",
+            headers={"Retry-After": "5"},
+        )
+
+    # The token is checked again on every heartbeat and the stream ends when
+    # it expires; the client reconnects with a fresh one
+    expires_at = payload["exp"]
+
+    async def body():
+        async with task_events.subscribe(current_user.id) as subscription:
+            yield b": connected\n\n"
+            while True:
+                remaining = expires_at - time.time()
+                if remaining <= 0:
+                    yield _sse(CLOSED)
+                    return
+                try:
+                    event = await asyncio.wait_for(
+                        subscription.get(),
+                        min(settings.TASK_EVENTS_HEARTBEAT_SECONDS, remaining),
+                    )
+                except asyncio.TimeoutError:
+                    if time.time() >= expires_at:
+                        continue
+                    async with session_factory() as db:
+                        valid = await token_still_valid(payload, db)
+                    if not valid:
+                        yield _sse(CLOSED)
+                        return
+                    # Keeps proxies from closing an idle connection
+                    yield b": keep-alive\n\n"
+                    continue
+                yield _sse(event)
+                # After a resync the client reloads its lists and reconnects
+                if event in (RESYNC, CLOSED):
+                    return
+
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/import", response_model=TaskImportResult)
+async def import_user_tasks(
+    request: Request,
+    import_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
+):
+    # Raw NDJSON/CSV body, validated as it arrives and spooled before loading
+    return await import_tasks(request.stream(), current_user.id, db, import_format)
+
+
+@router.post("/bulk", response_model=TaskBulkResponse)
+async def bulk_create_tasks(
+    payload: TaskBulkCreate,
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
+):
+    results = await create_tasks_bulk(payload.items, current_user.id, db)
+    return TaskBulkResponse(results=results)
+
+
+@router.patch("/bulk", response_model=TaskBulkResponse)
+async def bulk_update_tasks(
+    payload: TaskBulkUpdate,
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
+):
+    results = await update_tasks_bulk(payload.items, current_user.id, db)
+    return TaskBulkResponse(results=results)
+
+
+@router.post("/bulk/delete", response_model=TaskBulkResponse)
+async def bulk_delete_tasks(
+    payload: TaskBulkDelete,
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
+):
+    results = await delete_tasks_bulk(payload.ids, current_user.id, db)
+    return TaskBulkResponse(results=results)
+
+
+@router.get("/users", response_model=UserTaskPages)
+async def admin_get_users_tasks(
+    user_ids: List[UUID] = Query(
+        ..., min_length=1, description="Users to list (repeat the parameter)"
+    ),
+    size: int = Query(10, ge=1, le=100, description="Tasks per user"),
+    filters: TaskFilter = Depends(task_filters),
+    _: Principal = Depends(require_admin()),
+    db: AsyncSession = Depends(get_db),
+):
+    pages, round_trips = await get_tasks_for_users(user_ids, db, size, filters)
+    return UserTaskPages(
+        results=[
+            UserTaskPage(
+                user_id=user_id,
+                items=tasks,
+                meta=_page_meta(tasks, total, 1, size, filters),
+            )
+            for user_id, (tasks, total) in pages.items()
+        ],
+        round_trips=round_trips,
     )
 
 
@@ -58,27 +393,32 @@ async def admin_get_user_tasks(
     user_id: UUID,
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(10, ge=1, le=100, description="Page size"),
-    _: User = Depends(require_admin()),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    filters: TaskFilter = Depends(task_filters),
+    _: Principal = Depends(require_admin()),
     db: AsyncSession = Depends(get_db),
 ):
-    tasks, total = await get_tasks_by_user(user_id, db, page, size)
-    pages = math.ceil(total / size) if total > 0 else 1
-
-    return PaginatedTaskResponse(
-        items=list(tasks),
-        meta=PaginationMeta(page=page, size=size, total=total, pages=pages),
-    )
+    return await _paginated_tasks(user_id, db, page, size, cursor, filters)
 
 
 @router.get("/{task_id}", response_model=Task)
 async def get_user_task(
     task_id: UUID,
-    current_user: User = Depends(get_current_user),
+    response: Response,
+    include_archived: bool = Query(False),
+    if_none_match: Optional[str] = Header(None),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
-    task = await get_task_by_id(task_id, current_user.id, db)
+    task = await get_task_by_id(task_id, current_user.id, db, include_archived)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
+    etag = task_etag(task)
+    if etag_matches(if_none_match, etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+        )
+    response.headers["ETag"] = etag
     return task
 
 
@@ -86,16 +426,24 @@ async def get_user_task(
 async def update_user_task(
     task_id: UUID,
     task_update: TaskUpdate,
-    current_user: User = Depends(get_current_user),
+    response: Response,
+    if_match: Optional[str] = Header(
+        None, description="ETag from a previous read; 412 if the task changed since"
+    ),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
-    return await update_task(task_id, task_update, current_user.id, db)
+    db_task = await update_task(
+        task_id, task_update, current_user.id, db, if_match=if_match
+    )
+    response.headers["ETag"] = task_etag(db_task)
+    return db_task
 
 
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_user_task(
     task_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     await delete_task(task_id, current_user.id, db)
@@ -104,16 +452,22 @@ async def delete_user_task(
 @router.patch("/{task_id}/complete", response_model=Task)
 async def complete_task(
     task_id: UUID,
-    current_user: User = Depends(get_current_user),
+    response: Response,
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
-    return await mark_task_completed(task_id, current_user.id, db)
+    db_task = await mark_task_completed(task_id, current_user.id, db)
+    response.headers["ETag"] = task_etag(db_task)
+    return db_task
 
 
 @router.patch("/{task_id}/incomplete", response_model=Task)
 async def incomplete_task(
     task_id: UUID,
-    current_user: User = Depends(get_current_user),
+    response: Response,
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
-    return await mark_task_incomplete(task_id, current_user.id, db)
+    db_task = await mark_task_incomplete(task_id, current_user.id, db)
+    response.headers["ETag"] = task_etag(db_task)
+    return db_task
@@ -6,7 +6,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
 from app.dependencies.auth import get_current_user
 from app.dependencies.rbac import require_admin
-from app.schemas.user import User, UserUpdate
+from app.schemas.user import Principal, User, UserUpdate
 from app.services.user_service import (
     delete_user,
     get_all_users,
@@ -19,7 +19,7 @@ router = APIRouter(prefix="/users", tags=["users"])
 
 @router.get("/", response_model=list[User])
 async def get_users(
-    db: AsyncSession = Depends(get_db), _: User = Depends(require_admin())
+    db: AsyncSession = Depends(get_db), _: Principal = Depends(require_admin())
 ):
     return await get_all_users(db)
 
@@ -33,7 +33,7 @@ async def handle_get_current_user(current_user: User = Depends(get_current_user)
 async def get_user_by_id_endpoint(
     user_id: UUID,
     db: AsyncSession = Depends(get_db),
-    _: User = Depends(require_admin()),
+    _: Principal = Depends(require_admin()),
 ):
     user = await get_user_by_id(user_id, db)
     if not user:
@@ -46,7 +46,7 @@ async def update_user_endpoint(
     user_id: UUID,
     user_update: UserUpdate,
     db: AsyncSession = Depends(get_db),
-    _: User = Depends(require_admin()),
+    _: Principal = Depends(require_admin()),
 ):
     return await update_user(user_id, user_update, db)
 
@@ -55,6 +55,6 @@ async def update_user_endpoint(
 async def delete_user_endpoint(
     user_id: UUID,
     db: AsyncSession = Depends(get_db),
-    _: User = Depends(require_admin()),
+    _: Principal = Depends(require_admin()),
 ):
     await delete_user(user_id, db)
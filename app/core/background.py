@@ -0,0 +1,161 @@
+import asyncio
+import logging
+import zlib
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+
+class LeaderLock:
+    """
+    The process's claim to run single_leader jobs: one Postgres session-level
+    advisory lock, held on one connection that every such job checks, so the
+    leader worker keeps a single connection out of the pool however many jobs
+    it runs. If the holder dies its connection closes, the lock is released
+    and another worker takes over on its next tick.
+    """
+
+    def __init__(self, key: int):
+        self.key = key
+        self._connection: Optional[AsyncConnection] = None
+        # Jobs tick concurrently; only one of them may open the connection
+        self._guard = asyncio.Lock()
+
+    @property
+    def held(self) -> bool:
+        return self._connection is not None
+
+    async def acquire(self, engine: AsyncEngine) -> bool:
+        async with self._guard:
+            if self._connection is not None:
+                try:
+                    await self._connection.execute(text("SELECT 1"))
+                    await self._connection.commit()
+                    return True
+                except Exception:
+                    logger.warning("Lost the periodic job leader connection")
+                    await self.release()
+
+            connection = await engine.connect()
+            acquired = False
+            try:
+                result = await connection.execute(
+                    text("SELECT pg_try_advisory_lock(:key)"), {"key": self.key}
+                )
+                acquired = bool(result.scalar())
+                # The lock is session level, so it outlives this transaction
+                await connection.commit()
+            finally:
+                if acquired:
+                    self._connection = connection
+                else:
+                    await connection.close()
+            return acquired
+
+    async def release(self) -> None:
+        if self._connection is not None:
+            try:
+                await self._connection.close()
+            except Exception:
+                pass
+            self._connection = None
+
+
+# Shared by every single_leader job in this process
+leader_lock = LeaderLock(key=zlib.crc32(b"periodic_jobs"))
+
+
+class PeriodicJob:
+    """
+    Runs an async job every interval seconds from the app lifespan.
+
+    With single_leader set, only one process across all uvicorn workers (and
+    hosts) runs the job: the one holding the process-wide LeaderLock, which
+    then runs every single_leader job. Other databases have no advisory
+    locks, so there every process counts as the leader.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        interval: float,
+        job: Callable[[], Awaitable[Any]],
+        engine: Optional[AsyncEngine] = None,
+        single_leader: bool = False,
+        lock: Optional[LeaderLock] = None,
+    ):
+        self.name = name
+        self.interval = interval
+        self.job = job
+        self.engine = engine
+        self.single_leader = single_leader
+        self.lock = lock or leader_lock
+        self._task: Optional[asyncio.Task] = None
+        self.runs = 0
+        self.failures = 0
+        self.last_result: Any = None
+        self.total: int = 0
+
+    async def _is_leader(self) -> bool:
+        if not self.single_leader or self.engine is None:
+            return True
+        if self.engine.dialect.name != "postgresql":
+            return True
+        return await self.lock.acquire(self.engine)
+
+    async def run_once(self) -> Any:
+        if not await self._is_leader():
+            return None
+        result = await self.job()
+        self.runs += 1
+        self.last_result = result
+        if isinstance(result, int):
+            self.total += result
+        logger.info("Job %s finished: %s", self.name, result)
+        return result
+
+    async def _run_forever(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.failures += 1
+                logger.exception("Job %s failed", self.name)
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run_forever(), name=self.name)
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "interval_seconds": self.interval,
+            "leader": self.lock.held or not self.single_leader,
+            "runs": self.runs,
+            "failures": self.failures,
+            "last_result": self.last_result,
+            "total": self.total,
+        }
+
+
+# Jobs started by the app lifespan, by name
+jobs: Dict[str, PeriodicJob] = {}
+
+
+def register_job(job: PeriodicJob) -> PeriodicJob:
+    jobs[job.name] = job
+    return job
@@ -1,9 +1,13 @@
+from typing import Optional
+
 from pydantic_settings import BaseSettings
 
 
 class Settings(BaseSettings):
     APP_NAME: str = "Secure Tracker API"
     ENV: str = "development"
+    # Uvicorn worker processes (scripts/entrypoint.sh passes it to --workers)
+    WEB_CONCURRENCY: int = 1
     DB_NAME: str = "secure_tracker"
     DB_HOST: str = "localhost"
     DB_PORT: int = 5432
@@ -12,8 +16,119 @@ class Settings(BaseSettings):
 
     # JWT
     SECRET_KEY: str = "some_scret"
+    # Token codec backend: "hs256" (built in), "jose" or "pyjwt"
+    JWT_BACKEND: str = "hs256"
     ACCESS_TOKEN_EXPIRE_MINS: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    # Embed role names and token version in access tokens so authorization
+    # does not need to load the user and roles from the database
+    ACCESS_TOKEN_EMBED_CLAIMS: bool = False
+
+    # Password hashing: "bcrypt" or "argon2" (argon2 needs argon2-cffi installed).
+    # With PASSWORD_HASH_TARGET_MS set, the cost is calibrated at startup so one
+    # hash takes about that long on the current machine.
+    PASSWORD_HASH_SCHEME: str = "bcrypt"
+    PASSWORD_HASH_TARGET_MS: Optional[float] = None
+    BCRYPT_ROUNDS: int = 12
+    BCRYPT_MIN_ROUNDS: int = 10
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_KIB: int = 65536
+    ARGON2_PARALLELISM: int = 1
+
+    # Login throttling per email and per client IP, checked before hashing.
+    # "memory" keeps state per worker; "redis" shares it (needs REDIS_URL).
+    LOGIN_SHIELD_ENABLED: bool = True
+    LOGIN_SHIELD_BACKEND: str = "memory"
+    LOGIN_EMAIL_BURST: int = 5
+    LOGIN_EMAIL_PER_MINUTE: float = 5.0
+    LOGIN_IP_BURST: int = 20
+    LOGIN_IP_PER_MINUTE: float = 60.0
+    LOGIN_FREE_FAILURES: int = 3
+    LOGIN_BACKOFF_BASE_SECONDS: float = 1.0
+    LOGIN_BACKOFF_MAX_SECONDS: float = 300.0
+    LOGIN_FAILURE_WINDOW_SECONDS: float = 900.0
+    # Use X-Real-IP (set by nginx) as the client address
+    TRUST_PROXY_HEADERS: bool = False
+    REDIS_URL: Optional[str] = None
+
+    # Password hashing worker pool ("thread" or "process")
+    HASHING_POOL_KIND: str = "thread"
+    HASHING_POOL_WORKERS: int = 4
+    HASHING_POOL_MAX_QUEUE: int = 64
+
+    # Cache of authenticated users used by get_current_user
+    PRINCIPAL_CACHE_ENABLED: bool = True
+    PRINCIPAL_CACHE_SIZE: int = 10000
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 30.0
+    # How long a worker trusts a user's token version before re-reading it
+    TOKEN_VERSION_CACHE_TTL_SECONDS: float = 5.0
+
+    # Background deletion of expired refresh tokens (one worker at a time)
+    REFRESH_TOKEN_SWEEP_ENABLED: bool = True
+    REFRESH_TOKEN_SWEEP_INTERVAL_SECONDS: float = 300.0
+    REFRESH_TOKEN_SWEEP_BATCH_SIZE: int = 1000
+    REFRESH_TOKEN_SWEEP_MAX_BATCHES: int = 100
+
+    # Revoked access tokens: per-worker Bloom filter rebuilt from the database
+    REVOCATION_FILTER_CAPACITY: int = 100000
+    REVOCATION_FILTER_ERROR_RATE: float = 0.001
+    REVOCATION_FILTER_REFRESH_SECONDS: float = 30.0
+
+    # Serialized GET /tasks/ pages per user, retired by any task write.
+    # "memory" is per worker, so another worker would serve a page (and a 304)
+    # up to the TTL old; it is refused when WEB_CONCURRENCY > 1. "redis" shares
+    # pages and invalidations (needs REDIS_URL).
+    TASK_LIST_CACHE_ENABLED: bool = False
+    TASK_LIST_CACHE_BACKEND: str = "memory"
+    TASK_LIST_CACHE_SIZE: int = 10000
+    TASK_LIST_CACHE_TTL_SECONDS: float = 5.0
+
+    # Task change feed (GET /tasks/stream). "postgres" fans events out to
+    # every worker through LISTEN/NOTIFY; "memory", and any other database,
+    # reaches only subscribers on the worker that made the change.
+    TASK_EVENTS_BACKEND: str = "postgres"
+    # Open streams per worker, and events queued per stream before it is
+    # told to resync
+    TASK_EVENTS_MAX_SUBSCRIBERS: int = 10000
+    TASK_EVENTS_MAX_PENDING: int = 100
+    TASK_EVENTS_HEARTBEAT_SECONDS: float = 15.0
+
+    # Delta sync (GET /tasks/changes). Tombstones of deleted tasks are kept
+    # this long; older sync tokens get 410 and must sync from scratch.
+    TASK_TOMBSTONE_RETENTION_DAYS: int = 30
+    TASK_TOMBSTONE_COMPACTION_ENABLED: bool = True
+    TASK_TOMBSTONE_COMPACTION_INTERVAL_SECONDS: float = 3600.0
+    TASK_TOMBSTONE_COMPACTION_BATCH_SIZE: int = 1000
+    TASK_TOMBSTONE_COMPACTION_MAX_BATCHES: int = 100
+
+    # Background move of tasks completed this many days ago (by last
+    # modification) to archived_tasks, read back with ?include_archived=true
+    TASK_ARCHIVE_ENABLED: bool = True
+    TASK_ARCHIVE_AFTER_DAYS: int = 90
+    TASK_ARCHIVE_INTERVAL_SECONDS: float = 3600.0
+    TASK_ARCHIVE_BATCH_SIZE: int = 1000
+    TASK_ARCHIVE_MAX_BATCHES: int = 100
+
+    # Rollups behind /tasks/stats and /admin/stats. System-wide rows are
+    # split into this many shards to spread write contention; a periodic
+    # job rebuilds the counters from the tasks tables, this many users per
+    # transaction, then repairs the shards one at a time.
+    TASK_STATS_SHARDS: int = 16
+    TASK_STATS_RECONCILE_ENABLED: bool = True
+    TASK_STATS_RECONCILE_INTERVAL_SECONDS: float = 3600.0
+    TASK_STATS_RECONCILE_BATCH_SIZE: int = 1000
+
+    # Most items accepted by one /tasks/bulk call or ?ids= read
+    TASK_BULK_MAX_ITEMS: int = 1000
+    # Most users one batched admin read (GET /tasks/users) covers
+    TASK_BATCH_MAX_USERS: int = 500
+    # Rows validated and loaded per round trip by /tasks/import
+    TASK_IMPORT_BATCH_SIZE: int = 5000
+    # Largest /tasks/import upload accepted, in rows and in bytes
+    TASK_IMPORT_MAX_ROWS: int = 100_000
+    TASK_IMPORT_MAX_BYTES: int = 64 * 1024 * 1024
+    # Per-row import errors listed in the response (all are counted)
+    TASK_IMPORT_MAX_ERRORS: int = 1000
 
     class Config:
         env_file = ".env"
@@ -31,3 +31,11 @@ async def get_db():
             raise
         finally:
             await session.close()
+
+
+def get_session_factory() -> async_sessionmaker:
+    """
+    For work that outlives the request, such as a streaming response body:
+    FastAPI tears get_db down before the body runs, so it opens its own.
+    """
+    return AsyncSessionLocal
@@ -0,0 +1,29 @@
+from typing import List, Optional
+
+
+def weak_etag(value: str) -> str:
+    return f'W/"{value}"'
+
+
+def parse_etags(header: str) -> List[str]:
+    """Opaque values of an If-Match/If-None-Match list, W/ and quotes removed."""
+    values = []
+    for part in header.split(","):
+        part = part.strip()
+        if part.startswith("W/"):
+            part = part[2:]
+        if part:
+            values.append(part.strip('"'))
+    return values
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    """
+    Whether an If-None-Match style header lists etag, or is "*".
+
+    Uses the weak comparison, so W/"x" and "x" are the same tag.
+    """
+    if header is None:
+        return False
+    values = parse_etags(header)
+    return "*" in values or parse_etags(etag)[0] in values
@@ -0,0 +1,263 @@
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional, Set
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Postgres rejects NOTIFY payloads of 8000 bytes or more
+NOTIFY_MAX_BYTES = 7900
+
+# Queued in place of events when a subscriber has to start over
+RESYNC = {"type": "resync"}
+CLOSED = {"type": "closed"}
+
+
+class Subscription:
+    """
+    One listener's bounded queue of events for a single user.
+
+    A list plus one future while waiting, rather than an asyncio.Queue, so an
+    idle subscription stays small.
+    """
+
+    __slots__ = ("user_id", "max_pending", "_events", "_waiter")
+
+    def __init__(self, user_id: UUID, max_pending: int):
+        self.user_id = user_id
+        self.max_pending = max_pending
+        self._events: List[dict] = []
+        self._waiter: Optional[asyncio.Future] = None
+
+    def _wake(self) -> None:
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+    def put(self, event: dict) -> bool:
+        """Queue event; False once the subscriber is too far behind."""
+        if len(self._events) >= self.max_pending:
+            self.replace_with(RESYNC)
+            return False
+        self._events.append(event)
+        self._wake()
+        return True
+
+    def replace_with(self, event: dict) -> None:
+        """Drop everything pending and queue event as the last one."""
+        self._events = [event]
+        self._wake()
+
+    def close(self) -> None:
+        """End the subscription once what is already queued is delivered."""
+        self._events.append(CLOSED)
+        self._wake()
+
+    async def get(self) -> dict:
+        while not self._events:
+            self._waiter = asyncio.get_running_loop().create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+        return self._events.pop(0)
+
+
+class TaskEventBroker:
+    """
+    Fans task change events out to the subscribers of each user.
+
+    Subscribers are plain bounded queues in this process, so an idle one
+    costs under a kilobyte; one that falls max_pending events behind is
+    told to resync instead of buffering without limit. Once start() has
+    connected it on Postgres, publish() goes through NOTIFY and every
+    worker's broker delivers what its own LISTEN connection receives.
+    Until then, and on other databases, events reach local subscribers only.
+    """
+
+    def __init__(
+        self,
+        channel: str = "task_events",
+        max_subscribers: int = 10000,
+        max_pending: int = 100,
+        reconnect_delay: float = 1.0,
+    ):
+        self.channel = channel
+        self.max_subscribers = max_subscribers
+        self.max_pending = max_pending
+        self.reconnect_delay = reconnect_delay
+        self._subscribers: Dict[UUID, Set[Subscription]] = defaultdict(set)
+        self._count = 0
+        self._engine: Optional[AsyncEngine] = None
+        self._listener: Optional[asyncio.Task] = None
+        self.listening = False
+        self.published = 0
+        self.delivered = 0
+        self.resyncs = 0
+        self.notify_failures = 0
+
+    @property
+    def full(self) -> bool:
+        return self._count >= self.max_subscribers
+
+    @asynccontextmanager
+    async def subscribe(self, user_id: UUID) -> AsyncIterator[Subscription]:
+        subscription = Subscription(user_id, self.max_pending)
+        self._subscribers[user_id].add(subscription)
+        self._count += 1
+        try:
+            yield subscription
+        finally:
+            self._count -= 1
+            subscribers = self._subscribers.get(user_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[user_id]
+
+    def deliver(self, user_id: UUID, events: List[dict]) -> None:
+        """Hand events to this process's subscribers of user_id."""
+        for subscription in list(self._subscribers.get(user_id, ())):
+            for event in events:
+                if not subscription.put(event):
+                    self.resyncs += 1
+                    break
+                self.delivered += 1
+
+    def _resync_all(self) -> None:
+        for subscriptions in self._subscribers.values():
+            for subscription in subscriptions:
+                subscription.replace_with(RESYNC)
+                self.resyncs += 1
+
+    @staticmethod
+    def _messages(user_id: UUID, events: List[dict]) -> List[str]:
+        """NOTIFY payloads for events, each under NOTIFY_MAX_BYTES."""
+        messages, batch = [], []
+
+        def encode(batch: List[dict]) -> str:
+            return json.dumps({"user_id": str(user_id), "events": batch})
+
+        for event in events:
+            if len(encode([event]).encode()) > NOTIFY_MAX_BYTES:
+                # Too big to carry whole; subscribers fetch the task by id
+                event = {key: value for key, value in event.items() if key != "task"}
+            if batch and len(encode(batch + [event]).encode()) > NOTIFY_MAX_BYTES:
+                messages.append(encode(batch))
+                batch = []
+            batch.append(event)
+        if batch:
+            messages.append(encode(batch))
+        return messages
+
+    async def publish(self, user_id: UUID, events: List[dict]) -> None:
+        """Send events for user_id to every worker; call after the commit."""
+        if not events:
+            return
+        self.published += len(events)
+        if not self.listening:
+            self.deliver(user_id, events)
+            return
+        try:
+            async with self._engine.connect() as connection:
+                for message in self._messages(user_id, events):
+                    await connection.execute(
+                        select(func.pg_notify(self.channel, message))
+                    )
+                await connection.commit()
+        except Exception:
+            # The write is committed; other workers miss it, this one does not
+            self.notify_failures += 1
+            logger.warning("NOTIFY failed, delivering task events locally only")
+            self.deliver(user_id, events)
+
+    def _on_notify(self, connection, pid, channel, payload) -> None:
+        try:
+            message = json.loads(payload)
+            self.deliver(UUID(message["user_id"]), message["events"])
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Ignoring malformed task event payload")
+
+    async def _listen(self, dsn: str) -> None:
+        import asyncpg
+
+        connected_before = False
+        while True:
+            try:
+                connection = await asyncpg.connect(dsn)
+            except Exception:
+                logger.warning("Task event listener cannot connect, retrying")
+                await asyncio.sleep(self.reconnect_delay)
+                continue
+            closed = asyncio.Event()
+            connection.add_termination_listener(lambda _: closed.set())
+            try:
+                await connection.add_listener(self.channel, self._on_notify)
+                self.listening = True
+                if connected_before:
+                    # Whatever was sent while we were disconnected is lost
+                    self._resync_all()
+                connected_before = True
+                await closed.wait()
+                logger.warning("Task event listener lost its connection")
+            except Exception:
+                logger.exception("Task event listener failed")
+            finally:
+                self.listening = False
+                if not connection.is_closed():
+                    await connection.close()
+            await asyncio.sleep(self.reconnect_delay)
+
+    async def start(self, engine: AsyncEngine) -> None:
+        """Fan out through LISTEN/NOTIFY on Postgres; no-op elsewhere."""
+        if engine.dialect.name != "postgresql" or self._listener is not None:
+            return
+        self._engine = engine
+        dsn = engine.url.set(drivername="postgresql").render_as_string(
+            hide_password=False
+        )
+        self._listener = asyncio.create_task(self._listen(dsn), name=self.channel)
+
+    async def close(self) -> None:
+        """Stop listening and end every open subscription."""
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        for subscriptions in self._subscribers.values():
+            for subscription in subscriptions:
+                subscription.close()
+
+    def stats(self) -> dict:
+        return {
+            "backend": "postgres" if self._listener is not None else "memory",
+            "listening": self.listening,
+            "subscribers": self._count,
+            "max_subscribers": self.max_subscribers,
+            "users": len(self._subscribers),
+            "published": self.published,
+            "delivered": self.delivered,
+            "resyncs": self.resyncs,
+            "notify_failures": self.notify_failures,
+        }
+
+    def reset(self) -> None:
+        self.published = self.delivered = 0
+        self.resyncs = self.notify_failures = 0
+
+
+# Task create/update/delete events for GET /tasks/stream
+task_events = TaskEventBroker(
+    max_subscribers=settings.TASK_EVENTS_MAX_SUBSCRIBERS,
+    max_pending=settings.TASK_EVENTS_MAX_PENDING,
+)
@@ -0,0 +1,300 @@
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+MEMORY_BACKEND_MAX_KEYS = 100_000
+
+
+class ShieldBackend(ABC):
+    """State store for LoginShield: token buckets, failure counts and blocks."""
+
+    @abstractmethod
+    async def consume(
+        self, key: str, capacity: float, refill_per_second: float
+    ) -> float:
+        """Take one token; return 0 if allowed, else seconds until one is free."""
+
+    @abstractmethod
+    async def add_failure(self, key: str, window: float) -> int:
+        """Count a failure for key, forgetting failures older than window."""
+
+    @abstractmethod
+    async def block(self, key: str, seconds: float) -> None: ...
+
+    @abstractmethod
+    async def blocked_for(self, key: str) -> float: ...
+
+    @abstractmethod
+    async def clear(self, key: str) -> None: ...
+
+
+class MemoryShieldBackend(ShieldBackend):
+    """
+    Per-process state, bounded so an attack on many keys cannot grow it forever.
+    Buckets and failure counts are evicted least recently used first. Blocks
+    are kept apart and only dropped once they expire, so flooding the LRU with
+    throwaway keys cannot lift a block early.
+    """
+
+    def __init__(self, max_keys: int = MEMORY_BACKEND_MAX_KEYS):
+        self.max_keys = max_keys
+        self._state: "OrderedDict[str, dict]" = OrderedDict()
+        self._blocks: Dict[str, float] = {}
+
+    def _entry(self, key: str) -> dict:
+        entry = self._state.get(key)
+        if entry is None:
+            entry = self._state[key] = {}
+            while len(self._state) > self.max_keys:
+                self._state.popitem(last=False)
+        else:
+            self._state.move_to_end(key)
+        return entry
+
+    async def consume(
+        self, key: str, capacity: float, refill_per_second: float
+    ) -> float:
+        now = time.monotonic()
+        entry = self._entry(key)
+        tokens = entry.get("tokens", capacity)
+        updated_at = entry.get("updated_at", now)
+        tokens = min(capacity, tokens + (now - updated_at) * refill_per_second)
+        retry_after = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            retry_after = (1 - tokens) / refill_per_second
+        entry["tokens"] = tokens
+        entry["updated_at"] = now
+        return retry_after
+
+    async def add_failure(self, key: str, window: float) -> int:
+        now = time.monotonic()
+        entry = self._entry(key)
+        if entry.get("failures_expire_at", 0) <= now:
+            entry["failures"] = 0
+        entry["failures"] = entry.get("failures", 0) + 1
+        entry["failures_expire_at"] = now + window
+        return entry["failures"]
+
+    async def block(self, key: str, seconds: float) -> None:
+        now = time.monotonic()
+        if key not in self._blocks and len(self._blocks) >= self.max_keys:
+            self._blocks = {
+                blocked: until for blocked, until in self._blocks.items() if until > now
+            }
+        self._blocks[key] = now + seconds
+
+    async def blocked_for(self, key: str) -> float:
+        return max(0.0, self._blocks.get(key, 0) - time.monotonic())
+
+    async def clear(self, key: str) -> None:
+        self._blocks.pop(key, None)
+        entry = self._state.get(key)
+        if entry:
+            for field in ("failures", "failures_expire_at"):
+                entry.pop(field, None)
+
+    def reset(self) -> None:
+        self._state.clear()
+        self._blocks.clear()
+
+
+# Atomic token bucket: refill by elapsed time, then take one token if possible
+_CONSUME_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local retry = 0
+if tokens >= 1 then tokens = tokens - 1 else retry = (1 - tokens) / rate end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+return tostring(retry)
+"""
+
+
+class RedisShieldBackend(ShieldBackend):
+    """
+    Shared state in Redis so limits hold across uvicorn workers and hosts.
+    Requires the optional redis package.
+    """
+
+    def __init__(self, url: str, prefix: str = "login-shield:"):
+        try:
+            from redis import asyncio as redis
+        except ImportError:
+            raise RuntimeError("LOGIN_SHIELD_BACKEND=redis requires the redis package")
+        self._redis = redis.from_url(url)
+        self._prefix = prefix
+        self._consume = self._redis.register_script(_CONSUME_SCRIPT)
+
+    async def consume(
+        self, key: str, capacity: float, refill_per_second: float
+    ) -> float:
+        retry_after = await self._consume(
+            keys=[f"{self._prefix}bucket:{key}"],
+            args=[capacity, refill_per_second, time.time()],
+        )
+        return float(retry_after)
+
+    async def add_failure(self, key: str, window: float) -> int:
+        failures_key = f"{self._prefix}failures:{key}"
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.incr(failures_key)
+            pipe.expire(failures_key, max(1, int(window)))
+            failures, _ = await pipe.execute()
+        return int(failures)
+
+    async def block(self, key: str, seconds: float) -> None:
+        await self._redis.set(
+            f"{self._prefix}block:{key}", 1, px=max(1, int(seconds * 1000))
+        )
+
+    async def blocked_for(self, key: str) -> float:
+        ttl_ms = await self._redis.pttl(f"{self._prefix}block:{key}")
+        return max(0.0, ttl_ms / 1000)
+
+    async def clear(self, key: str) -> None:
+        await self._redis.delete(
+            f"{self._prefix}failures:{key}", f"{self._prefix}block:{key}"
+        )
+
+
+class LoginShield:
+    """
+    Sheds credential-stuffing load before any password hashing happens.
+
+    Every attempt takes a token from a bucket per email and a bucket per
+    client IP. Failed attempts count per client IP and per (email, client IP)
+    pair, and past free_failures each further failure blocks that key for an
+    exponentially growing time. Failures are not counted per email alone:
+    anyone could then lock the owner of an address out by guessing at it.
+    """
+
+    def __init__(
+        self,
+        backend: ShieldBackend,
+        email_burst: float,
+        email_per_minute: float,
+        ip_burst: float,
+        ip_per_minute: float,
+        free_failures: int,
+        backoff_base: float,
+        backoff_max: float,
+        failure_window: float,
+        enabled: bool = True,
+    ):
+        self.backend = backend
+        self.email_limit = (email_burst, email_per_minute / 60)
+        self.ip_limit = (ip_burst, ip_per_minute / 60)
+        self.free_failures = free_failures
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.failure_window = failure_window
+        self.enabled = enabled
+        self.allowed = 0
+        self.shed_email = 0
+        self.shed_ip = 0
+        self.shed_backoff = 0
+        self.failures = 0
+
+    @staticmethod
+    def _keys(email: str, client_ip: Optional[str]) -> Tuple[str, Optional[str]]:
+        return f"email:{email.strip().lower()}", (
+            f"ip:{client_ip}" if client_ip else None
+        )
+
+    def _penalty_keys(self, email: str, client_ip: Optional[str]) -> List[str]:
+        email_key, ip_key = self._keys(email, client_ip)
+        if ip_key is None:
+            return [email_key]
+        return [f"{email_key}|{ip_key}", ip_key]
+
+    async def check(self, email: str, client_ip: Optional[str]) -> float:
+        """Return 0 if the attempt may proceed, else seconds to wait."""
+        if not self.enabled:
+            return 0.0
+        email_key, ip_key = self._keys(email, client_ip)
+
+        for key in self._penalty_keys(email, client_ip):
+            blocked_for = await self.backend.blocked_for(key)
+            if blocked_for > 0:
+                self.shed_backoff += 1
+                return blocked_for
+
+        if ip_key is not None:
+            retry_after = await self.backend.consume(ip_key, *self.ip_limit)
+            if retry_after > 0:
+                self.shed_ip += 1
+                return retry_after
+        retry_after = await self.backend.consume(email_key, *self.email_limit)
+        if retry_after > 0:
+            self.shed_email += 1
+            return retry_after
+
+        self.allowed += 1
+        return 0.0
+
+    async def record_failure(self, email: str, client_ip: Optional[str]) -> None:
+        if not self.enabled:
+            return
+        self.failures += 1
+        for key in self._penalty_keys(email, client_ip):
+            failures = await self.backend.add_failure(key, self.failure_window)
+            excess = failures - self.free_failures
+            if excess > 0:
+                delay = min(self.backoff_max, self.backoff_base * 2 ** (excess - 1))
+                await self.backend.block(key, delay)
+
+    async def record_success(self, email: str, client_ip: Optional[str]) -> None:
+        if not self.enabled:
+            return
+        await self.backend.clear(self._penalty_keys(email, client_ip)[0])
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "backend": type(self.backend).__name__,
+            "allowed": self.allowed,
+            "failures": self.failures,
+            "shed_email": self.shed_email,
+            "shed_ip": self.shed_ip,
+            "shed_backoff": self.shed_backoff,
+        }
+
+    def reset(self) -> None:
+        if isinstance(self.backend, MemoryShieldBackend):
+            self.backend.reset()
+        self.allowed = self.shed_email = self.shed_ip = 0
+        self.shed_backoff = self.failures = 0
+
+
+def build_shield_backend(name: str) -> ShieldBackend:
+    if name == "memory":
+        return MemoryShieldBackend()
+    if name == "redis":
+        if not settings.REDIS_URL:
+            raise RuntimeError("LOGIN_SHIELD_BACKEND=redis requires REDIS_URL")
+        return RedisShieldBackend(settings.REDIS_URL)
+    raise ValueError(f"Unknown login shield backend: {name}")
+
+
+login_shield = LoginShield(
+    backend=build_shield_backend(settings.LOGIN_SHIELD_BACKEND),
+    email_burst=settings.LOGIN_EMAIL_BURST,
+    email_per_minute=settings.LOGIN_EMAIL_PER_MINUTE,
+    ip_burst=settings.LOGIN_IP_BURST,
+    ip_per_minute=settings.LOGIN_IP_PER_MINUTE,
+    free_failures=settings.LOGIN_FREE_FAILURES,
+    backoff_base=settings.LOGIN_BACKOFF_BASE_SECONDS,
+    backoff_max=settings.LOGIN_BACKOFF_MAX_SECONDS,
+    failure_window=settings.LOGIN_FAILURE_WINDOW_SECONDS,
+    enabled=settings.LOGIN_SHIELD_ENABLED,
+)
@@ -0,0 +1,223 @@
+import itertools
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Optional
+from uuid import UUID
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend(ABC):
+    """Key-value store for ResponseCache: expiring values plus generations."""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]: ...
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: float) -> None: ...
+
+    @abstractmethod
+    async def generation(self, key: str) -> int:
+        """Current generation of key."""
+
+    @abstractmethod
+    async def bump(self, key: str) -> int:
+        """Move key to a generation it has not had before and return it."""
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    Per-process store, bounded LRU for both values and generations.
+
+    Generations come from one process-wide sequence, so a user whose
+    generation was evicted gets a fresh one instead of reusing an old one
+    that stale pages may still be stored under.
+    """
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._values: "OrderedDict[str, tuple[float, bytes]]" = OrderedDict()
+        self._generations: "OrderedDict[str, int]" = OrderedDict()
+        self._sequence = itertools.count(1)
+
+    @staticmethod
+    def _bound(entries: OrderedDict, max_keys: int) -> None:
+        while len(entries) > max_keys:
+            entries.popitem(last=False)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._values.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._values[key]
+            return None
+        self._values.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        self._values[key] = (time.monotonic() + ttl, value)
+        self._values.move_to_end(key)
+        self._bound(self._values, self.max_keys)
+
+    async def generation(self, key: str) -> int:
+        generation = self._generations.get(key)
+        if generation is None:
+            return await self.bump(key)
+        self._generations.move_to_end(key)
+        return generation
+
+    async def bump(self, key: str) -> int:
+        generation = self._generations[key] = next(self._sequence)
+        self._generations.move_to_end(key)
+        self._bound(self._generations, self.max_keys)
+        return generation
+
+    def reset(self) -> None:
+        self._values.clear()
+        self._generations.clear()
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Shared store in Redis, so every worker sees the same pages and bumps.
+    Requires the optional redis package unless a client is passed in; any
+    object with async get/set(px=)/incr works, which tests rely on.
+    """
+
+    def __init__(self, url: Optional[str] = None, client=None):
+        if client is None:
+            try:
+                from redis import asyncio as redis
+            except ImportError:
+                raise RuntimeError(
+                    "TASK_LIST_CACHE_BACKEND=redis requires the redis package"
+                )
+            client = redis.from_url(url)
+        self._redis = client
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._redis.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        await self._redis.set(key, value, px=max(1, int(ttl * 1000)))
+
+    async def generation(self, key: str) -> int:
+        return int(await self._redis.get(key) or 0)
+
+    async def bump(self, key: str) -> int:
+        return int(await self._redis.incr(key))
+
+
+class ResponseCache:
+    """
+    Serialized responses per user, keyed by the user's current generation.
+
+    A write bumps the generation instead of deleting entries: pages stored
+    under older generations can no longer be looked up and age out through
+    the TTL or LRU. Readers must build their key (reading the generation)
+    before they query, so a page read just before a write can only be
+    stored under the generation that write retired.
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackend,
+        ttl: float,
+        enabled: bool = True,
+        prefix: str = "task-list:",
+    ):
+        self.backend = backend
+        self.ttl = ttl
+        self.enabled = enabled
+        self.prefix = prefix
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.invalidation_failures = 0
+
+    async def key(self, user_id: UUID, variant: str) -> Optional[str]:
+        """Lookup key for one variant (e.g. query string); None when disabled."""
+        if not self.enabled:
+            return None
+        generation = await self.backend.generation(f"{self.prefix}gen:{user_id}")
+        return f"{self.prefix}{user_id}:{generation}:{variant}"
+
+    async def get(self, key: Optional[str]) -> Optional[bytes]:
+        if key is None:
+            return None
+        value = await self.backend.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, key: Optional[str], value: bytes) -> None:
+        if key is not None and self.ttl > 0:
+            await self.backend.set(key, value, self.ttl)
+
+    async def invalidate(self, user_id: UUID) -> None:
+        """
+        Make every cached response for the user unreachable. Called after a
+        write has committed, so a backend error is logged rather than raised:
+        the pages it fails to retire expire with the TTL.
+        """
+        if not self.enabled:
+            return
+        self.invalidations += 1
+        try:
+            await self.backend.bump(f"{self.prefix}gen:{user_id}")
+        except Exception:
+            self.invalidation_failures += 1
+            logger.warning("Task list cache invalidation failed", exc_info=True)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "backend": type(self.backend).__name__,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "invalidation_failures": self.invalidation_failures,
+        }
+
+    def reset(self) -> None:
+        if isinstance(self.backend, MemoryCacheBackend):
+            self.backend.reset()
+        self.hits = self.misses = self.invalidations = 0
+        self.invalidation_failures = 0
+
+
+def build_cache_backend(name: str, workers: int = 1) -> CacheBackend:
+    if name == "memory":
+        if workers > 1:
+            # Writes on one worker would not retire pages cached by the others
+            raise RuntimeError(
+                "TASK_LIST_CACHE_BACKEND=memory needs a single worker; use redis"
+            )
+        return MemoryCacheBackend(max_keys=settings.TASK_LIST_CACHE_SIZE)
+    if name == "redis":
+        if not settings.REDIS_URL:
+            raise RuntimeError("TASK_LIST_CACHE_BACKEND=redis requires REDIS_URL")
+        return RedisCacheBackend(settings.REDIS_URL)
+    raise ValueError(f"Unknown task list cache backend: {name}")
+
+
+# Serialized GET /tasks/ responses (ETag and body) per user
+task_list_cache = ResponseCache(
+    backend=build_cache_backend(
+        settings.TASK_LIST_CACHE_BACKEND,
+        workers=settings.WEB_CONCURRENCY if settings.TASK_LIST_CACHE_ENABLED else 1,
+    ),
+    ttl=settings.TASK_LIST_CACHE_TTL_SECONDS,
+    enabled=settings.TASK_LIST_CACHE_ENABLED,
+)
@@ -1,14 +1,133 @@
+import base64
+import hashlib
+import hmac
+import json
+import math
 import secrets
+import time
+from abc import ABC, abstractmethod
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Dict, Optional, Tuple, Type
 
-from jose import jwt
 from passlib.context import CryptContext
 
 from app.core.config import settings
+from app.core.workers import hashing_pool
+
+PASSWORD_HASH_SCHEMES = ("bcrypt", "argon2")
+BCRYPT_MAX_ROUNDS = 16
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Effective hashing parameters, reported on /api/v1/metrics
+password_hashing_params: dict = {}
+
+
+def configure_password_hashing(
+    scheme: str,
+    bcrypt_rounds: int,
+    argon2_time_cost: int,
+    argon2_memory_kib: int,
+    argon2_parallelism: int,
+) -> dict:
+    """
+    Point pwd_context at the given scheme and cost.
+
+    The other scheme stays enabled for verification but is deprecated, and the
+    configured cost is also the minimum, so pwd_context.needs_update flags any
+    stored hash that should be upgraded. Costs are never lowered on rehash.
+    """
+    if scheme not in PASSWORD_HASH_SCHEMES:
+        raise ValueError(f"Unknown password hash scheme: {scheme}")
+    if scheme == "argon2":
+        try:
+            import argon2  # noqa: F401
+        except ImportError:
+            raise RuntimeError(
+                "PASSWORD_HASH_SCHEME=argon2 requires the argon2-cffi package"
+            )
+
+    schemes = [scheme] + [other for other in PASSWORD_HASH_SCHEMES if other != scheme]
+    pwd_context.load(
+        {
+            "schemes": schemes,
+            "deprecated": "auto",
+            "bcrypt__default_rounds": bcrypt_rounds,
+            "bcrypt__min_rounds": bcrypt_rounds,
+            "argon2__default_rounds": argon2_time_cost,
+            "argon2__min_rounds": argon2_time_cost,
+            "argon2__memory_cost": argon2_memory_kib,
+            "argon2__parallelism": argon2_parallelism,
+        }
+    )
+    password_hashing_params.clear()
+    password_hashing_params.update(
+        scheme=scheme,
+        bcrypt_rounds=bcrypt_rounds,
+        argon2_time_cost=argon2_time_cost,
+        argon2_memory_kib=argon2_memory_kib,
+        argon2_parallelism=argon2_parallelism,
+    )
+    return dict(password_hashing_params)
+
+
+def measure_hash_ms(scheme: str, **params) -> float:
+    """Milliseconds for one hash with the given scheme and cost settings."""
+    handler = CryptContext(schemes=[scheme]).handler(scheme).using(**params)
+    start = time.perf_counter()
+    handler.hash("calibration-password")
+    return (time.perf_counter() - start) * 1000
+
+
+def calibrate_password_hashing(scheme: str, target_ms: float) -> dict:
+    """
+    Pick the highest cost whose hash fits in target_ms on this machine.
+
+    bcrypt doubles in cost per round, so one measurement at the floor is
+    enough. argon2 keeps the configured memory limit and scales time_cost,
+    which grows roughly linearly.
+    """
+    params = {
+        "bcrypt_rounds": settings.BCRYPT_ROUNDS,
+        "argon2_time_cost": settings.ARGON2_TIME_COST,
+        "argon2_memory_kib": settings.ARGON2_MEMORY_KIB,
+        "argon2_parallelism": settings.ARGON2_PARALLELISM,
+    }
+    if scheme == "bcrypt":
+        floor = settings.BCRYPT_MIN_ROUNDS
+        floor_ms = measure_hash_ms("bcrypt", rounds=floor)
+        extra = math.floor(math.log2(max(target_ms / floor_ms, 1)))
+        params["bcrypt_rounds"] = min(floor + extra, BCRYPT_MAX_ROUNDS)
+    else:
+        one_pass_ms = measure_hash_ms(
+            "argon2",
+            rounds=1,
+            memory_cost=settings.ARGON2_MEMORY_KIB,
+            parallelism=settings.ARGON2_PARALLELISM,
+        )
+        params["argon2_time_cost"] = max(1, math.floor(target_ms / one_pass_ms))
+    return params
+
+
+def init_password_hashing(calibrate: bool = False) -> dict:
+    """Configure pwd_context from settings, calibrating the cost if asked to."""
+    scheme = settings.PASSWORD_HASH_SCHEME
+    if calibrate and settings.PASSWORD_HASH_TARGET_MS:
+        params = calibrate_password_hashing(scheme, settings.PASSWORD_HASH_TARGET_MS)
+    else:
+        params = {
+            "bcrypt_rounds": settings.BCRYPT_ROUNDS,
+            "argon2_time_cost": settings.ARGON2_TIME_COST,
+            "argon2_memory_kib": settings.ARGON2_MEMORY_KIB,
+            "argon2_parallelism": settings.ARGON2_PARALLELISM,
+        }
+    return configure_password_hashing(scheme, **params)
+
+
+init_password_hashing()
+
+REFRESH_TOKEN_SEPARATOR = "."
+
 
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
@@ -18,6 +137,173 @@ def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    return pwd_context.needs_update(hashed_password)
+
+
+async def hash_password_async(password: str) -> str:
+    """hash_password on the bounded hashing pool, keeping the event loop free."""
+    return await hashing_pool.run(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password on the bounded hashing pool, keeping the event loop free."""
+    return await hashing_pool.run(verify_password, plain_password, hashed_password)
+
+
+class TokenError(Exception):
+    """Raised when an access token is malformed, forged or expired."""
+
+
+def _b64url_encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64url_decode(segment: str) -> bytes:
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+def _numeric_dates(claims: dict) -> dict:
+    for claim in ("exp", "iat", "nbf"):
+        value = claims.get(claim)
+        if isinstance(value, datetime):
+            claims[claim] = int(value.timestamp())
+    return claims
+
+
+class TokenCodec(ABC):
+    """Encodes and validates HS256 access tokens. Built once per process."""
+
+    algorithm = "HS256"
+
+    def __init__(self, secret: str):
+        self.secret = secret
+
+    @abstractmethod
+    def encode(self, claims: dict) -> str: ...
+
+    @abstractmethod
+    def decode(self, token: str) -> dict: ...
+
+
+class HS256Codec(TokenCodec):
+    """
+    Hand-rolled HS256 using only the standard library.
+
+    The HMAC key schedule (inner/outer pads) is computed once and copied per
+    call, and the fixed header segment is pre-encoded so decoding the tokens
+    we issue skips header parsing altogether.
+    """
+
+    def __init__(self, secret: str):
+        super().__init__(secret)
+        self._mac = hmac.new(secret.encode(), digestmod=hashlib.sha256)
+        self._header = _b64url_encode(
+            json.dumps({"alg": "HS256", "typ": "JWT"}, separators=(",", ":")).encode()
+        )
+
+    def _sign(self, signing_input: bytes) -> bytes:
+        mac = self._mac.copy()
+        mac.update(signing_input)
+        return mac.digest()
+
+    def encode(self, claims: dict) -> str:
+        payload = _b64url_encode(
+            json.dumps(_numeric_dates(dict(claims)), separators=(",", ":")).encode()
+        )
+        signing_input = f"{self._header}.{payload}"
+        signature = _b64url_encode(self._sign(signing_input.encode("ascii")))
+        return f"{signing_input}.{signature}"
+
+    def decode(self, token: str) -> dict:
+        try:
+            header, payload, signature = token.split(".")
+            if header != self._header:
+                if json.loads(_b64url_decode(header)).get("alg") != self.algorithm:
+                    raise TokenError("Unsupported token algorithm")
+            expected = self._sign(f"{header}.{payload}".encode("ascii"))
+            if not hmac.compare_digest(expected, _b64url_decode(signature)):
+                raise TokenError("Signature verification failed")
+            claims = json.loads(_b64url_decode(payload))
+        except TokenError:
+            raise
+        except (ValueError, UnicodeError, AttributeError) as error:
+            raise TokenError(f"Malformed token: {error}")
+
+        if not isinstance(claims, dict):
+            raise TokenError("Malformed token claims")
+        now = time.time()
+        exp = claims.get("exp")
+        if not isinstance(exp, (int, float)) or exp <= now:
+            raise TokenError("Token has expired")
+        nbf = claims.get("nbf")
+        if nbf is not None and (not isinstance(nbf, (int, float)) or nbf > now):
+            raise TokenError("Token is not yet valid")
+        return claims
+
+
+class JoseCodec(TokenCodec):
+    """python-jose backend, kept for compatibility."""
+
+    def __init__(self, secret: str):
+        super().__init__(secret)
+        from jose import JWTError, jwt
+
+        self._jwt = jwt
+        self._error = JWTError
+
+    def encode(self, claims: dict) -> str:
+        return self._jwt.encode(claims, self.secret, algorithm=self.algorithm)
+
+    def decode(self, token: str) -> dict:
+        try:
+            return self._jwt.decode(token, self.secret, algorithms=[self.algorithm])
+        except self._error as error:
+            raise TokenError(str(error))
+
+
+class PyJWTCodec(TokenCodec):
+    """PyJWT backend; requires the optional PyJWT package."""
+
+    def __init__(self, secret: str):
+        super().__init__(secret)
+        try:
+            import jwt
+        except ImportError:
+            raise RuntimeError("JWT_BACKEND=pyjwt requires the PyJWT package")
+
+        self._jwt = jwt
+        self._key = secret.encode()
+        self._options = {"require": ["exp"]}
+
+    def encode(self, claims: dict) -> str:
+        return self._jwt.encode(claims, self._key, algorithm=self.algorithm)
+
+    def decode(self, token: str) -> dict:
+        try:
+            return self._jwt.decode(
+                token, self._key, algorithms=[self.algorithm], options=self._options
+            )
+        except self._jwt.PyJWTError as error:
+            raise TokenError(str(error))
+
+
+TOKEN_CODECS: Dict[str, Type[TokenCodec]] = {
+    "hs256": HS256Codec,
+    "jose": JoseCodec,
+    "pyjwt": PyJWTCodec,
+}
+
+
+def build_token_codec(backend: str, secret: str) -> TokenCodec:
+    if backend not in TOKEN_CODECS:
+        raise ValueError(f"Unknown JWT backend: {backend}")
+    return TOKEN_CODECS[backend](secret)
+
+
+token_codec = build_token_codec(settings.JWT_BACKEND, settings.SECRET_KEY)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     if expires_delta:
@@ -26,18 +312,46 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         expire = datetime.now(timezone.utc) + timedelta(
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINS
         )
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm="HS256")
-    return encoded_jwt
+    to_encode.update({"exp": expire, "jti": secrets.token_hex(16)})
+    return token_codec.encode(to_encode)
+
+
+def decode_access_token(token: str) -> dict:
+    return token_codec.decode(token)
 
 
 def create_refresh_token() -> str:
-    return secrets.token_urlsafe(32)
+    """
+    Refresh tokens have the form "<selector>.<verifier>".
+
+    The selector is stored in clear and indexed so a token can be found with a
+    single equality lookup; only a keyed digest of the verifier is stored.
+    """
+    selector = secrets.token_urlsafe(12)
+    verifier = secrets.token_urlsafe(32)
+    return f"{selector}{REFRESH_TOKEN_SEPARATOR}{verifier}"
+
+
+def split_refresh_token(refresh_token: str) -> Tuple[str, str]:
+    """Return (selector, verifier), raising ValueError for malformed tokens."""
+    selector, separator, verifier = refresh_token.partition(REFRESH_TOKEN_SEPARATOR)
+    if not separator or not selector or not verifier:
+        raise ValueError("Malformed refresh token")
+    return selector, verifier
 
 
-def hash_refresh_token(refresh_token) -> str:
-    return pwd_context.hash(refresh_token)
+def hash_refresh_token(refresh_token: str) -> str:
+    # The verifier is 256 bits of CSPRNG output, so a keyed fast digest is as
+    # strong as bcrypt here and costs microseconds instead of ~100ms.
+    _, verifier = split_refresh_token(refresh_token)
+    return hmac.new(
+        settings.SECRET_KEY.encode(), verifier.encode(), hashlib.sha256
+    ).hexdigest()
 
 
 def verify_refresh_token(plain_token: str, hashed_token: str) -> bool:
-    return pwd_context.verify(plain_token, hashed_token)
+    try:
+        expected = hash_refresh_token(plain_token)
+    except ValueError:
+        return False
+    return hmac.compare_digest(expected, hashed_token)
@@ -0,0 +1,102 @@
+import asyncio
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from time import perf_counter
+from typing import Callable, Optional, TypeVar
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+LATENCY_WINDOW = 1024
+
+
+class WorkerPoolSaturated(Exception):
+    """Raised when a bounded worker pool has no free worker or queue slot."""
+
+    def __init__(self, name: str):
+        super().__init__(f"Worker pool '{name}' is saturated")
+        self.name = name
+
+
+class BoundedWorkerPool:
+    """
+    Runs blocking CPU work (e.g. bcrypt) off the event loop.
+
+    At most max_workers jobs run at once and at most max_queue more may wait;
+    anything beyond that is rejected immediately with WorkerPoolSaturated
+    instead of piling up behind the pool. All bookkeeping happens on the event
+    loop thread, so plain counters are safe.
+    """
+
+    def __init__(self, name: str, kind: str, max_workers: int, max_queue: int):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown worker pool kind: {kind}")
+        self.name = name
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor: Optional[Executor] = None
+        self._pending = 0
+        self._completed = 0
+        self._rejected = 0
+        self._latencies: deque = deque(maxlen=LATENCY_WINDOW)
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix=self.name
+                )
+        return self._executor
+
+    async def run(self, fn: Callable[..., T], *args) -> T:
+        if self._pending >= self.max_workers + self.max_queue:
+            self._rejected += 1
+            raise WorkerPoolSaturated(self.name)
+
+        self._pending += 1
+        start = perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            self._pending -= 1
+            self._completed += 1
+            self._latencies.append(perf_counter() - start)
+
+    def stats(self) -> dict:
+        latencies = sorted(self._latencies)
+
+        def percentile(fraction: float) -> float:
+            if not latencies:
+                return 0.0
+            index = min(len(latencies) - 1, int(len(latencies) * fraction))
+            return round(latencies[index] * 1000, 3)
+
+        return {
+            "kind": self.kind,
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": min(self._pending, self.max_workers),
+            "queue_depth": max(0, self._pending - self.max_workers),
+            "completed": self._completed,
+            "rejected": self._rejected,
+            "latency_p50_ms": percentile(0.50),
+            "latency_p99_ms": percentile(0.99),
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+hashing_pool = BoundedWorkerPool(
+    name="hashing",
+    kind=settings.HASHING_POOL_KIND,
+    max_workers=settings.HASHING_POOL_WORKERS,
+    max_queue=settings.HASHING_POOL_MAX_QUEUE,
+)
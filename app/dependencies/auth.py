@@ -1,39 +1,138 @@
 import uuid
+from typing import Optional, Tuple
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.core.cache import principal_cache, token_version_cache
 from app.core.config import settings
 from app.core.database import get_db
+from app.core.security import TokenError, decode_access_token
 from app.models.user import User
+from app.schemas.user import Principal
+from app.schemas.user import User as UserSchema
+from app.services.revocation_service import revocation_list
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
+credentials_exception = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Could not validate credentials",
+    headers={"WWW-Authenticate": "Bearer"},
+)
 
-async def get_current_user(
+
+async def get_token_payload(
     token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)
-):
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
+) -> dict:
+    """Validated access token claims; rejects revoked tokens."""
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
+        payload = decode_access_token(token)
         user_id_str = payload.get("sub")
         if user_id_str is None:
             raise credentials_exception
-        user_id = uuid.UUID(user_id_str)
-    except (JWTError, ValueError):
+        uuid.UUID(user_id_str)
+    except (TokenError, ValueError):
         raise credentials_exception
+
+    jti = payload.get("jti")
+    if jti is not None and await revocation_list.is_revoked(jti, db):
+        raise credentials_exception
+    return payload
+
+
+async def _load_user(user_id: uuid.UUID, db: AsyncSession) -> UserSchema:
+    # The session only checks out a connection once it is used, so a cache hit
+    # skips the database entirely.
+    principal = principal_cache.get(user_id)
+    if principal is not None:
+        return principal
+
     result = await db.execute(
         select(User).options(selectinload(User.roles)).filter(User.id == user_id)
     )
     user = result.scalars().first()
     if user is None:
         raise credentials_exception
-    return user
+    principal = UserSchema.model_validate(user)
+    principal_cache.set(user_id, principal)
+    return principal
+
+
+async def _get_token_version(
+    user_id: uuid.UUID, db: AsyncSession
+) -> Optional[Tuple[int, bool]]:
+    cached = token_version_cache.get(user_id)
+    if cached is not None:
+        return cached
+
+    result = await db.execute(
+        select(User.token_version, User.is_active).where(User.id == user_id)
+    )
+    row = result.first()
+    if row is None:
+        return None
+    cached = (row.token_version, bool(row.is_active))
+    token_version_cache.set(user_id, cached)
+    return cached
+
+
+async def token_still_valid(payload: dict, db: AsyncSession) -> bool:
+    """
+    Re-check a token accepted earlier, for requests that outlive the check:
+    False once it is revoked, its token version is superseded or the user is
+    deactivated or deleted.
+    """
+    jti = payload.get("jti")
+    if jti is not None and await revocation_list.is_revoked(jti, db):
+        return False
+    current = await _get_token_version(uuid.UUID(payload["sub"]), db)
+    if current is None:
+        return False
+    token_version, is_active = current
+    if "ver" in payload and payload["ver"] != token_version:
+        return False
+    return is_active
+
+
+async def get_current_user(
+    payload: dict = Depends(get_token_payload), db: AsyncSession = Depends(get_db)
+) -> UserSchema:
+    return await _load_user(uuid.UUID(payload["sub"]), db)
+
+
+async def get_current_principal(
+    payload: dict = Depends(get_token_payload), db: AsyncSession = Depends(get_db)
+) -> Principal:
+    """
+    Resolve the caller for authorization only.
+
+    Tokens issued with ACCESS_TOKEN_EMBED_CLAIMS carry role names and a token
+    version; those are trusted after comparing the version with the user's
+    current one (cached per worker), so no user or role rows are loaded.
+    Other tokens fall back to get_current_user.
+    """
+    user_id = uuid.UUID(payload["sub"])
+
+    if settings.ACCESS_TOKEN_EMBED_CLAIMS and "ver" in payload and "roles" in payload:
+        current = await _get_token_version(user_id, db)
+        if current is None:
+            raise credentials_exception
+        token_version, is_active = current
+        if payload["ver"] != token_version or not is_active:
+            raise credentials_exception
+        return Principal(id=user_id, role_names=payload["roles"])
+
+    user = await _load_user(user_id, db)
+    return Principal(id=user.id, role_names=[role.name for role in user.roles])
+
+
+def get_client_ip(request: Request) -> Optional[str]:
+    if settings.TRUST_PROXY_HEADERS:
+        real_ip = request.headers.get("x-real-ip")
+        if real_ip:
+            return real_ip
+    return request.client.host if request.client else None
@@ -1,12 +1,154 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
 
-from app.api.v1.endpoints import auth, tasks, users
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse
+
+from app.api.v1.endpoints import admin, auth, metrics, tasks, users
+from app.core.background import PeriodicJob, jobs, leader_lock, register_job
 from app.core.config import settings
+from app.core.database import AsyncSessionLocal, async_engine
+from app.core.events import task_events
+from app.core.security import init_password_hashing
+from app.core.workers import WorkerPoolSaturated, hashing_pool
+from app.services.archive_service import task_archiver
+from app.services.auth_service import (
+    delete_expired_refresh_tokens,
+    wait_for_pending_rehashes,
+)
+from app.services.revocation_service import (
+    delete_expired_revocations,
+    revocation_list,
+)
+from app.services.stats_service import recompute_system_counters
+from app.services.task_service import (
+    compact_task_tombstones,
+    reconcile_task_counters,
+)
+
+
+async def sweep_expired_tokens() -> int:
+    async with AsyncSessionLocal() as db:
+        removed = await delete_expired_refresh_tokens(
+            db,
+            batch_size=settings.REFRESH_TOKEN_SWEEP_BATCH_SIZE,
+            max_batches=settings.REFRESH_TOKEN_SWEEP_MAX_BATCHES,
+        )
+        removed += await delete_expired_revocations(
+            db,
+            batch_size=settings.REFRESH_TOKEN_SWEEP_BATCH_SIZE,
+            max_batches=settings.REFRESH_TOKEN_SWEEP_MAX_BATCHES,
+        )
+        return removed
+
+
+async def compact_tombstones() -> int:
+    async with AsyncSessionLocal() as db:
+        return await compact_task_tombstones(
+            db,
+            batch_size=settings.TASK_TOMBSTONE_COMPACTION_BATCH_SIZE,
+            max_batches=settings.TASK_TOMBSTONE_COMPACTION_MAX_BATCHES,
+        )
+
+
+async def archive_completed_tasks() -> int:
+    async with AsyncSessionLocal() as db:
+        return await task_archiver.run(db)
+
 
-app = FastAPI(title=settings.APP_NAME)
+async def reconcile_task_stats() -> int:
+    async with AsyncSessionLocal() as db:
+        repaired = await reconcile_task_counters(
+            db, batch_size=settings.TASK_STATS_RECONCILE_BATCH_SIZE
+        )
+        repaired += await recompute_system_counters(db)
+        return repaired
+
+
+async def refresh_revocation_filter() -> int:
+    async with AsyncSessionLocal() as db:
+        return await revocation_list.refresh(db)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    init_password_hashing(calibrate=True)
+    if settings.REFRESH_TOKEN_SWEEP_ENABLED:
+        register_job(
+            PeriodicJob(
+                name="expired_token_sweeper",
+                interval=settings.REFRESH_TOKEN_SWEEP_INTERVAL_SECONDS,
+                job=sweep_expired_tokens,
+                engine=async_engine,
+                single_leader=True,
+            )
+        )
+    if settings.TASK_TOMBSTONE_COMPACTION_ENABLED:
+        register_job(
+            PeriodicJob(
+                name="task_tombstone_compactor",
+                interval=settings.TASK_TOMBSTONE_COMPACTION_INTERVAL_SECONDS,
+                job=compact_tombstones,
+                engine=async_engine,
+                single_leader=True,
+            )
+        )
+    if settings.TASK_ARCHIVE_ENABLED:
+        register_job(
+            PeriodicJob(
+                name="task_archiver",
+                interval=settings.TASK_ARCHIVE_INTERVAL_SECONDS,
+                job=archive_completed_tasks,
+                engine=async_engine,
+                single_leader=True,
+            )
+        )
+    if settings.TASK_STATS_RECONCILE_ENABLED:
+        register_job(
+            PeriodicJob(
+                name="task_stats_reconciler",
+                interval=settings.TASK_STATS_RECONCILE_INTERVAL_SECONDS,
+                job=reconcile_task_stats,
+                engine=async_engine,
+                single_leader=True,
+            )
+        )
+    # Every worker keeps its own filter, so this one is not leader-only
+    register_job(
+        PeriodicJob(
+            name="revocation_filter_refresh",
+            interval=settings.REVOCATION_FILTER_REFRESH_SECONDS,
+            job=refresh_revocation_filter,
+        )
+    )
+    for job in jobs.values():
+        job.start()
+    if settings.TASK_EVENTS_BACKEND == "postgres":
+        await task_events.start(async_engine)
+    yield
+    await task_events.close()
+    for job in jobs.values():
+        await job.stop()
+    jobs.clear()
+    await leader_lock.release()
+    await wait_for_pending_rehashes()
+    hashing_pool.shutdown()
+
+
+app = FastAPI(title=settings.APP_NAME, lifespan=lifespan)
 app.include_router(users.router, prefix="/api/v1")
 app.include_router(auth.router, prefix="/api/v1")
 app.include_router(tasks.router, prefix="/api/v1")
+app.include_router(metrics.router, prefix="/api/v1")
+app.include_router(admin.router, prefix="/api/v1")
+
+
+@app.exception_handler(WorkerPoolSaturated)
+async def worker_pool_saturated_handler(request: Request, exc: WorkerPoolSaturated):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Server is busy, please retry shortly"},
+        headers={"Retry-After": "1"},
+    )
 
 
 @app.get("/health")
@@ -0,0 +1,53 @@
+from sqlalchemy import (
+    UUID,
+    BigInteger,
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    String,
+    Text,
+)
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+
+class ArchivedTask(Base):
+    """
+    Cold copy of a task completed more than TASK_ARCHIVE_AFTER_DAYS ago,
+    moved out of tasks by the archiver. Same columns as Task plus
+    archived_at; read only through include_archived.
+    """
+
+    __tablename__ = "archived_tasks"
+
+    id = Column(UUID, primary_key=True)
+    title = Column(String(200), nullable=False)
+    description = Column(Text, nullable=True)
+    is_completed = Column(Boolean, nullable=False, default=True)
+    user_id = Column(UUID, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    updated_at = Column(DateTime(timezone=True))
+    change_seq = Column(BigInteger, nullable=False, default=0, server_default="0")
+    archived_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        # The same orders the tasks listing can be sorted in
+        Index("ix_archived_tasks_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_archived_tasks_user_id_title_id", "user_id", "title", "id"),
+    )
+
+    def __repr__(self):
+        return f"<ArchivedTask(id={self.id}, title='{self.title}', user_id={self.user_id})>"
+
+
+archived_modified_at = func.coalesce(ArchivedTask.updated_at, ArchivedTask.created_at)
+
+Index(
+    "ix_archived_tasks_user_id_modified_at_id",
+    ArchivedTask.user_id,
+    archived_modified_at,
+    ArchivedTask.id,
+)
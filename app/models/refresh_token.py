@@ -11,8 +11,9 @@ class RefreshToken(Base):
 
     id = Column(UUID, primary_key=True, index=True, default=uuid.uuid4)
     user_id = Column(UUID, ForeignKey("users.id"), nullable=False)
-    token_hash = Column(String, nullable=False)
-    expires_at = Column(DateTime(timezone=True), nullable=False)
+    selector = Column(String(32), unique=True, index=True, nullable=False)
+    token_hash = Column(String(64), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     def __repr__(self):
@@ -0,0 +1,17 @@
+from sqlalchemy import UUID, Column, DateTime, ForeignKey, String
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+
+class RevokedToken(Base):
+    __tablename__ = "revoked_tokens"
+
+    jti = Column(String(64), primary_key=True)
+    user_id = Column(UUID, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    # Rows can be dropped once the token would have expired anyway
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    revoked_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    def __repr__(self):
+        return f"<RevokedToken(jti={self.jti}, user_id='{self.user_id}'>"
@@ -1,6 +1,19 @@
 import uuid
+from datetime import datetime, timezone
 
-from sqlalchemy import UUID, Boolean, Column, DateTime, ForeignKey, String, Text
+from sqlalchemy import (
+    DDL,
+    UUID,
+    BigInteger,
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    String,
+    Text,
+    event,
+)
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -15,10 +28,127 @@ class Task(Base):
     description = Column(Text, nullable=True)
     is_completed = Column(Boolean, default=False)
     user_id = Column(UUID, ForeignKey("users.id"), nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Set in Python as well so timestamps keep microseconds on every backend,
+    # which keyset pagination on (created_at, id) relies on
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        default=lambda: datetime.now(timezone.utc),
+    )
+    updated_at = Column(
+        DateTime(timezone=True), onupdate=lambda: datetime.now(timezone.utc)
+    )
+    # Owner's change sequence at the last write (see TaskCounter.change_seq)
+    change_seq = Column(BigInteger, nullable=False, default=0, server_default="0")
 
     user = relationship("User", back_populates="tasks")
 
+    __table_args__ = (
+        # Serves both the newest-first listing and cursor pagination
+        Index("ix_tasks_user_id_created_at_id", "user_id", "created_at", "id"),
+        # Listing filtered by completion, newest first
+        Index(
+            "ix_tasks_user_id_is_completed_created_at_id",
+            "user_id",
+            "is_completed",
+            "created_at",
+            "id",
+        ),
+        # Title sort and title prefix filter
+        Index("ix_tasks_user_id_title_id", "user_id", "title", "id"),
+        # Delta sync: everything a user changed after a sync token
+        Index("ix_tasks_user_id_change_seq_id", "user_id", "change_seq", "id"),
+    )
+
     def __repr__(self):
         return f"<Task(id={self.id}, title='{self.title}', user_id={self.user_id}, is_completed={self.is_completed})>"
+
+
+# Never-updated tasks sort and filter by created_at under "updated"
+modified_at = func.coalesce(Task.updated_at, Task.created_at)
+
+Index("ix_tasks_user_id_modified_at_id", Task.user_id, modified_at, Task.id)
+# The archiver's scan for tasks completed long ago, across all users
+Index(
+    "ix_tasks_completed_modified_at",
+    modified_at,
+    postgresql_where=Task.is_completed.is_(True),
+    sqlite_where=Task.is_completed.is_(True),
+)
+
+
+# Full-text search lives outside the mapped columns because each backend
+# stores it differently: Postgres as a generated tsvector column with a GIN
+# index (title weighted above description), SQLite as a contentless FTS5
+# table kept in step by triggers. Both are created with the table here and
+# by migration for existing Postgres databases.
+POSTGRES_SEARCH_DDL = [
+    """
+    ALTER TABLE tasks ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A')
+        || setweight(to_tsvector('english', coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX ix_tasks_search_vector ON tasks USING GIN (search_vector)",
+]
+
+# FTS5 keys documents by an integer rowid. The implicit rowid of tasks (whose
+# key is the UUID) may be renumbered by VACUUM, so each task gets a document
+# id of its own in tasks_fts_ids: an INTEGER PRIMARY KEY, which VACUUM keeps.
+SQLITE_SEARCH_DDL = [
+    """
+    CREATE TABLE tasks_fts_ids (
+        doc_id INTEGER PRIMARY KEY,
+        task_id CHAR(32) NOT NULL UNIQUE
+    )
+    """,
+    """
+    CREATE VIRTUAL TABLE tasks_fts USING fts5(
+        title, description, content='', tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER tasks_fts_insert AFTER INSERT ON tasks BEGIN
+        INSERT INTO tasks_fts_ids (task_id) VALUES (new.id);
+        INSERT INTO tasks_fts (rowid, title, description)
+        SELECT doc_id, new.title, new.description
+        FROM tasks_fts_ids WHERE task_id = new.id;
+    END
+    """,
+    # Contentless tables delete a document by being given its indexed values
+    """
+    CREATE TRIGGER tasks_fts_delete AFTER DELETE ON tasks BEGIN
+        INSERT INTO tasks_fts (tasks_fts, rowid, title, description)
+        SELECT 'delete', doc_id, old.title, old.description
+        FROM tasks_fts_ids WHERE task_id = old.id;
+        DELETE FROM tasks_fts_ids WHERE task_id = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER tasks_fts_update AFTER UPDATE OF title, description ON tasks
+    BEGIN
+        INSERT INTO tasks_fts (tasks_fts, rowid, title, description)
+        SELECT 'delete', doc_id, old.title, old.description
+        FROM tasks_fts_ids WHERE task_id = old.id;
+        INSERT INTO tasks_fts (rowid, title, description)
+        SELECT doc_id, new.title, new.description
+        FROM tasks_fts_ids WHERE task_id = new.id;
+    END
+    """,
+]
+
+for statement in POSTGRES_SEARCH_DDL:
+    event.listen(
+        Task.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql")
+    )
+for statement in SQLITE_SEARCH_DDL:
+    event.listen(
+        Task.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite")
+    )
+for statement in (
+    "DROP TABLE IF EXISTS tasks_fts",
+    "DROP TABLE IF EXISTS tasks_fts_ids",
+):
+    event.listen(
+        Task.__table__, "before_drop", DDL(statement).execute_if(dialect="sqlite")
+    )
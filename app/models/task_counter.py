@@ -0,0 +1,22 @@
+from sqlalchemy import UUID, BigInteger, Column, ForeignKey, Integer
+
+from app.core.database import Base
+
+
+class TaskCounter(Base):
+    """Per-user task totals, kept in step with the tasks table by task_service."""
+
+    __tablename__ = "task_counters"
+
+    user_id = Column(UUID, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    total = Column(Integer, nullable=False, default=0, server_default="0")
+    completed = Column(Integer, nullable=False, default=0, server_default="0")
+    # Tasks moved to archived_tasks; not part of total or completed
+    archived = Column(Integer, nullable=False, default=0, server_default="0")
+    # Last position handed out in the user's change sequence. Every task
+    # write bumps it first, so writers serialize on this row and commit in
+    # sequence order
+    change_seq = Column(BigInteger, nullable=False, default=0, server_default="0")
+
+    def __repr__(self):
+        return f"<TaskCounter(user_id={self.user_id}, total={self.total}, completed={self.completed})>"
@@ -0,0 +1,18 @@
+from sqlalchemy import UUID, Column, Date, ForeignKey, Integer
+
+from app.core.database import Base
+
+
+class TaskDailyStat(Base):
+    """Tasks one user created and completed on one UTC day, kept by task_service."""
+
+    __tablename__ = "task_daily_stats"
+
+    user_id = Column(UUID, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    created = Column(Integer, nullable=False, default=0, server_default="0")
+    # Net: marking a task incomplete again takes it back off the day it happens
+    completed = Column(Integer, nullable=False, default=0, server_default="0")
+
+    def __repr__(self):
+        return f"<TaskDailyStat(user_id={self.user_id}, day={self.day}, created={self.created}, completed={self.completed})>"
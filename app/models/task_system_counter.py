@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer
+
+from app.core.database import Base
+
+
+class TaskSystemCounter(Base):
+    """
+    System-wide task totals, split over TASK_STATS_SHARDS rows so writers
+    for different users rarely wait on the same row. Sum the shards to read.
+    """
+
+    __tablename__ = "task_system_counters"
+
+    shard = Column(Integer, primary_key=True, autoincrement=False)
+    total = Column(Integer, nullable=False, default=0, server_default="0")
+    completed = Column(Integer, nullable=False, default=0, server_default="0")
+    archived = Column(Integer, nullable=False, default=0, server_default="0")
+
+    def __repr__(self):
+        return f"<TaskSystemCounter(shard={self.shard}, total={self.total}, completed={self.completed})>"
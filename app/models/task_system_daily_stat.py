@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Date, Integer
+
+from app.core.database import Base
+
+
+class TaskSystemDailyStat(Base):
+    """TaskDailyStat for all users together, sharded like TaskSystemCounter."""
+
+    __tablename__ = "task_system_daily_stats"
+
+    day = Column(Date, primary_key=True)
+    shard = Column(Integer, primary_key=True, autoincrement=False)
+    created = Column(Integer, nullable=False, default=0, server_default="0")
+    completed = Column(Integer, nullable=False, default=0, server_default="0")
+
+    def __repr__(self):
+        return f"<TaskSystemDailyStat(day={self.day}, shard={self.shard}, created={self.created}, completed={self.completed})>"
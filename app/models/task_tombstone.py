@@ -0,0 +1,32 @@
+from sqlalchemy import UUID, BigInteger, Column, DateTime, ForeignKey, Index
+
+from app.core.database import Base
+
+
+class TaskTombstone(Base):
+    """
+    Marker left by a deleted or archived task so delta sync can report that
+    it left the user's tasks.
+    Compacted once older than TASK_TOMBSTONE_RETENTION_DAYS.
+    """
+
+    __tablename__ = "task_tombstones"
+
+    task_id = Column(UUID, primary_key=True)
+    user_id = Column(UUID, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    # Position in the owner's change sequence, shared with tasks.change_seq
+    change_seq = Column(BigInteger, nullable=False)
+    deleted_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        Index(
+            "ix_task_tombstones_user_id_change_seq_task_id",
+            "user_id",
+            "change_seq",
+            "task_id",
+        ),
+        Index("ix_task_tombstones_deleted_at", "deleted_at"),
+    )
+
+    def __repr__(self):
+        return f"<TaskTombstone(task_id={self.task_id}, user_id={self.user_id}, change_seq={self.change_seq})>"
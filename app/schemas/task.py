@@ -1,8 +1,9 @@
-from datetime import datetime
-from typing import List, Optional
+from datetime import date, datetime
+from enum import Enum
+from typing import List, Literal, Optional
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class TaskBase(BaseModel):
@@ -31,13 +32,124 @@ class Task(TaskBase):
         from_attributes = True
 
 
+class TaskSort(str, Enum):
+    created_at = "created_at"
+    # Last modification, falling back to created_at for never-updated tasks
+    updated_at = "updated_at"
+    title = "title"
+
+
+class TaskFilter(BaseModel):
+    is_completed: Optional[bool] = None
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+    # Ranges over the last modification, as for sort=updated_at
+    updated_after: Optional[datetime] = None
+    updated_before: Optional[datetime] = None
+    # Case-sensitive title prefix
+    title_prefix: Optional[str] = Field(None, min_length=1, max_length=200)
+    sort: TaskSort = TaskSort.created_at
+    order: Literal["asc", "desc"] = "desc"
+    # Also list tasks the archiver has moved out of the tasks table
+    include_archived: bool = False
+
+
 class PaginationMeta(BaseModel):
-    page: int
+    # None when the page was requested by cursor
+    page: Optional[int]
     size: int
     total: int
     pages: int
+    # Pass as ?cursor= to fetch the following page; None on the last page
+    next_cursor: Optional[str] = None
 
 
 class PaginatedTaskResponse(BaseModel):
     items: List[Task]
     meta: PaginationMeta
+
+
+class UserTaskPage(PaginatedTaskResponse):
+    user_id: UUID
+
+
+class UserTaskPages(BaseModel):
+    results: List[UserTaskPage]
+    # Database round trips taken for the whole batch
+    round_trips: int
+
+
+class TaskBulkCreate(BaseModel):
+    items: List[TaskCreate] = Field(..., min_length=1)
+
+
+class TaskBulkUpdateItem(TaskUpdate):
+    id: UUID
+
+
+class TaskBulkUpdate(BaseModel):
+    items: List[TaskBulkUpdateItem] = Field(..., min_length=1)
+
+
+class TaskBulkDelete(BaseModel):
+    ids: List[UUID] = Field(..., min_length=1)
+
+
+class TaskBulkResult(BaseModel):
+    id: Optional[UUID] = None
+    # Status the item would have had as a single-task request
+    status: int
+    task: Optional[Task] = None
+    detail: Optional[str] = None
+
+
+class TaskBulkResponse(BaseModel):
+    results: List[TaskBulkResult]
+
+
+class TaskImportError(BaseModel):
+    # 1-based line of the upload the rejected row starts on
+    line: int
+    detail: str
+
+
+class TaskImportResult(BaseModel):
+    imported: int
+    failed: int
+    # At most TASK_IMPORT_MAX_ERRORS entries; failed counts every one
+    errors: List[TaskImportError]
+    elapsed_ms: float
+    rows_per_second: float
+
+
+class TaskTombstone(BaseModel):
+    id: UUID
+    deleted_at: datetime
+
+
+class TaskChanges(BaseModel):
+    # Tasks created or modified since the token; every task without one
+    tasks: List[Task]
+    # Tasks deleted or archived since the token; always empty without one
+    deleted: List[TaskTombstone]
+    # Pass as ?since= on the next sync, or to fetch the rest when has_more
+    sync_token: str
+    has_more: bool
+
+
+class TaskDailyCount(BaseModel):
+    day: date
+    created: int
+    # Net of tasks marked incomplete again the same day
+    completed: int
+
+
+class TaskStats(BaseModel):
+    # Live and archived tasks together; archived ones count as completed
+    total: int
+    open: int
+    completed: int
+    archived: int
+    completion_rate: float
+    # One entry per UTC day, oldest first, including days without activity
+    daily: List[TaskDailyCount]
@@ -36,3 +36,10 @@ class User(UserBase):
 
     class Config:
         from_attributes = True
+
+
+class Principal(BaseModel):
+    """The authenticated caller: just what authorization checks need."""
+
+    id: UUID
+    role_names: List[str] = []
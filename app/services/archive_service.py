@@ -0,0 +1,213 @@
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List
+from uuid import UUID
+
+from sqlalchemy import bindparam, delete, insert, literal, select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.events import task_events
+from app.core.response_cache import task_list_cache
+from app.models.archived_task import ArchivedTask
+from app.models.task import Task, modified_at
+from app.models.task_counter import TaskCounter
+from app.models.task_tombstone import TaskTombstone
+from app.services.stats_service import record_archived_tasks
+from app.services.task_service import recompute_task_counters
+
+# Columns copied as they are; archived_tasks adds archived_at
+ARCHIVE_COLUMNS = tuple(Task.__table__.c.keys())
+SIZED_TABLES = ("tasks", "archived_tasks")
+
+
+async def table_sizes(db: AsyncSession) -> Dict[str, dict]:
+    """Bytes used by the data and by the indexes of each of SIZED_TABLES."""
+    connection = await db.connection()
+    sizes = {name: {"table_bytes": 0, "index_bytes": 0} for name in SIZED_TABLES}
+    if connection.dialect.name == "postgresql":
+        for name in SIZED_TABLES:
+            table_bytes, index_bytes = (
+                await connection.execute(
+                    text(
+                        "SELECT pg_table_size(CAST(:name AS regclass)), "
+                        "pg_indexes_size(CAST(:name AS regclass))"
+                    ),
+                    {"name": name},
+                )
+            ).one()
+            sizes[name] = {"table_bytes": table_bytes, "index_bytes": index_bytes}
+        return sizes
+    # SQLite: pages per b-tree from the dbstat virtual table
+    result = await connection.execute(
+        text(
+            "SELECT m.tbl_name, m.type, SUM(s.pgsize) FROM dbstat AS s "
+            "JOIN sqlite_master AS m ON m.name = s.name "
+            "WHERE m.tbl_name IN ('tasks', 'archived_tasks') "
+            "GROUP BY m.tbl_name, m.type"
+        )
+    )
+    for name, kind, size in result:
+        sizes[name]["index_bytes" if kind == "index" else "table_bytes"] = size
+    return sizes
+
+
+class TaskArchiver:
+    """
+    Moves tasks completed more than after_days ago from tasks to
+    archived_tasks, so lists, counts and indexes only pay for live rows.
+
+    Each batch is one transaction: copy, delete and counter update commit
+    together, so a task is always in exactly one of the two tables. For
+    delta sync an archived task is gone like a deleted one: the batch takes
+    the next change sequence number of each owner, leaves tombstones under
+    it and publishes "archived" events. Keeps the rows moved and the table
+    and index sizes after the last run for /metrics.
+    """
+
+    def __init__(self, after_days: int, batch_size: int, max_batches: int):
+        self.after_days = after_days
+        self.batch_size = batch_size
+        self.max_batches = max_batches
+        self.runs = 0
+        self.rows_moved = 0
+        self.last_moved = 0
+        self.last_elapsed_ms = 0.0
+        self.table_sizes: Dict[str, dict] = {}
+
+    async def _move_batch(
+        self, db: AsyncSession, cutoff: datetime, archived_at: datetime
+    ) -> int:
+        # Same predicate as the partial index the scan runs on
+        eligible = (Task.is_completed.is_(True), modified_at < cutoff)
+        candidates = (
+            await db.execute(
+                select(Task.id, Task.user_id)
+                .where(*eligible)
+                .order_by(modified_at)
+                .limit(self.batch_size)
+            )
+        ).all()
+        if not candidates:
+            return 0
+
+        # Task writes lock their owner's counter row before any task row.
+        # Taking the same locks first, in a fixed order, keeps the batch
+        # from deadlocking with them and its rows from changing under it.
+        user_ids = sorted({row.user_id for row in candidates})
+        lock = (
+            select(TaskCounter.user_id, TaskCounter.change_seq)
+            .where(TaskCounter.user_id.in_(user_ids))
+            .order_by(TaskCounter.user_id)
+            .with_for_update()
+        )
+        change_seqs = dict((await db.execute(lock)).all())
+        if len(change_seqs) < len(user_ids):
+            # Users created outside create_user have no counter row yet
+            for owner in user_ids:
+                if owner not in change_seqs:
+                    await recompute_task_counters(db, owner)
+            change_seqs = dict((await db.execute(lock)).all())
+        scope = (Task.id.in_([row.id for row in candidates]), *eligible)
+        await db.execute(
+            insert(ArchivedTask).from_select(
+                [*ARCHIVE_COLUMNS, "archived_at"],
+                select(
+                    *(Task.__table__.c[name] for name in ARCHIVE_COLUMNS),
+                    literal(archived_at, ArchivedTask.archived_at.type),
+                ).where(*scope),
+            )
+        )
+        result = await db.execute(
+            delete(Task)
+            .where(*scope)
+            .returning(Task.id, Task.user_id)
+            .execution_options(synchronize_session=False)
+        )
+        moved: Dict[UUID, List[UUID]] = defaultdict(list)
+        for task_id, owner in result:
+            moved[owner].append(task_id)
+        if moved:
+            connection = await db.connection()
+            await connection.execute(
+                update(TaskCounter)
+                .where(TaskCounter.user_id == bindparam("owner"))
+                .values(
+                    total=TaskCounter.total - bindparam("moved"),
+                    completed=TaskCounter.completed - bindparam("moved"),
+                    archived=TaskCounter.archived + bindparam("moved"),
+                    change_seq=TaskCounter.change_seq + 1,
+                ),
+                [
+                    {"owner": owner, "moved": len(task_ids)}
+                    for owner, task_ids in moved.items()
+                ],
+            )
+            # The counter rows are locked above, so change_seq + 1 is the
+            # number the UPDATE just took
+            await db.execute(
+                insert(TaskTombstone),
+                [
+                    {
+                        "task_id": task_id,
+                        "user_id": owner,
+                        "change_seq": change_seqs[owner] + 1,
+                        "deleted_at": archived_at,
+                    }
+                    for owner, task_ids in moved.items()
+                    for task_id in task_ids
+                ],
+            )
+            await record_archived_tasks(
+                db, {owner: len(task_ids) for owner, task_ids in moved.items()}
+            )
+        await db.commit()
+        for owner, task_ids in moved.items():
+            await task_list_cache.invalidate(owner)
+            await task_events.publish(
+                owner,
+                [{"type": "archived", "id": str(task_id)} for task_id in task_ids],
+            )
+        return sum(len(task_ids) for task_ids in moved.values())
+
+    async def run(self, db: AsyncSession) -> int:
+        """Archive up to max_batches batches; returns the rows moved."""
+        started = time.perf_counter()
+        now = datetime.now(timezone.utc)
+        cutoff = now - timedelta(days=self.after_days)
+        moved = 0
+        for _ in range(self.max_batches):
+            count = await self._move_batch(db, cutoff, now)
+            moved += count
+            if count < self.batch_size:
+                break
+        self.table_sizes = await table_sizes(db)
+        self.runs += 1
+        self.rows_moved += moved
+        self.last_moved = moved
+        self.last_elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+        return moved
+
+    def stats(self) -> dict:
+        return {
+            "after_days": self.after_days,
+            "runs": self.runs,
+            "rows_moved": self.rows_moved,
+            "last_moved": self.last_moved,
+            "last_elapsed_ms": self.last_elapsed_ms,
+            "table_sizes": self.table_sizes,
+        }
+
+    def reset(self) -> None:
+        self.runs = self.rows_moved = self.last_moved = 0
+        self.last_elapsed_ms = 0.0
+        self.table_sizes = {}
+
+
+# Moves long-completed tasks to archived_tasks (see TASK_ARCHIVE_*)
+task_archiver = TaskArchiver(
+    after_days=settings.TASK_ARCHIVE_AFTER_DAYS,
+    batch_size=settings.TASK_ARCHIVE_BATCH_SIZE,
+    max_batches=settings.TASK_ARCHIVE_MAX_BATCHES,
+)
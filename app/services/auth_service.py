@@ -1,50 +1,128 @@
+import asyncio
+import logging
 from datetime import datetime, timedelta, timezone
+from typing import Optional, Set
+from uuid import UUID
 
 from fastapi import status
 from fastapi.exceptions import HTTPException
-from sqlalchemy import select
+from sqlalchemy import delete, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 from app.core.config import settings
+from app.core.rate_limit import login_shield
 from app.core.security import (
+    TokenError,
     create_access_token,
     create_refresh_token,
+    decode_access_token,
+    hash_password_async,
     hash_refresh_token,
-    verify_password,
+    password_needs_rehash,
+    split_refresh_token,
+    verify_password_async,
     verify_refresh_token,
 )
 from app.models.refresh_token import RefreshToken
 from app.models.user import User
 from app.schemas.token import Token
+from app.schemas.user import Principal
+from app.services.revocation_service import revoke_token
 from app.services.user_service import get_user_by_email
 
+logger = logging.getLogger(__name__)
+
+# Strong references to in-flight rehash tasks so they are not garbage collected
+_pending_rehashes: Set[asyncio.Task] = set()
+
+
+def _access_token_claims(user: User) -> dict:
+    claims = {"sub": str(user.id)}
+    if settings.ACCESS_TOKEN_EMBED_CLAIMS:
+        # Roles must already be loaded on the user
+        claims["roles"] = [role.name for role in user.roles]
+        claims["ver"] = user.token_version
+    return claims
+
+
+async def _rehash_password(bind, user_id: UUID, old_hash: str, password: str):
+    try:
+        new_hash = await hash_password_async(password)
+        async with AsyncSession(bind=bind) as db:
+            # Guarded on the old hash so a concurrent password change wins
+            await db.execute(
+                update(User)
+                .where(User.id == user_id, User.password == old_hash)
+                .values(password=new_hash)
+            )
+            await db.commit()
+    except Exception:
+        logger.warning("Could not rehash password for user %s", user_id, exc_info=True)
+
+
+def schedule_password_rehash(db: AsyncSession, user: User, password: str) -> None:
+    """Upgrade a stale password hash after the response, off the request path."""
+    task = asyncio.create_task(
+        _rehash_password(db.bind, user.id, user.password, password)
+    )
+    _pending_rehashes.add(task)
+    task.add_done_callback(_pending_rehashes.discard)
+
+
+async def wait_for_pending_rehashes() -> None:
+    if _pending_rehashes:
+        await asyncio.gather(*_pending_rehashes, return_exceptions=True)
+
+
+async def authenticate_user(
+    db: AsyncSession, email: str, password: str, client_ip: Optional[str] = None
+):
+    # Throttled attempts are rejected before any lookup or hashing
+    retry_after = await login_shield.check(email, client_ip)
+    if retry_after > 0:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts, please try again later",
+            headers={"Retry-After": str(max(1, round(retry_after)))},
+        )
 
-async def authenticate_user(db: AsyncSession, email: str, password: str):
     users_exists = await get_user_by_email(email, db)
 
     if not users_exists:
+        await login_shield.record_failure(email, client_ip)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"User with email {email} does not exists",
         )
 
-    if not verify_password(
+    if not await verify_password_async(
         plain_password=password, hashed_password=users_exists.password
     ):
+        await login_shield.record_failure(email, client_ip)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=f"Incorrect password, please try again",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    access_token = create_access_token(data={"sub": str(users_exists.id)})
+    await login_shield.record_success(email, client_ip)
+
+    if password_needs_rehash(users_exists.password):
+        schedule_password_rehash(db, users_exists, password)
+
+    if settings.ACCESS_TOKEN_EMBED_CLAIMS:
+        await db.refresh(users_exists, ["roles"])
+    access_token = create_access_token(data=_access_token_claims(users_exists))
     refresh_token = create_refresh_token()
 
     expires_at = datetime.now(timezone.utc) + timedelta(
         days=settings.REFRESH_TOKEN_EXPIRE_DAYS
     )
+    selector, _ = split_refresh_token(refresh_token)
     db_refresh_token = RefreshToken(
         user_id=users_exists.id,
+        selector=selector,
         token_hash=hash_refresh_token(refresh_token),
         expires_at=expires_at,
     )
@@ -56,31 +134,110 @@ async def authenticate_user(db: AsyncSession, email: str, password: str):
 
 
 async def refresh_access_token(db: AsyncSession, refresh_token: str):
-    result = await db.execute(
-        select(RefreshToken)
-        .join(User)
-        .filter(RefreshToken.expires_at > datetime.now(timezone.utc))
+    invalid_token_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid or expired refresh token",
+        headers={"WWW-Authenticate": "Bearer"},
     )
-    db_refresh_token = result.scalars().first()
-    if not db_refresh_token or not verify_refresh_token(
-        refresh_token, str(db_refresh_token.token_hash)
-    ):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired refresh token",
-            headers={"WWW-Authenticate": "Bearer"},
+    try:
+        selector, _ = split_refresh_token(refresh_token)
+    except ValueError:
+        raise invalid_token_exception
+
+    # Single round trip on the unique selector index, token and owner together
+    query = (
+        select(RefreshToken, User)
+        .join(User, User.id == RefreshToken.user_id)
+        .where(
+            RefreshToken.selector == selector,
+            RefreshToken.expires_at > datetime.now(timezone.utc),
         )
-    user_result = await db.execute(
-        select(User).filter(User.id == db_refresh_token.user_id)
     )
-    user = user_result.scalars().first()
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    new_access_token = create_access_token(data={"sub": str(user.id)})
+    if settings.ACCESS_TOKEN_EMBED_CLAIMS:
+        query = query.options(selectinload(User.roles))
+    result = await db.execute(query)
+    row = result.first()
+    if not row or not verify_refresh_token(
+        refresh_token, str(row.RefreshToken.token_hash)
+    ):
+        raise invalid_token_exception
+
+    user = row.User
+    new_access_token = create_access_token(data=_access_token_claims(user))
     return Token(
         access_token=new_access_token, refresh_token=refresh_token, token_type="bearer"
     )
+
+
+async def delete_expired_refresh_tokens(
+    db: AsyncSession, batch_size: int, max_batches: int
+) -> int:
+    """
+    Delete expired refresh tokens in batches, committing after each one so no
+    transaction holds row locks for long. Returns the number of rows removed.
+    """
+    now = datetime.now(timezone.utc)
+    removed = 0
+    for _ in range(max_batches):
+        expired_ids = (
+            select(RefreshToken.id)
+            .where(RefreshToken.expires_at <= now)
+            .limit(batch_size)
+            .scalar_subquery()
+        )
+        result = await db.execute(
+            delete(RefreshToken).where(RefreshToken.id.in_(expired_ids))
+        )
+        await db.commit()
+        removed += result.rowcount
+        if result.rowcount < batch_size:
+            break
+    return removed
+
+
+async def _revoke_claims(db: AsyncSession, claims: dict) -> None:
+    await revoke_token(
+        db,
+        jti=claims["jti"],
+        user_id=UUID(claims["sub"]),
+        expires_at=datetime.fromtimestamp(claims["exp"], tz=timezone.utc),
+    )
+
+
+async def logout(db: AsyncSession, claims: dict, refresh_token: Optional[str] = None):
+    """Revoke the presented access token and, if given, its refresh token."""
+    if refresh_token:
+        try:
+            selector, _ = split_refresh_token(refresh_token)
+            await db.execute(
+                delete(RefreshToken).where(
+                    RefreshToken.selector == selector,
+                    RefreshToken.user_id == UUID(claims["sub"]),
+                )
+            )
+        except ValueError:
+            pass
+    if claims.get("jti"):
+        await _revoke_claims(db, claims)
+    else:
+        await db.commit()
+
+
+async def revoke_access_token(db: AsyncSession, token: str, principal: Principal):
+    try:
+        claims = decode_access_token(token)
+    except TokenError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid access token"
+        )
+    if not claims.get("jti") or not claims.get("sub"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Access token cannot be revoked",
+        )
+    if claims["sub"] != str(principal.id) and "admin" not in principal.role_names:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Cannot revoke another user's token",
+        )
+    await _revoke_claims(db, claims)
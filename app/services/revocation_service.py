@@ -0,0 +1,134 @@
+from datetime import datetime, timezone
+from typing import List, Set
+from uuid import UUID
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.bloom import BloomFilter
+from app.core.config import settings
+from app.models.revoked_token import RevokedToken
+
+
+class RevocationList:
+    """
+    Per-worker Bloom filter of revoked access token ids (jti).
+
+    A miss proves the token was not revoked as of the last refresh, so the
+    common case costs no query; only hits are confirmed against the table.
+    Tokens revoked on this worker are added immediately, tokens revoked on
+    other workers become visible on the next periodic refresh.
+    """
+
+    def __init__(self, min_capacity: int, error_rate: float):
+        self.min_capacity = min_capacity
+        self.error_rate = error_rate
+        self.filter = BloomFilter(min_capacity, error_rate)
+        self.checks = 0
+        self.filter_hits = 0
+        self.false_positives = 0
+        self.refreshes = 0
+        # One set per refresh in progress, collecting the jtis added meanwhile
+        self._added_during_refresh: List[Set[str]] = []
+
+    async def refresh(self, db: AsyncSession) -> int:
+        # Revocations made while the query runs, or committed after its
+        # snapshot, would be missing from the new filter; carry them over
+        added: Set[str] = set()
+        self._added_during_refresh.append(added)
+        try:
+            result = await db.execute(
+                select(RevokedToken.jti).where(
+                    RevokedToken.expires_at > datetime.now(timezone.utc)
+                )
+            )
+            jtis = result.scalars().all()
+            # Leave headroom so revocations until the next refresh keep the rate
+            fresh = BloomFilter(max(self.min_capacity, len(jtis) * 2), self.error_rate)
+            for jti in jtis:
+                fresh.add(jti)
+            for jti in added:
+                fresh.add(jti)
+            self.filter = fresh
+        finally:
+            self._added_during_refresh = [
+                other for other in self._added_during_refresh if other is not added
+            ]
+        self.refreshes += 1
+        return len(jtis)
+
+    def add(self, jti: str) -> None:
+        self.filter.add(jti)
+        for added in self._added_during_refresh:
+            added.add(jti)
+
+    async def is_revoked(self, jti: str, db: AsyncSession) -> bool:
+        self.checks += 1
+        if jti not in self.filter:
+            return False
+        self.filter_hits += 1
+        result = await db.execute(
+            select(RevokedToken.jti).where(RevokedToken.jti == jti)
+        )
+        if result.scalar_one_or_none() is None:
+            self.false_positives += 1
+            return False
+        return True
+
+    def stats(self) -> dict:
+        return {
+            "items": self.filter.count,
+            "capacity": self.filter.capacity,
+            "size_bytes": self.filter.size_bytes,
+            "hash_count": self.filter.hash_count,
+            "estimated_false_positive_rate": round(
+                self.filter.estimated_false_positive_rate(), 6
+            ),
+            "checks": self.checks,
+            "filter_hits": self.filter_hits,
+            "false_positives": self.false_positives,
+            "observed_false_positive_rate": (
+                round(self.false_positives / self.checks, 6) if self.checks else 0.0
+            ),
+            "refreshes": self.refreshes,
+        }
+
+    def reset(self) -> None:
+        self.filter = BloomFilter(self.min_capacity, self.error_rate)
+        self.checks = self.filter_hits = self.false_positives = self.refreshes = 0
+
+
+revocation_list = RevocationList(
+    min_capacity=settings.REVOCATION_FILTER_CAPACITY,
+    error_rate=settings.REVOCATION_FILTER_ERROR_RATE,
+)
+
+
+async def revoke_token(
+    db: AsyncSession, jti: str, user_id: UUID, expires_at: datetime
+) -> None:
+    await db.merge(RevokedToken(jti=jti, user_id=user_id, expires_at=expires_at))
+    await db.commit()
+    revocation_list.add(jti)
+
+
+async def delete_expired_revocations(
+    db: AsyncSession, batch_size: int, max_batches: int
+) -> int:
+    now = datetime.now(timezone.utc)
+    removed = 0
+    for _ in range(max_batches):
+        expired_jtis = (
+            select(RevokedToken.jti)
+            .where(RevokedToken.expires_at <= now)
+            .limit(batch_size)
+            .scalar_subquery()
+        )
+        result = await db.execute(
+            delete(RevokedToken).where(RevokedToken.jti.in_(expired_jtis))
+        )
+        await db.commit()
+        removed += result.rowcount
+        if result.rowcount < batch_size:
+            break
+    return removed
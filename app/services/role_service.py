@@ -5,6 +5,7 @@ from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.core.cache import invalidate_user
 from app.models.role import Role
 from app.models.user import User
 from app.models.user_role import UserRole
@@ -32,6 +33,9 @@ async def assign_roles_to_user(db_user: User, role_names: List[str], db: AsyncSe
         for role in roles:
             db_user.roles.append(role)
 
+        if db_user.id is not None:
+            invalidate_user(db_user.id)
+
     except ValueError as e:
         raise ValueError(f"Invalid user_id format: {e}")
     except Exception as e:
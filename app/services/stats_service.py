@@ -0,0 +1,278 @@
+import zlib
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Tuple
+from uuid import UUID
+
+from sqlalchemy import Integer, case, cast, func, null, select, union_all
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.archived_task import ArchivedTask
+from app.models.task import Task
+from app.models.task_counter import TaskCounter
+from app.models.task_daily_stat import TaskDailyStat
+from app.models.task_system_counter import TaskSystemCounter
+from app.models.task_system_daily_stat import TaskSystemDailyStat
+from app.schemas.task import TaskDailyCount, TaskStats
+
+
+def stats_shard(user_id: UUID) -> int:
+    """The TaskSystemCounter / TaskSystemDailyStat shard a user's writes go to."""
+    return zlib.crc32(user_id.bytes) % settings.TASK_STATS_SHARDS
+
+
+async def _add_to_row(
+    db: AsyncSession,
+    model,
+    keys: dict,
+    deltas: dict,
+    floor_zero: Tuple[str, ...] = (),
+) -> None:
+    """
+    Add deltas to the row of model at keys, inserting it if missing. Columns
+    in floor_zero never go below zero.
+    """
+    connection = await db.connection()
+    if connection.dialect.name == "postgresql":
+        statement, greatest = postgresql_insert(model), func.greatest
+    else:
+        statement, greatest = sqlite_insert(model), func.max
+    inserted = {
+        name: max(delta, 0) if name in floor_zero else delta
+        for name, delta in deltas.items()
+    }
+    statement = statement.values(**keys, **inserted)
+    set_ = {
+        # The raw delta: excluded holds the floored value
+        name: (
+            greatest(getattr(model, name) + delta, 0)
+            if name in floor_zero
+            else getattr(model, name) + statement.excluded[name]
+        )
+        for name, delta in deltas.items()
+    }
+    await db.execute(
+        statement.on_conflict_do_update(
+            index_elements=list(keys),
+            set_=set_,
+        )
+    )
+
+
+async def record_task_stats(
+    db: AsyncSession,
+    user_id: UUID,
+    total: int = 0,
+    completed: int = 0,
+    daily: bool = True,
+) -> None:
+    """
+    Carry one write's task counter deltas into the rollups, in the write's
+    transaction. With daily, a positive total counts as created today and
+    completed as completed today, for the user and for the system. Tasks do
+    not record when they were completed, so an uncompletion takes back one
+    of today's completions, never going below zero.
+
+    The user's counter row is already locked by the write, so only the
+    shared system rows are contended; they are always taken counter first,
+    then day, so writers cannot deadlock on them.
+    """
+    shard = stats_shard(user_id)
+    if total or completed:
+        await _add_to_row(
+            db,
+            TaskSystemCounter,
+            {"shard": shard},
+            {"total": total, "completed": completed, "archived": 0},
+        )
+    created = max(total, 0)
+    if not daily or not (created or completed):
+        return
+    today = datetime.now(timezone.utc).date()
+    deltas = {"created": created, "completed": completed}
+    await _add_to_row(
+        db,
+        TaskDailyStat,
+        {"user_id": user_id, "day": today},
+        deltas,
+        floor_zero=("completed",),
+    )
+    await _add_to_row(
+        db,
+        TaskSystemDailyStat,
+        {"day": today, "shard": shard},
+        deltas,
+        floor_zero=("completed",),
+    )
+
+
+async def record_archived_tasks(db: AsyncSession, moved: Dict[UUID, int]) -> None:
+    """Move archived task counts (per owner) from live to archived in the rollups."""
+    by_shard: Dict[int, int] = defaultdict(int)
+    for user_id, count in moved.items():
+        by_shard[stats_shard(user_id)] += count
+    for shard in sorted(by_shard):
+        count = by_shard[shard]
+        await _add_to_row(
+            db,
+            TaskSystemCounter,
+            {"shard": shard},
+            {"total": -count, "completed": -count, "archived": count},
+        )
+
+
+def _task_stats(
+    total: int, completed: int, archived: int, rows: Iterable, first: date, days: int
+) -> TaskStats:
+    counts = {row.day: (row.created, row.completed) for row in rows}
+    daily = []
+    for offset in range(days):
+        day = first + timedelta(days=offset)
+        created, completed_on_day = counts.get(day, (0, 0))
+        daily.append(
+            TaskDailyCount(day=day, created=created, completed=completed_on_day)
+        )
+    # Archived tasks were all completed when they were moved
+    total += archived
+    completed += archived
+    return TaskStats(
+        total=total,
+        open=total - completed,
+        completed=completed,
+        archived=archived,
+        completion_rate=round(completed / total, 4) if total else 0.0,
+        daily=daily,
+    )
+
+
+def _first_day(days: int) -> date:
+    return datetime.now(timezone.utc).date() - timedelta(days=days - 1)
+
+
+async def get_user_task_stats(
+    user_id: UUID, db: AsyncSession, days: int = 30
+) -> TaskStats:
+    """
+    A user's task totals and the last days of daily activity, from the
+    task counter row and the (user_id, day) rollup: two primary key lookups
+    whatever the number of tasks.
+    """
+    first = _first_day(days)
+    counter = (
+        await db.execute(
+            select(
+                TaskCounter.total, TaskCounter.completed, TaskCounter.archived
+            ).where(TaskCounter.user_id == user_id)
+        )
+    ).first()
+    if counter is None:
+        # Users created outside create_user have no counter row yet
+        counter = (
+            await db.execute(
+                select(
+                    func.count(Task.id),
+                    func.coalesce(
+                        func.sum(case((Task.is_completed.is_(True), 1), else_=0)), 0
+                    ),
+                    select(func.count(ArchivedTask.id))
+                    .where(ArchivedTask.user_id == user_id)
+                    .scalar_subquery(),
+                ).where(Task.user_id == user_id)
+            )
+        ).one()
+    rows = await db.execute(
+        select(TaskDailyStat.day, TaskDailyStat.created, TaskDailyStat.completed)
+        .where(TaskDailyStat.user_id == user_id, TaskDailyStat.day >= first)
+        .order_by(TaskDailyStat.day)
+    )
+    return _task_stats(*counter, rows, first, days)
+
+
+async def get_system_task_stats(db: AsyncSession, days: int = 30) -> TaskStats:
+    """
+    Task totals and daily activity across all users, from the sharded
+    rollups: TASK_STATS_SHARDS counter rows plus shards x days daily rows.
+    """
+    first = _first_day(days)
+    totals = (
+        await db.execute(
+            select(
+                func.coalesce(func.sum(TaskSystemCounter.total), 0),
+                func.coalesce(func.sum(TaskSystemCounter.completed), 0),
+                func.coalesce(func.sum(TaskSystemCounter.archived), 0),
+            )
+        )
+    ).one()
+    rows = await db.execute(
+        select(
+            TaskSystemDailyStat.day,
+            func.sum(TaskSystemDailyStat.created).label("created"),
+            func.sum(TaskSystemDailyStat.completed).label("completed"),
+        )
+        .where(TaskSystemDailyStat.day >= first)
+        .group_by(TaskSystemDailyStat.day)
+        .order_by(TaskSystemDailyStat.day)
+    )
+    return _task_stats(*totals, rows, first, days)
+
+
+async def recompute_system_counters(db: AsyncSession) -> int:
+    """
+    Repair the system counter shards from the per-user task counters, which
+    recompute_task_counters keeps true. Returns how many shards were wrong.
+
+    Writes move a user's counter and their shard in one transaction, so a
+    single statement reading both (one snapshot) shows each shard's drift
+    whatever writes are in flight. Each wrong shard is then corrected by its
+    drift with the same relative upsert writes use, committed on its own: no
+    shard row is locked while task_counters is read, and only one at a time
+    after. Daily rows are not rebuilt: they record events (including tasks
+    deleted since) that the tables no longer hold.
+    """
+    counters = select(
+        TaskCounter.user_id,
+        cast(null(), Integer).label("shard"),
+        TaskCounter.total,
+        TaskCounter.completed,
+        TaskCounter.archived,
+    )
+    shards = select(
+        cast(null(), TaskCounter.user_id.type),
+        TaskSystemCounter.shard,
+        TaskSystemCounter.total,
+        TaskSystemCounter.completed,
+        TaskSystemCounter.archived,
+    )
+    rows = await db.stream(
+        union_all(counters, shards).execution_options(yield_per=10000)
+    )
+    drift: Dict[int, List[int]] = defaultdict(lambda: [0, 0, 0])
+    async for user_id, shard, *counts in rows:
+        if user_id is not None:
+            sums = drift[stats_shard(user_id)]
+            sign = 1
+        else:
+            sums = drift[shard]
+            sign = -1
+        for index, count in enumerate(counts):
+            sums[index] += sign * count
+    # Ends the read transaction before the shards are written
+    await db.commit()
+
+    repaired = 0
+    for shard in sorted(drift):
+        total, completed, archived = drift[shard]
+        if not (total or completed or archived):
+            continue
+        repaired += 1
+        await _add_to_row(
+            db,
+            TaskSystemCounter,
+            {"shard": shard},
+            {"total": total, "completed": completed, "archived": archived},
+        )
+        await db.commit()
+    return repaired
@@ -1,20 +1,307 @@
-from typing import Optional, Sequence, Tuple
-from uuid import UUID
+import codecs
+import csv
+import hashlib
+import io
+import json
+import re
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import (
+    IO,
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+from uuid import UUID, uuid4
 
 from fastapi import HTTPException
-from sqlalchemy import and_, func, select
+from pydantic import ValidationError
+from sqlalchemy import (
+    Float,
+    and_,
+    case,
+    column,
+    delete,
+    func,
+    insert,
+    literal,
+    literal_column,
+    null,
+    select,
+    table,
+    true,
+    tuple_,
+    union_all,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
-from app.models.task import Task
-from app.schemas.task import TaskCreate, TaskUpdate
+from app.core.config import settings
+from app.core.etag import parse_etags, weak_etag
+from app.core.events import task_events
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.response_cache import task_list_cache
+from app.models.archived_task import ArchivedTask, archived_modified_at
+from app.models.task import Task, modified_at
+from app.models.task_counter import TaskCounter
+from app.models.task_tombstone import TaskTombstone
+from app.models.user import User
+from app.schemas.task import Task as TaskSchema
+from app.schemas.task import (
+    TaskBulkResult,
+    TaskBulkUpdateItem,
+    TaskChanges,
+    TaskCreate,
+    TaskFilter,
+    TaskImportError,
+    TaskImportResult,
+    TaskSort,
+)
+from app.schemas.task import TaskTombstone as TaskTombstoneSchema
+from app.schemas.task import (
+    TaskUpdate,
+)
+from app.services.stats_service import record_task_stats
+
+
+async def recompute_task_counters(
+    db: AsyncSession,
+    user_id: Optional[UUID] = None,
+    user_ids: Optional[Sequence[UUID]] = None,
+) -> int:
+    """
+    Rebuild task counters from the tasks and archived_tasks tables, for one
+    user, for the users in user_ids or for everyone who has tasks or a
+    counter row. Returns how many counters were wrong. The caller commits.
+    """
+    actual_query = select(
+        Task.user_id,
+        func.count(Task.id),
+        func.coalesce(func.sum(case((Task.is_completed.is_(True), 1), else_=0)), 0),
+    ).group_by(Task.user_id)
+    archived_query = select(ArchivedTask.user_id, func.count(ArchivedTask.id)).group_by(
+        ArchivedTask.user_id
+    )
+    stored_query = select(
+        TaskCounter.user_id,
+        TaskCounter.total,
+        TaskCounter.completed,
+        TaskCounter.archived,
+    )
+    if user_id is not None:
+        actual_query = actual_query.where(Task.user_id == user_id)
+        archived_query = archived_query.where(ArchivedTask.user_id == user_id)
+        # Task writes take this row first, so holding it keeps the counts still
+        stored_query = stored_query.where(TaskCounter.user_id == user_id)
+        stored_query = stored_query.with_for_update()
+    elif user_ids is not None:
+        actual_query = actual_query.where(Task.user_id.in_(user_ids))
+        archived_query = archived_query.where(ArchivedTask.user_id.in_(user_ids))
+        stored_query = stored_query.where(TaskCounter.user_id.in_(user_ids))
+
+    stored = {row[0]: tuple(row[1:]) for row in await db.execute(stored_query)}
+    actual = {row[0]: (row[1], row[2], 0) for row in await db.execute(actual_query)}
+    for archived_user_id, archived in await db.execute(archived_query):
+        total, completed, _ = actual.get(archived_user_id, (0, 0, 0))
+        actual[archived_user_id] = (total, completed, archived)
+    if user_id is not None:
+        actual.setdefault(user_id, (0, 0, 0))
+
+    repaired = 0
+    for counter_user_id in actual.keys() | stored.keys():
+        total, completed, archived = actual.get(counter_user_id, (0, 0, 0))
+        if stored.get(counter_user_id) == (total, completed, archived):
+            continue
+        if user_id is None:
+            # Read without locks, so possibly mid-write: recheck under the lock
+            repaired += await recompute_task_counters(db, counter_user_id)
+            continue
+        repaired += 1
+        values = {"total": total, "completed": completed, "archived": archived}
+        if counter_user_id in stored:
+            await db.execute(
+                update(TaskCounter)
+                .where(TaskCounter.user_id == counter_user_id)
+                .values(**values)
+            )
+        else:
+            db.add(TaskCounter(user_id=counter_user_id, **values))
+    await db.flush()
+    return repaired
+
+
+async def reconcile_task_counters(db: AsyncSession, batch_size: int) -> int:
+    """
+    recompute_task_counters for every user, batch_size users at a time in
+    user id order, committing after each batch so no transaction reads the
+    whole tasks table. Returns how many counters were wrong.
+    """
+    repaired = 0
+    after: Optional[UUID] = None
+    while True:
+        query = select(User.id).order_by(User.id).limit(batch_size)
+        if after is not None:
+            query = query.where(User.id > after)
+        user_ids = (await db.scalars(query)).all()
+        if user_ids:
+            repaired += await recompute_task_counters(db, user_ids=user_ids)
+            await db.commit()
+        if len(user_ids) < batch_size:
+            return repaired
+        after = user_ids[-1]
+
+
+async def _adjust_task_counter(
+    db: AsyncSession,
+    user_id: UUID,
+    total: int = 0,
+    completed: int = 0,
+    daily: bool = True,
+) -> None:
+    # Relative UPDATE so concurrent writers serialize on the counter row
+    # instead of overwriting each other's read-modify-write
+    await db.flush()
+    result = await db.execute(
+        update(TaskCounter)
+        .where(TaskCounter.user_id == user_id)
+        .values(
+            total=TaskCounter.total + total,
+            completed=TaskCounter.completed + completed,
+        )
+    )
+    if result.rowcount == 0:
+        # Users created outside create_user have no row yet; the flushed
+        # tasks table already includes this change
+        await recompute_task_counters(db, user_id)
+    # Deletes pass daily=False: they leave what was created or completed
+    # on earlier days as it was
+    await record_task_stats(db, user_id, total, completed, daily=daily)
+
+
+async def _next_change_seq(
+    db: AsyncSession,
+    user_id: UUID,
+    total: int = 0,
+    completed: int = 0,
+    daily: bool = True,
+) -> int:
+    """
+    Take the user's next change sequence number for rows this transaction
+    writes. Call it before touching any task: the counter row stays locked
+    until the commit, so the user's writes commit in sequence order and a
+    reader never sees number n before everything below it.
+
+    The write's task counter deltas, as far as they are known up front, go
+    into the same UPDATE (and into the rollups, as with _adjust_task_counter);
+    what only the task statements can tell is adjusted afterwards.
+    """
+    values = {"change_seq": TaskCounter.change_seq + 1}
+    if total:
+        values["total"] = TaskCounter.total + total
+    if completed:
+        values["completed"] = TaskCounter.completed + completed
+    statement = (
+        update(TaskCounter)
+        .where(TaskCounter.user_id == user_id)
+        .values(**values)
+        .returning(TaskCounter.change_seq)
+    )
+    change_seq = await db.scalar(statement)
+    if change_seq is None:
+        # Counted before this write touches any task, so the deltas still apply
+        await recompute_task_counters(db, user_id)
+        change_seq = await db.scalar(statement)
+    await record_task_stats(db, user_id, total, completed, daily=daily)
+    return change_seq
+
+
+async def _add_tombstones(
+    db: AsyncSession, user_id: UUID, task_ids: List[UUID], change_seq: int
+) -> None:
+    deleted_at = datetime.now(timezone.utc)
+    await db.execute(
+        insert(TaskTombstone),
+        [
+            {
+                "task_id": task_id,
+                "user_id": user_id,
+                "change_seq": change_seq,
+                "deleted_at": deleted_at,
+            }
+            for task_id in task_ids
+        ],
+    )
+
+
+def _counter_total(filters: TaskFilter):
+    """The task counter expression matching filters, or None if it has none."""
+    narrowed = filters.model_dump(
+        exclude_defaults=True,
+        exclude={"sort", "order", "is_completed", "include_archived"},
+    )
+    if narrowed:
+        return None
+    if filters.is_completed is None:
+        return TaskCounter.total
+    if filters.is_completed:
+        return TaskCounter.completed
+    return TaskCounter.total - TaskCounter.completed
+
+
+async def _get_task_total(
+    db: AsyncSession, user_id: UUID, filters: TaskFilter, conditions: list
+) -> int:
+    counter_total = _counter_total(filters)
+    if counter_total is not None:
+        result = await db.execute(
+            select(counter_total).where(TaskCounter.user_id == user_id)
+        )
+        total = result.scalar_one_or_none()
+        if total is not None:
+            return total
+    count_result = await db.execute(select(func.count(Task.id)).where(*conditions))
+    return count_result.scalar() or 0
+
+
+def _task_event(event_type: str, task) -> dict:
+    """Change feed event carrying the task as the API would return it."""
+    if not isinstance(task, TaskSchema):
+        task = TaskSchema.model_validate(task)
+    return {
+        "type": event_type,
+        "id": str(task.id),
+        "task": task.model_dump(mode="json"),
+    }
+
+
+async def _tasks_changed(user_id: UUID, events: List[dict]) -> None:
+    """After a commit: retire the user's cached pages and push the events."""
+    await task_list_cache.invalidate(user_id)
+    await task_events.publish(user_id, events)
 
 
 async def create_task(task: TaskCreate, user_id: UUID, db: AsyncSession) -> Task:
     try:
-        db_task = Task(title=task.title, description=task.description, user_id=user_id)
+        change_seq = await _next_change_seq(db, user_id, total=1)
+        db_task = Task(
+            title=task.title,
+            description=task.description,
+            user_id=user_id,
+            change_seq=change_seq,
+        )
         db.add(db_task)
         await db.commit()
         await db.refresh(db_task)
+        await _tasks_changed(user_id, [_task_event("created", db_task)])
         return db_task
     except Exception as error:
         await db.rollback()
@@ -23,54 +310,840 @@ async def create_task(task: TaskCreate, user_id: UUID, db: AsyncSession) -> Task
         )
 
 
+def _modified_at(source):
+    """Last modification of source (Task, ArchivedTask or an alias of either)."""
+    if source is Task:
+        return modified_at
+    if source is ArchivedTask:
+        return archived_modified_at
+    return func.coalesce(source.updated_at, source.created_at)
+
+
+def _sort_key(source, sort: TaskSort):
+    if sort == TaskSort.title:
+        return source.title
+    if sort == TaskSort.updated_at:
+        return _modified_at(source)
+    return source.created_at
+
+
+def _task_sort_value(task: Task, sort: TaskSort) -> Any:
+    if sort == TaskSort.title:
+        return task.title
+    if sort == TaskSort.updated_at:
+        return task.updated_at or task.created_at
+    return task.created_at
+
+
+def encode_task_cursor(task: Task, sort: TaskSort = TaskSort.created_at) -> str:
+    value = _task_sort_value(task, sort)
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    return encode_cursor([sort.value, value, task.id])
+
+
+def decode_task_cursor(
+    cursor: str, sort: TaskSort = TaskSort.created_at
+) -> Tuple[Any, UUID]:
+    try:
+        cursor_sort, value, task_id = decode_cursor(cursor, 3)
+        if cursor_sort != sort.value:
+            raise ValueError("Cursor belongs to another sort order")
+        if sort != TaskSort.title:
+            value = datetime.fromisoformat(value)
+        return value, UUID(task_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _task_filter_conditions(user_id: UUID, filters: TaskFilter, source=Task) -> list:
+    return [source.user_id == user_id, *_narrowing_conditions(filters, source)]
+
+
+def _narrowing_conditions(filters: TaskFilter, source=Task) -> list:
+    """Conditions for filters other than the owner."""
+    conditions = []
+    if filters.is_completed is not None:
+        # Equality rather than IS so Postgres can use the index
+        conditions.append(source.is_completed == filters.is_completed)
+    if filters.created_after is not None:
+        conditions.append(source.created_at >= _as_utc(filters.created_after))
+    if filters.created_before is not None:
+        conditions.append(source.created_at < _as_utc(filters.created_before))
+    if filters.updated_after is not None:
+        conditions.append(_modified_at(source) >= _as_utc(filters.updated_after))
+    if filters.updated_before is not None:
+        conditions.append(_modified_at(source) < _as_utc(filters.updated_before))
+    if filters.title_prefix is not None:
+        # The range is what the (user_id, title) index can seek on; LIKE
+        # keeps the match exact under non-binary Postgres collations
+        prefix = filters.title_prefix
+        conditions.append(source.title >= prefix)
+        if ord(prefix[-1]) < sys.maxunicode:
+            conditions.append(source.title < prefix[:-1] + chr(ord(prefix[-1]) + 1))
+        conditions.append(source.title.startswith(prefix, autoescape=True))
+    return conditions
+
+
+def _page_order(source, filters: TaskFilter) -> tuple:
+    sort_key = _sort_key(source, filters.sort)
+    if filters.order == "desc":
+        return sort_key.desc(), source.id.desc()
+    return sort_key.asc(), source.id.asc()
+
+
+def _page_query(
+    source,
+    columns: list,
+    conditions: list,
+    filters: TaskFilter,
+    size: int,
+    after: Optional[Tuple[Any, UUID]] = None,
+    offset: int = 0,
+):
+    """Select of columns from source in filters' order, after a cursor position."""
+    sort_key = _sort_key(source, filters.sort)
+    descending = filters.order == "desc"
+    query = (
+        select(*columns)
+        .where(*conditions)
+        .order_by(*_page_order(source, filters))
+        .limit(size)
+    )
+    if after is not None:
+        value, task_id = after
+        position = tuple_(sort_key, source.id)
+        bound = tuple_(
+            literal(
+                value,
+                (
+                    Task.title.type
+                    if filters.sort == TaskSort.title
+                    else Task.created_at.type
+                ),
+            ),
+            literal(task_id, Task.id.type),
+        )
+        query = query.where(position < bound if descending else position > bound)
+    elif offset:
+        query = query.offset(offset)
+    return query
+
+
+async def _get_tasks_with_archived(
+    user_id: UUID,
+    db: AsyncSession,
+    page: int,
+    size: int,
+    after: Optional[Tuple[Any, UUID]],
+    filters: TaskFilter,
+) -> Tuple[Sequence[Task], int]:
+    """
+    get_tasks_by_user over tasks and archived_tasks together. Each table
+    yields its own first offset + size rows from its indexes and only those
+    are merged, so the archive costs one more index range, not a scan. The
+    total comes from the task counter, archived count included, unless the
+    filters narrow beyond completion.
+    """
+    offset = 0 if after is not None else (page - 1) * size
+    branches = []
+    for source in (Task, ArchivedTask):
+        columns = [source.__table__.c[name] for name in Task.__table__.c.keys()]
+        branch = _page_query(
+            source,
+            columns,
+            _task_filter_conditions(user_id, filters, source),
+            filters,
+            offset + size,
+            after,
+        ).subquery()
+        branches.append(select(branch))
+    task = aliased(Task, union_all(*branches).subquery())
+    tasks = (
+        await db.scalars(_page_query(task, [task], [], filters, size, offset=offset))
+    ).all()
+
+    counter_total = _counter_total(filters)
+    if counter_total is not None:
+        # Archived tasks are all completed
+        if filters.is_completed is not False:
+            counter_total = counter_total + TaskCounter.archived
+        total = await db.scalar(
+            select(counter_total).where(TaskCounter.user_id == user_id)
+        )
+        if total is not None:
+            return tasks, total
+    conditions = _task_filter_conditions(user_id, filters)
+    total = await _get_task_total(db, user_id, filters, conditions)
+    total += await db.scalar(
+        select(func.count(ArchivedTask.id)).where(
+            *_task_filter_conditions(user_id, filters, ArchivedTask)
+        )
+    )
+    return tasks, total
+
+
 async def get_tasks_by_user(
-    user_id: UUID, db: AsyncSession, page: int = 1, size: int = 10
+    user_id: UUID,
+    db: AsyncSession,
+    page: int = 1,
+    size: int = 10,
+    cursor: Optional[str] = None,
+    filters: Optional[TaskFilter] = None,
 ) -> Tuple[Sequence[Task], int]:
-    # Calculate offset
-    offset = (page - 1) * size
+    """
+    A page of a user's tasks plus how many tasks match the filters.
 
-    # Get total count
-    count_result = await db.execute(
-        select(func.count(Task.id)).where(Task.user_id == user_id)
+    Sorted by filters.sort (newest first by default) with id as tie-breaker;
+    every supported filter and sort combination is backed by a (user_id, ...)
+    index on tasks. With a cursor (from encode_task_cursor) the page starts
+    right after that task, so every page costs the same and concurrent inserts
+    cannot shift rows between pages; otherwise page/size is applied as
+    OFFSET/LIMIT. Unless the filters narrow beyond completion, the total comes
+    from the user's task counter, read as a subquery of the page query itself.
+    With filters.include_archived the page and total also cover archived_tasks.
+    """
+    filters = filters or TaskFilter()
+    after = decode_task_cursor(cursor, filters.sort) if cursor is not None else None
+    if filters.include_archived:
+        return await _get_tasks_with_archived(user_id, db, page, size, after, filters)
+    conditions = _task_filter_conditions(user_id, filters)
+
+    columns = [Task]
+    counter_total = _counter_total(filters)
+    if counter_total is not None:
+        columns.append(
+            select(counter_total)
+            .where(TaskCounter.user_id == user_id)
+            .scalar_subquery()
+        )
+    query = _page_query(
+        Task, columns, conditions, filters, size, after, offset=(page - 1) * size
     )
-    total_count = count_result.scalar() or 0
 
-    # Get paginated tasks
+    result = await db.execute(query)
+    rows = result.all()
+    tasks = [row[0] for row in rows]
+
+    # Filtered counts, empty pages and users without a counter row need a
+    # separate lookup
+    total_count = rows[0][1] if rows and counter_total is not None else None
+    if total_count is None:
+        total_count = await _get_task_total(db, user_id, filters, conditions)
+
+    return tasks, total_count
+
+
+def _ranked_tasks(
+    db_dialect: str, user_ids: List[UUID], filters: TaskFilter, size: int
+):
+    """
+    (subquery, join condition) giving each user's first size matching tasks
+    when outer-joined to users. Postgres runs the page query once per user
+    as a LATERAL subquery, so each user costs one index range of at most
+    size rows; elsewhere row_number() over the users' matching tasks ranks
+    them and the join keeps the first size.
+    """
+    columns = [Task.__table__.c[name] for name in Task.__table__.c.keys()]
+    if db_dialect == "postgresql":
+        ranked = _page_query(
+            Task, columns, _task_filter_conditions(User.id, filters), filters, size
+        ).lateral()
+        return ranked, true()
+    rank = (
+        func.row_number()
+        .over(partition_by=Task.user_id, order_by=_page_order(Task, filters))
+        .label("rank")
+    )
+    ranked = (
+        select(*columns, rank)
+        .where(Task.user_id.in_(user_ids), *_narrowing_conditions(filters))
+        .subquery()
+    )
+    return ranked, and_(ranked.c.user_id == User.id, ranked.c.rank <= size)
+
+
+async def get_tasks_for_users(
+    user_ids: List[UUID],
+    db: AsyncSession,
+    size: int = 10,
+    filters: Optional[TaskFilter] = None,
+) -> Tuple[Dict[UUID, Tuple[List[Task], int]], int]:
+    """
+    The first page of several users' tasks at once: for each user in
+    user_ids that exists, their first size tasks in filters' order and how
+    many tasks match, as get_tasks_by_user would return them. Unknown users
+    are skipped.
+
+    Pages and totals come from one query over users; only filters that the
+    task counters cannot answer, or users without a counter row, add a
+    grouped count. Returns the pages in request order and the round trips
+    taken.
+    """
+    filters = filters or TaskFilter()
+    if filters.include_archived:
+        raise HTTPException(
+            status_code=400, detail="include_archived is not supported here"
+        )
+    user_ids = list(dict.fromkeys(user_ids))
+    if len(user_ids) > settings.TASK_BATCH_MAX_USERS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"At most {settings.TASK_BATCH_MAX_USERS} users per request",
+        )
+
+    connection = await db.connection()
+    ranked, on = _ranked_tasks(connection.dialect.name, user_ids, filters, size)
+    task = aliased(Task, ranked)
+    counter_total = _counter_total(filters)
+    total = (
+        select(counter_total).where(TaskCounter.user_id == User.id).scalar_subquery()
+        if counter_total is not None
+        else null()
+    )
     result = await db.execute(
-        select(Task)
-        .where(Task.user_id == user_id)
-        .order_by(Task.created_at.desc())
-        .offset(offset)
+        select(User.id, total, task)
+        .outerjoin(ranked, on)
+        .where(User.id.in_(user_ids))
+        .order_by(User.id, *_page_order(task, filters))
+    )
+    pages: Dict[UUID, Tuple[List[Task], Optional[int]]] = {}
+    for user_id, user_total, user_task in result:
+        tasks, _ = pages.setdefault(user_id, ([], user_total))
+        # Users without a matching task come back as one row with no task
+        if user_task is not None:
+            tasks.append(user_task)
+    round_trips = 1
+
+    uncounted = [user_id for user_id, (_, count) in pages.items() if count is None]
+    if uncounted:
+        counts = dict(
+            (
+                await db.execute(
+                    select(Task.user_id, func.count(Task.id))
+                    .where(Task.user_id.in_(uncounted), *_narrowing_conditions(filters))
+                    .group_by(Task.user_id)
+                )
+            ).all()
+        )
+        round_trips += 1
+        for user_id in uncounted:
+            pages[user_id] = (pages[user_id][0], counts.get(user_id, 0))
+
+    return {
+        user_id: pages[user_id] for user_id in user_ids if user_id in pages
+    }, round_trips
+
+
+def _search_terms(query: str) -> List[str]:
+    return re.findall(r"\w+", query)
+
+
+def _ranked_matches(user_id: UUID, query: str, dialect: str):
+    """Select of the user's tasks matching query with a higher-is-better rank."""
+    if dialect == "postgresql":
+        tsquery = func.websearch_to_tsquery("english", query)
+        vector = literal_column("tasks.search_vector")
+        return select(Task, func.ts_rank_cd(vector, tsquery).label("rank")).where(
+            Task.user_id == user_id, vector.op("@@")(tsquery)
+        )
+
+    # SQLite FTS5: quote every term so user input cannot inject MATCH syntax;
+    # bm25 is lower-is-better, with title weighted above description.
+    match = " ".join(f'"{term}"' for term in _search_terms(query))
+    fts = table("tasks_fts", column("rowid"))
+    fts_ids = table("tasks_fts_ids", column("doc_id"), column("task_id"))
+    matches = (
+        select(
+            fts.c.rowid,
+            (-func.bm25(literal_column("tasks_fts"), 10.0, 1.0)).label("rank"),
+        )
+        .where(literal_column("tasks_fts").op("MATCH")(match))
+        .subquery()
+    )
+    # Unary + keeps SQLite from driving the join off the user_id indexes,
+    # which would probe the FTS index once per task the user owns
+    owner = literal_column("+tasks.user_id", Task.user_id.type)
+    return (
+        select(Task, matches.c.rank)
+        .select_from(matches)
+        .join(fts_ids, fts_ids.c.doc_id == matches.c.rowid)
+        .join(Task, Task.id == fts_ids.c.task_id)
+        .where(owner == user_id)
+    )
+
+
+async def search_tasks(
+    user_id: UUID,
+    query: str,
+    db: AsyncSession,
+    size: int = 10,
+    cursor: Optional[str] = None,
+) -> Tuple[Sequence[Task], int, Optional[str]]:
+    """
+    Full-text search over a user's task titles and descriptions, best match
+    first. Returns the page, the number of matches and the cursor for the
+    next page (None on the last one), paginated by (rank, id) like the list.
+    """
+    if not _search_terms(query):
+        return [], 0, None
+
+    dialect = db.get_bind().dialect.name
+    ranked = _ranked_matches(user_id, query, dialect).subquery()
+    task = aliased(Task, ranked)
+    page_query = (
+        select(task, ranked.c.rank)
+        .order_by(ranked.c.rank.desc(), ranked.c.id.desc())
         .limit(size)
     )
-    tasks = result.scalars().all()
+    if cursor is not None:
+        try:
+            kind, rank, task_id = decode_cursor(cursor, 3)
+            if kind != "rank":
+                raise ValueError("Not a search cursor")
+            after = (float(rank), UUID(task_id))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        page_query = page_query.where(
+            tuple_(ranked.c.rank, ranked.c.id)
+            < tuple_(literal(after[0], Float()), literal(after[1], Task.id.type))
+        )
+
+    rows = (await db.execute(page_query)).all()
+    total = await db.scalar(select(func.count()).select_from(ranked))
+
+    next_cursor = None
+    if len(rows) == size:
+        last_task, last_rank = rows[-1]
+        next_cursor = encode_cursor(["rank", repr(last_rank), last_task.id])
+    return [row[0] for row in rows], total or 0, next_cursor
+
+
+EXPORT_FIELDS = (
+    "id",
+    "title",
+    "description",
+    "is_completed",
+    "created_at",
+    "updated_at",
+)
+EXPORT_BATCH_SIZE = 1000
+
+
+def _export_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
 
-    return tasks, total_count
 
+async def stream_tasks_export(
+    user_id: UUID, db: AsyncSession, export_format: str = "ndjson"
+) -> AsyncIterator[bytes]:
+    """
+    Every task of a user, oldest first, as NDJSON lines or CSV rows.
+
+    Plain column tuples are read through a server-side cursor in batches of
+    EXPORT_BATCH_SIZE and encoded one batch at a time, so memory stays flat
+    however many tasks the user has.
+    """
+    result = await db.stream(
+        select(*(getattr(Task, field) for field in EXPORT_FIELDS))
+        .where(Task.user_id == user_id)
+        .order_by(Task.created_at, Task.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    if export_format == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_FIELDS)
+        yield buffer.getvalue().encode()
+
+    async for rows in result.partitions():
+        buffer = io.StringIO()
+        if export_format == "csv":
+            writer = csv.writer(buffer)
+            writer.writerows([_export_value(value) for value in row] for row in rows)
+        else:
+            for row in rows:
+                buffer.write(
+                    json.dumps(
+                        dict(zip(EXPORT_FIELDS, map(_export_value, row))),
+                        separators=(",", ":"),
+                    )
+                )
+                buffer.write("\n")
+        yield buffer.getvalue().encode()
+
+
+IMPORT_COLUMNS = (
+    "id",
+    "title",
+    "description",
+    "is_completed",
+    "user_id",
+    "created_at",
+    "change_seq",
+)
+TITLE_MAX_LENGTH = Task.__table__.c.title.type.length
+TITLE_TOO_LONG = f"title: String should have at most {TITLE_MAX_LENGTH} characters"
+# Validated import rows stay in memory up to this size, then go to disk
+IMPORT_SPOOL_MEMORY_BYTES = 8 * 1024 * 1024
+
+
+async def _iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """Decode UTF-8 (with or without BOM) upload chunks into lines."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line + "\n"
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+async def _iter_import_rows(
+    chunks: AsyncIterable[bytes], import_format: str
+) -> AsyncIterator[Tuple[int, Any]]:
+    """
+    (line, row) pairs parsed one record at a time from an upload.
+
+    A row is a dict for well-formed records and a string describing the
+    problem otherwise. CSV needs a header naming the columns; quoted fields
+    may span lines.
+    """
+    line_number = 0
+    if import_format == "ndjson":
+        async for line in _iter_lines(chunks):
+            line_number += 1
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as error:
+                yield line_number, f"Invalid JSON: {error}"
+                continue
+            yield line_number, (
+                row if isinstance(row, dict) else "Expected a JSON object"
+            )
+        return
+
+    header = None
+    # Lines of the record being read and its running quote count, so a long
+    # multi-line field is not rescanned from its start on every line
+    record: List[str] = []
+    record_line = quotes = 0
+    async for line in _iter_lines(chunks):
+        line_number += 1
+        if not record:
+            record_line = line_number
+        record.append(line)
+        quotes += line.count('"')
+        # An odd number of quotes means a quoted field continues on the next line
+        if quotes % 2:
+            continue
+        text, record, quotes = "".join(record), [], 0
+        if not text.strip():
+            continue
+        values = next(csv.reader([text]))
+        if header is None:
+            header = [name.strip() for name in values]
+        elif len(values) != len(header):
+            yield record_line, f"Expected {len(header)} fields, got {len(values)}"
+        else:
+            yield record_line, {
+                name: value for name, value in zip(header, values) if value != ""
+            }
+    if record:
+        yield record_line, "Unterminated quoted field"
+
+
+def _validation_detail(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc']) or 'row'}: {item['msg']}"
+        for item in error.errors()
+    )
 
-async def get_task_by_id(task_id: UUID, user_id: UUID, db: AsyncSession) -> Task | None:
+
+async def _load_import_batch(db: AsyncSession, records: List[tuple]) -> None:
+    connection = await db.connection()
+    if connection.dialect.driver == "asyncpg":
+        raw = await connection.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            Task.__tablename__, records=records, columns=IMPORT_COLUMNS
+        )
+    else:
+        await connection.execute(
+            insert(Task.__table__),
+            [dict(zip(IMPORT_COLUMNS, record)) for record in records],
+        )
+
+
+async def _limit_upload(chunks: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+    received = 0
+    async for chunk in chunks:
+        received += len(chunk)
+        if received > settings.TASK_IMPORT_MAX_BYTES:
+            raise HTTPException(
+                status_code=413,
+                detail=f"At most {settings.TASK_IMPORT_MAX_BYTES} bytes per import",
+            )
+        yield chunk
+
+
+async def import_tasks(
+    chunks: AsyncIterable[bytes],
+    user_id: UUID,
+    db: AsyncSession,
+    import_format: str = "ndjson",
+) -> TaskImportResult:
+    """
+    Load an NDJSON or CSV upload of TaskCreate rows into the user's tasks.
+
+    The upload is read and validated to the end first, valid rows spooled
+    to a temporary file (in memory up to IMPORT_SPOOL_MEMORY_BYTES), so no
+    connection or transaction is held while a slow client sends it. Uploads
+    over TASK_IMPORT_MAX_BYTES or TASK_IMPORT_MAX_ROWS are refused with 413.
+    The spooled rows then go in by batches of TASK_IMPORT_BATCH_SIZE: COPY
+    on PostgreSQL, one executemany INSERT elsewhere. Invalid rows are
+    skipped and reported by line; valid rows are committed together, or not
+    at all if the database rejects a batch, under one change sequence number.
+    """
+    started = time.perf_counter()
+    errors: List[TaskImportError] = []
+    failed = valid = 0
+
+    def reject(line: int, detail: str) -> None:
+        nonlocal failed
+        failed += 1
+        if len(errors) < settings.TASK_IMPORT_MAX_ERRORS:
+            errors.append(TaskImportError(line=line, detail=detail))
+
+    with tempfile.SpooledTemporaryFile(
+        max_size=IMPORT_SPOOL_MEMORY_BYTES, mode="w+", encoding="utf-8"
+    ) as spool:
+        try:
+            async for line, row in _iter_import_rows(
+                _limit_upload(chunks), import_format
+            ):
+                if valid + failed >= settings.TASK_IMPORT_MAX_ROWS:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"At most {settings.TASK_IMPORT_MAX_ROWS} rows per import",
+                    )
+                if isinstance(row, str):
+                    reject(line, row)
+                    continue
+                try:
+                    task = TaskCreate.model_validate(row)
+                except ValidationError as error:
+                    reject(line, _validation_detail(error))
+                    continue
+                if len(task.title) > TITLE_MAX_LENGTH:
+                    reject(line, TITLE_TOO_LONG)
+                    continue
+                spool.write(json.dumps([task.title, task.description]) + "\n")
+                valid += 1
+        except UnicodeDecodeError as error:
+            raise HTTPException(status_code=400, detail=f"Upload is not UTF-8: {error}")
+
+        spool.seek(0)
+        imported = await _load_import(spool, valid, user_id, db) if valid else 0
+
+    elapsed = time.perf_counter() - started
+    return TaskImportResult(
+        imported=imported,
+        failed=failed,
+        errors=errors,
+        elapsed_ms=round(elapsed * 1000, 1),
+        rows_per_second=round(imported / elapsed, 1) if elapsed else 0.0,
+    )
+
+
+async def _load_import(
+    rows: IO[str], count: int, user_id: UUID, db: AsyncSession
+) -> int:
+    """Insert the count spooled [title, description] rows; returns how many."""
+    created_at = datetime.now(timezone.utc)
+    imported = 0
+    batch: List[tuple] = []
+    try:
+        # Taken once the whole upload is spooled, so the counter row is only
+        # locked while the rows go in
+        change_seq = await _next_change_seq(db, user_id, total=count)
+        for line in rows:
+            title, description = json.loads(line)
+            batch.append(
+                (uuid4(), title, description, False, user_id, created_at, change_seq)
+            )
+            if len(batch) >= settings.TASK_IMPORT_BATCH_SIZE:
+                await _load_import_batch(db, batch)
+                imported += len(batch)
+                batch = []
+        if batch:
+            await _load_import_batch(db, batch)
+            imported += len(batch)
+        await db.commit()
+        # One event for the whole upload; subscribers refetch their lists
+        await _tasks_changed(user_id, [{"type": "imported", "count": imported}])
+    except Exception as error:
+        await db.rollback()
+        raise HTTPException(
+            status_code=500, detail=f"Error importing tasks: {str(error)}"
+        )
+    return imported
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _task_version(task: Task) -> int:
+    """Microseconds since the epoch of the task's last modification."""
+    delta = _as_utc(task.updated_at or task.created_at) - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 10**6 + delta.microseconds
+
+
+def task_etag(task: Task) -> str:
+    """Weak ETag naming a task and the time it was last modified."""
+    return weak_etag(f"{task.id.hex}.{_task_version(task)}")
+
+
+def _if_match_versions(if_match: str, task_id: UUID) -> Optional[List[datetime]]:
+    """Modification times an If-Match header accepts for task_id; None for "*"."""
+    versions = []
+    for value in parse_etags(if_match):
+        if value == "*":
+            return None
+        task_hex, _, version = value.partition(".")
+        if task_hex == task_id.hex and version.isdigit():
+            versions.append(_EPOCH + timedelta(microseconds=int(version)))
+    return versions
+
+
+async def task_list_etag(user_id: UUID, db: AsyncSession, variant: str = "") -> str:
+    """
+    Weak ETag for listings of a user's tasks, from one small query.
+
+    Fingerprints the latest modification (a seek on the (user_id, modified)
+    index) and the task count (the user's counter), so any create, update or
+    delete changes it. variant, e.g. the normalized query string, keeps
+    different pages and filters apart.
+    """
+    latest, total = (
+        await db.execute(
+            select(
+                select(func.max(modified_at))
+                .where(Task.user_id == user_id)
+                .scalar_subquery(),
+                select(TaskCounter.total)
+                .where(TaskCounter.user_id == user_id)
+                .scalar_subquery(),
+            )
+        )
+    ).one()
+    if total is None:
+        total = await db.scalar(
+            select(func.count(Task.id)).where(Task.user_id == user_id)
+        )
+    fingerprint = f"{user_id}|{latest}|{total}|{variant}"
+    return weak_etag(hashlib.sha1(fingerprint.encode()).hexdigest())
+
+
+async def get_task_by_id(
+    task_id: UUID, user_id: UUID, db: AsyncSession, include_archived: bool = False
+) -> Task | ArchivedTask | None:
     result = await db.execute(
         select(Task).where(and_(Task.id == task_id, Task.user_id == user_id))
     )
-    return result.scalar_one_or_none()
+    task = result.scalar_one_or_none()
+    if task is None and include_archived:
+        result = await db.execute(
+            select(ArchivedTask).where(
+                ArchivedTask.id == task_id, ArchivedTask.user_id == user_id
+            )
+        )
+        task = result.scalar_one_or_none()
+    return task
 
 
 async def update_task(
-    task_id: UUID, task_update: TaskUpdate, user_id: UUID, db: AsyncSession
+    task_id: UUID,
+    task_update: TaskUpdate,
+    user_id: UUID,
+    db: AsyncSession,
+    if_match: Optional[str] = None,
 ) -> Task | None:
-    db_task = await get_task_by_id(task_id, user_id, db)
+    """
+    One ownership-scoped UPDATE ... RETURNING; no row back means 404.
+
+    A completion change is made conditional on the row actually flipping and
+    counted as a flip when the change sequence number is taken. Only a no-op
+    toggle (completing an already completed task) needs a second UPDATE to
+    tell it apart from a missing task, and takes the count back.
 
-    if not db_task:
-        raise HTTPException(status_code=404, detail="Task not found")
+    With if_match (task_etag values, or "*") the UPDATE also requires the
+    task's last modification to match, so a stale write costs no extra
+    query; only a rejected one is looked up again to answer 412 over 404.
+    """
+    update_data = task_update.model_dump(exclude_unset=True)
+    is_completed = update_data.pop("is_completed", None)
+    scope = and_(Task.id == task_id, Task.user_id == user_id)
+    preconditions = []
+    if if_match is not None:
+        versions = _if_match_versions(if_match, task_id)
+        if versions is not None:
+            preconditions.append(modified_at.in_(versions))
 
+    def statement(*criteria, **values):
+        return (
+            update(Task)
+            .where(scope, *preconditions, *criteria)
+            .values(**update_data, **values, change_seq=change_seq)
+            .returning(Task)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+
+    flipped = 0 if is_completed is None else 1 if is_completed else -1
     try:
-        update_data = task_update.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_task, field, value)
+        change_seq = await _next_change_seq(db, user_id, completed=flipped)
+        db_task = None
+        if is_completed is not None:
+            flip = (
+                Task.is_completed.is_not(True)
+                if is_completed
+                else Task.is_completed.is_(True)
+            )
+            result = await db.scalars(statement(flip, is_completed=is_completed))
+            db_task = result.first()
+        if db_task is None:
+            db_task = (await db.scalars(statement())).first()
+            if db_task is not None and flipped:
+                await _adjust_task_counter(db, user_id, completed=-flipped)
+        if db_task is None:
+            if preconditions and await db.scalar(select(Task.id).where(scope)):
+                raise HTTPException(
+                    status_code=412, detail="Task has been modified since"
+                )
+            raise HTTPException(status_code=404, detail="Task not found")
 
+        # Detached so the commit does not expire what RETURNING just loaded
+        db.expunge(db_task)
         await db.commit()
-        await db.refresh(db_task)
+        await _tasks_changed(user_id, [_task_event("updated", db_task)])
         return db_task
+    except HTTPException:
+        await db.rollback()
+        raise
     except Exception as error:
         await db.rollback()
         raise HTTPException(
@@ -79,15 +1152,31 @@ async def update_task(
 
 
 async def delete_task(task_id: UUID, user_id: UUID, db: AsyncSession) -> bool:
-    db_task = await get_task_by_id(task_id, user_id, db)
-
-    if not db_task:
-        raise HTTPException(status_code=404, detail="Task not found")
-
+    """
+    One ownership-scoped DELETE ... RETURNING; no row back means 404. A
+    tombstone records the deletion for delta sync.
+    """
     try:
-        await db.delete(db_task)
+        change_seq = await _next_change_seq(db, user_id, total=-1, daily=False)
+        result = await db.execute(
+            delete(Task)
+            .where(Task.id == task_id, Task.user_id == user_id)
+            .returning(Task.is_completed)
+            .execution_options(synchronize_session=False)
+        )
+        row = result.first()
+        if row is None:
+            raise HTTPException(status_code=404, detail="Task not found")
+
+        await _add_tombstones(db, user_id, [task_id], change_seq)
+        if row.is_completed:
+            await _adjust_task_counter(db, user_id, completed=-1, daily=False)
         await db.commit()
+        await _tasks_changed(user_id, [{"type": "deleted", "id": str(task_id)}])
         return True
+    except HTTPException:
+        await db.rollback()
+        raise
     except Exception as error:
         await db.rollback()
         raise HTTPException(
@@ -107,3 +1196,379 @@ async def mark_task_incomplete(
 ) -> Task | None:
     task_update = TaskUpdate(is_completed=False)
     return await update_task(task_id, task_update, user_id, db)
+
+
+def _check_bulk_size(count: int) -> None:
+    if count > settings.TASK_BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"At most {settings.TASK_BULK_MAX_ITEMS} tasks per request",
+        )
+
+
+def _check_unique_ids(ids: List[UUID]) -> None:
+    if len(set(ids)) != len(ids):
+        raise HTTPException(status_code=422, detail="Duplicate task ids")
+
+
+def _not_found(task_id: UUID) -> TaskBulkResult:
+    return TaskBulkResult(id=task_id, status=404, detail="Task not found")
+
+
+def _title_too_long(title: Optional[str]) -> bool:
+    # Checked up front: one over-long title would fail the whole statement
+    return title is not None and len(title) > TITLE_MAX_LENGTH
+
+
+async def get_tasks_by_ids(
+    task_ids: List[UUID], user_id: UUID, db: AsyncSession
+) -> List[Task]:
+    """The user's tasks among task_ids, in request order; unknown ids are skipped."""
+    _check_bulk_size(len(task_ids))
+    result = await db.execute(
+        select(Task).where(Task.user_id == user_id, Task.id.in_(task_ids))
+    )
+    found = {task.id: task for task in result.scalars()}
+    return [found[task_id] for task_id in dict.fromkeys(task_ids) if task_id in found]
+
+
+async def create_tasks_bulk(
+    tasks: List[TaskCreate], user_id: UUID, db: AsyncSession
+) -> List[TaskBulkResult]:
+    """
+    Insert every task with one multi-row INSERT ... RETURNING and one commit.
+    Items whose title is too long get a 422 result and are left out.
+    """
+    _check_bulk_size(len(tasks))
+    results: List[Optional[TaskBulkResult]] = [
+        (
+            TaskBulkResult(status=422, detail=TITLE_TOO_LONG)
+            if _title_too_long(task.title)
+            else None
+        )
+        for task in tasks
+    ]
+    tasks = [task for task, result in zip(tasks, results) if result is None]
+    if not tasks:
+        return results
+    try:
+        change_seq = await _next_change_seq(db, user_id, total=len(tasks))
+        result = await db.scalars(
+            insert(Task).returning(Task),
+            [
+                {
+                    "title": task.title,
+                    "description": task.description,
+                    "user_id": user_id,
+                    "change_seq": change_seq,
+                }
+                for task in tasks
+            ],
+        )
+        # Serialized before the commit expires them, saving a refresh per row
+        created = iter(
+            TaskBulkResult(
+                id=db_task.id, status=201, task=TaskSchema.model_validate(db_task)
+            )
+            for db_task in result.all()
+        )
+        results = [result or next(created) for result in results]
+        await db.commit()
+        await _tasks_changed(
+            user_id,
+            [
+                _task_event("created", result.task)
+                for result in results
+                if result.task is not None
+            ],
+        )
+        return results
+    except Exception as error:
+        await db.rollback()
+        raise HTTPException(
+            status_code=500, detail=f"Error creating tasks: {str(error)}"
+        )
+
+
+def _bulk_update_results(
+    items: List[TaskBulkUpdateItem],
+    updated: Dict[UUID, Task],
+    rejected: Dict[UUID, TaskBulkResult],
+) -> List[TaskBulkResult]:
+    return [
+        (
+            TaskBulkResult(
+                id=item.id, status=200, task=TaskSchema.model_validate(updated[item.id])
+            )
+            if item.id in updated
+            else rejected.get(item.id) or _not_found(item.id)
+        )
+        for item in items
+    ]
+
+
+async def update_tasks_bulk(
+    items: List[TaskBulkUpdateItem], user_id: UUID, db: AsyncSession
+) -> List[TaskBulkResult]:
+    """
+    Apply per-task updates in one transaction. Items carrying identical changes
+    share a single UPDATE ... WHERE id IN (...) RETURNING, so a batch that marks
+    many tasks complete costs one statement (plus one for the counter).
+    """
+    _check_bulk_size(len(items))
+    _check_unique_ids([item.id for item in items])
+
+    rejected = {
+        item.id: TaskBulkResult(id=item.id, status=422, detail=TITLE_TOO_LONG)
+        for item in items
+        if _title_too_long(item.title)
+    }
+    groups: Dict[tuple, List[UUID]] = defaultdict(list)
+    for item in items:
+        if item.id in rejected:
+            continue
+        values = item.model_dump(exclude_unset=True, exclude={"id"})
+        groups[tuple(sorted(values.items()))].append(item.id)
+    # Items without changes are read back as they are: an UPDATE would bump
+    # updated_at, and with it their ETags and the list fingerprint
+    unchanged = groups.pop((), [])
+
+    try:
+        updated: Dict[UUID, Task] = {}
+        if unchanged:
+            result = await db.scalars(
+                select(Task).where(Task.user_id == user_id, Task.id.in_(unchanged))
+            )
+            for db_task in result.all():
+                updated[db_task.id] = db_task
+        if not groups:
+            return _bulk_update_results(items, updated, rejected)
+        change_seq = await _next_change_seq(db, user_id)
+        completed_delta = 0
+        for key, task_ids in groups.items():
+            values = dict(key, change_seq=change_seq)
+            scope = and_(Task.user_id == user_id, Task.id.in_(task_ids))
+            is_completed = values.get("is_completed")
+            if is_completed is not None:
+                # Only rows whose completion actually flips move the counter
+                flipped = await db.execute(
+                    update(Task)
+                    .where(
+                        scope,
+                        (
+                            Task.is_completed.is_not(True)
+                            if is_completed
+                            else Task.is_completed.is_(True)
+                        ),
+                    )
+                    .values(is_completed=is_completed)
+                    .returning(Task.id)
+                    .execution_options(synchronize_session=False)
+                )
+                flips = len(flipped.all())
+                completed_delta += flips if is_completed else -flips
+            statement = (
+                update(Task)
+                .where(scope)
+                .values(**values)
+                .returning(Task)
+                .execution_options(synchronize_session=False, populate_existing=True)
+            )
+            for db_task in (await db.scalars(statement)).all():
+                updated[db_task.id] = db_task
+
+        results = _bulk_update_results(items, updated, rejected)
+        if completed_delta:
+            await _adjust_task_counter(db, user_id, completed=completed_delta)
+        await db.commit()
+        await _tasks_changed(
+            user_id,
+            [
+                _task_event("updated", result.task)
+                for result in results
+                if result.task is not None and result.id not in unchanged
+            ],
+        )
+        return results
+    except Exception as error:
+        await db.rollback()
+        raise HTTPException(
+            status_code=500, detail=f"Error updating tasks: {str(error)}"
+        )
+
+
+async def delete_tasks_bulk(
+    task_ids: List[UUID], user_id: UUID, db: AsyncSession
+) -> List[TaskBulkResult]:
+    """
+    Delete the user's tasks among task_ids with one DELETE ... RETURNING,
+    leaving a tombstone for each.
+    """
+    _check_bulk_size(len(task_ids))
+    _check_unique_ids(task_ids)
+    try:
+        change_seq = await _next_change_seq(db, user_id)
+        result = await db.execute(
+            delete(Task)
+            .where(Task.user_id == user_id, Task.id.in_(task_ids))
+            .returning(Task.id, Task.is_completed)
+            .execution_options(synchronize_session=False)
+        )
+        deleted = {row.id: row.is_completed for row in result}
+        if deleted:
+            await _add_tombstones(db, user_id, list(deleted), change_seq)
+            await _adjust_task_counter(
+                db,
+                user_id,
+                total=-len(deleted),
+                completed=-sum(1 for done in deleted.values() if done),
+                daily=False,
+            )
+        await db.commit()
+        await _tasks_changed(
+            user_id, [{"type": "deleted", "id": str(task_id)} for task_id in deleted]
+        )
+        return [
+            (
+                TaskBulkResult(id=task_id, status=204)
+                if task_id in deleted
+                else _not_found(task_id)
+            )
+            for task_id in task_ids
+        ]
+    except Exception as error:
+        await db.rollback()
+        raise HTTPException(
+            status_code=500, detail=f"Error deleting tasks: {str(error)}"
+        )
+
+
+# Extra time tombstones outlive TASK_TOMBSTONE_RETENTION_DAYS, covering
+# deletions that were still uncommitted when a token was issued
+TOMBSTONE_GRACE = timedelta(hours=1)
+
+
+def _sync_token(change_seq: int, task_id: Optional[UUID], issued_at: datetime) -> str:
+    return encode_cursor([change_seq, task_id or "", issued_at.isoformat()])
+
+
+async def get_task_changes(
+    user_id: UUID, db: AsyncSession, since: Optional[str] = None, size: int = 100
+) -> TaskChanges:
+    """
+    The user's tasks written after the sync token since, plus tombstones of
+    the ones deleted, in change sequence order. Without a token every task
+    is returned and nothing is deleted.
+
+    Both come from (user_id, change_seq, id) index ranges bounded by the
+    counter's change_seq read first, so a page never includes a change the
+    next token would skip. A token older than the tombstone retention gets
+    410: deletions after it may already be compacted away.
+    """
+    now = datetime.now(timezone.utc)
+    after_seq, after_id, issued_at = 0, None, now
+    if since is not None:
+        try:
+            change_seq, task_id, issued = decode_cursor(since, 3)
+            after_seq = int(change_seq)
+            after_id = UUID(task_id) if task_id else None
+            issued_at = _as_utc(datetime.fromisoformat(issued))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid sync token")
+        retention = timedelta(days=settings.TASK_TOMBSTONE_RETENTION_DAYS)
+        if issued_at < now - retention:
+            raise HTTPException(
+                status_code=410, detail="Sync token expired, sync from scratch"
+            )
+
+    upper = (
+        await db.scalar(
+            select(TaskCounter.change_seq).where(TaskCounter.user_id == user_id)
+        )
+        or 0
+    )
+
+    def page_query(entity, id_column):
+        conditions = [entity.user_id == user_id, entity.change_seq <= upper]
+        if after_id is not None:
+            conditions.append(
+                tuple_(entity.change_seq, id_column)
+                > tuple_(
+                    literal(after_seq, entity.change_seq.type),
+                    literal(after_id, id_column.type),
+                )
+            )
+        elif since is not None:
+            conditions.append(entity.change_seq > after_seq)
+        return (
+            select(entity)
+            .where(*conditions)
+            .order_by(entity.change_seq, id_column)
+            .limit(size + 1)
+        )
+
+    changes = [
+        (task.change_seq, task.id, task)
+        for task in (await db.scalars(page_query(Task, Task.id))).all()
+    ]
+    if since is not None:
+        changes += [
+            (tombstone.change_seq, tombstone.task_id, tombstone)
+            for tombstone in (
+                await db.scalars(page_query(TaskTombstone, TaskTombstone.task_id))
+            ).all()
+        ]
+    changes.sort(key=lambda change: change[:2])
+    has_more = len(changes) > size
+    changes = changes[:size]
+
+    if has_more:
+        # Resumes inside this sync, so keeps its issue time
+        last_seq, last_id, _ = changes[-1]
+        sync_token = _sync_token(last_seq, last_id, issued_at)
+    else:
+        sync_token = _sync_token(max(upper, after_seq), None, now)
+    return TaskChanges(
+        tasks=[
+            TaskSchema.model_validate(change)
+            for _, _, change in changes
+            if isinstance(change, Task)
+        ],
+        deleted=[
+            TaskTombstoneSchema(id=change.task_id, deleted_at=change.deleted_at)
+            for _, _, change in changes
+            if isinstance(change, TaskTombstone)
+        ],
+        sync_token=sync_token,
+        has_more=has_more,
+    )
+
+
+async def compact_task_tombstones(
+    db: AsyncSession, batch_size: int, max_batches: int
+) -> int:
+    """
+    Delete tombstones past TASK_TOMBSTONE_RETENTION_DAYS (plus a grace
+    period) in batches, committing after each one. Returns the number removed.
+    """
+    cutoff = (
+        datetime.now(timezone.utc)
+        - timedelta(days=settings.TASK_TOMBSTONE_RETENTION_DAYS)
+        - TOMBSTONE_GRACE
+    )
+    removed = 0
+    for _ in range(max_batches):
+        expired_ids = (
+            select(TaskTombstone.task_id)
+            .where(TaskTombstone.deleted_at < cutoff)
+            .limit(batch_size)
+            .scalar_subquery()
+        )
+        result = await db.execute(
+            delete(TaskTombstone).where(TaskTombstone.task_id.in_(expired_ids))
+        )
+        await db.commit()
+        removed += result.rowcount
+        if result.rowcount < batch_size:
+            break
+    return removed
@@ -6,7 +6,9 @@ from sqlalchemy import delete, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.core.security import hash_password
+from app.core.cache import invalidate_user
+from app.core.security import hash_password_async
+from app.models.task_counter import TaskCounter
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
 from app.services.role_service import assign_roles_to_user, get_user_with_roles
@@ -28,12 +30,15 @@ async def create_user(user: UserCreate, db: AsyncSession) -> User:
             status_code=400, detail="Username already exists choose another username"
         )
 
+    # Hashed outside the try block so pool saturation surfaces as a 503
+    hashed_password = await hash_password_async(user.password)
+
     try:
         db_user = User(
             email=user.email,
             username=user.username,
             full_name=user.full_name,
-            password=hash_password(user.password),
+            password=hashed_password,
         )
 
         # Assign roles to user
@@ -41,6 +46,8 @@ async def create_user(user: UserCreate, db: AsyncSession) -> User:
             await assign_roles_to_user(db_user, user.role_names, db)
 
         db.add(db_user)
+        await db.flush()
+        db.add(TaskCounter(user_id=db_user.id))
         await db.commit()
         await db.refresh(db_user)
 
@@ -94,6 +101,10 @@ async def update_user(user_id: UUID, user_update: UserUpdate, db: AsyncSession)
         if username_user:
             raise HTTPException(status_code=400, detail="Username already exists")
 
+    hashed_password = None
+    if user_update.password:
+        hashed_password = await hash_password_async(user_update.password)
+
     try:
         # Prepare update data
         update_data = {}
@@ -105,8 +116,16 @@ async def update_user(user_id: UUID, user_update: UserUpdate, db: AsyncSession)
             update_data["full_name"] = user_update.full_name
         if user_update.is_active is not None:
             update_data["is_active"] = user_update.is_active
-        if user_update.password:
-            update_data["password"] = hash_password(user_update.password)
+        if hashed_password:
+            update_data["password"] = hashed_password
+
+        # Revoke outstanding claim-based access tokens on security changes
+        if (
+            user_update.role_names is not None
+            or user_update.is_active is not None
+            or hashed_password
+        ):
+            update_data["token_version"] = User.token_version + 1
 
         # Update user basic fields first
         if update_data:
@@ -124,6 +143,8 @@ async def update_user(user_id: UUID, user_update: UserUpdate, db: AsyncSession)
         else:
             await db.commit()  # Commit basic field updates
 
+        invalidate_user(user_id)
+
         # Return updated user with relationships
         return await get_user_by_id(user_id, db)
     except Exception as error:
@@ -141,6 +162,7 @@ async def delete_user(user_id: UUID, db: AsyncSession) -> bool:
     try:
         await db.execute(delete(User).where(User.id == user_id))
         await db.commit()
+        invalidate_user(user_id)
         return True
     except Exception as error:
         await db.rollback()
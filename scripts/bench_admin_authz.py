@@ -0,0 +1,114 @@
+"""
+Requests per second for admin endpoints under each authorization mode.
+
+Modes:
+    db      - every request loads the user and roles (principal cache off)
+    cache   - per-worker principal cache (user-003)
+    claims  - role and token-version claims in the JWT (user-004)
+
+Usage:
+    PYTHONPATH=. python scripts/bench_admin_authz.py --requests 2000 --concurrency 20
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+import httpx
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.cache import principal_cache, token_version_cache
+from app.core.config import settings
+from app.core.database import Base, get_db
+from app.core.security import hash_password
+from app.main import app
+from app.models.role import Role
+from app.models.user import User
+from app.services.auth_service import authenticate_user
+
+PASSWORD = "bench-password"
+
+
+async def run_mode(client, path, token, requests, concurrency):
+    headers = {"Authorization": f"Bearer {token}"}
+    queue = asyncio.Queue()
+    for _ in range(requests):
+        queue.put_nowait(None)
+    errors = 0
+
+    async def worker():
+        nonlocal errors
+        while not queue.empty():
+            queue.get_nowait()
+            response = await client.get(path, headers=headers)
+            if response.status_code != 200:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return {"rps": round(requests / elapsed, 1), "errors": errors}
+
+
+async def main(requests, concurrency):
+    path = os.path.join(tempfile.mkdtemp(), "bench_authz.db")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    session_factory = async_sessionmaker(
+        bind=engine, class_=AsyncSession, expire_on_commit=False
+    )
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+
+    async with session_factory() as db:
+        admin_role = Role(name="admin", description="Administrator")
+        admin = User(
+            email="bench.admin@example.com",
+            username="bench.admin",
+            full_name="Bench Admin",
+            password=hash_password(PASSWORD),
+        )
+        admin.roles.append(admin_role)
+        db.add_all([admin_role, admin])
+        await db.commit()
+        admin_id = admin.id
+
+    async def override_get_db():
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+
+    results = {}
+    modes = {"db": (False, False), "cache": (True, False), "claims": (True, True)}
+    async with httpx.AsyncClient(
+        base_url="http://bench", transport=httpx.ASGITransport(app=app)
+    ) as client:
+        for mode, (cache_enabled, embed_claims) in modes.items():
+            principal_cache.clear()
+            token_version_cache.clear()
+            principal_cache.enabled = cache_enabled
+            token_version_cache.enabled = cache_enabled
+            settings.ACCESS_TOKEN_EMBED_CLAIMS = embed_claims
+            async with session_factory() as db:
+                token = (
+                    await authenticate_user(db, admin.email, PASSWORD)
+                ).access_token
+            results[mode] = {
+                endpoint: await run_mode(client, endpoint, token, requests, concurrency)
+                for endpoint in ("/api/v1/metrics/", f"/api/v1/users/{admin_id}")
+            }
+
+    app.dependency_overrides.clear()
+    await engine.dispose()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency))
@@ -0,0 +1,89 @@
+"""
+Hash and verify cost for each password hashing setting on this machine.
+
+Reports milliseconds per hash/verify for a range of bcrypt rounds and, when
+argon2-cffi is installed, argon2 time costs at the configured memory limit.
+With --target-ms it also shows what startup calibration would pick.
+
+Usage:
+    PYTHONPATH=. python scripts/bench_password_hashing.py --target-ms 250
+"""
+
+import argparse
+import json
+import statistics
+import time
+
+from passlib.context import CryptContext
+
+from app.core.config import settings
+from app.core.security import calibrate_password_hashing
+
+PASSWORD = "correct horse battery staple"
+
+
+def measure(handler, iterations):
+    hash_samples, verify_samples = [], []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        hashed = handler.hash(PASSWORD)
+        hash_samples.append((time.perf_counter() - start) * 1000)
+        start = time.perf_counter()
+        handler.verify(PASSWORD, hashed)
+        verify_samples.append((time.perf_counter() - start) * 1000)
+    return {
+        "hash_ms": round(statistics.median(hash_samples), 2),
+        "verify_ms": round(statistics.median(verify_samples), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--bcrypt-rounds", default="10,11,12,13,14")
+    parser.add_argument("--argon2-time-costs", default="1,2,3,4")
+    parser.add_argument("--iterations", type=int, default=3)
+    parser.add_argument("--target-ms", type=float)
+    args = parser.parse_args()
+
+    results = []
+    bcrypt = CryptContext(schemes=["bcrypt"]).handler("bcrypt")
+    for rounds in (int(r) for r in args.bcrypt_rounds.split(",")):
+        timing = measure(bcrypt.using(rounds=rounds), args.iterations)
+        results.append({"scheme": "bcrypt", "rounds": rounds, **timing})
+
+    try:
+        import argon2  # noqa: F401
+
+        argon2_handler = CryptContext(schemes=["argon2"]).handler("argon2")
+        for time_cost in (int(t) for t in args.argon2_time_costs.split(",")):
+            handler = argon2_handler.using(
+                rounds=time_cost,
+                memory_cost=settings.ARGON2_MEMORY_KIB,
+                parallelism=settings.ARGON2_PARALLELISM,
+            )
+            timing = measure(handler, args.iterations)
+            results.append(
+                {
+                    "scheme": "argon2",
+                    "time_cost": time_cost,
+                    "memory_kib": settings.ARGON2_MEMORY_KIB,
+                    **timing,
+                }
+            )
+    except ImportError:
+        results.append({"scheme": "argon2", "skipped": "argon2-cffi not installed"})
+
+    report = {"results": results}
+    if args.target_ms:
+        report["calibrated"] = {
+            "bcrypt": calibrate_password_hashing("bcrypt", args.target_ms),
+        }
+        if any(r["scheme"] == "argon2" and "skipped" not in r for r in results):
+            report["calibrated"]["argon2"] = calibrate_password_hashing(
+                "argon2", args.target_ms
+            )
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Benchmark refresh-token lookup latency against a growing refresh_tokens table.
+
+Seeds the table with N filler tokens for each size and then times
+auth_service.refresh_access_token for a real token. With the selector index
+the per-call latency should stay flat as N grows.
+
+Usage:
+    PYTHONPATH=. python scripts/bench_refresh_lookup.py --sizes 1000,100000,1000000
+    PYTHONPATH=. python scripts/bench_refresh_lookup.py --url postgresql+asyncpg://...
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import secrets
+import statistics
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.database import Base
+from app.core.security import (
+    create_refresh_token,
+    hash_refresh_token,
+    split_refresh_token,
+)
+from app.main import app  # noqa: F401  (registers every model on Base.metadata)
+from app.models.refresh_token import RefreshToken
+from app.models.user import User
+from app.services.auth_service import refresh_access_token
+
+SEED_CHUNK = 10_000
+
+
+async def seed(session_factory, user_id, count):
+    expires_at = datetime.now(timezone.utc) + timedelta(days=7)
+    async with session_factory() as db:
+        remaining = count
+        while remaining > 0:
+            chunk = min(SEED_CHUNK, remaining)
+            await db.execute(
+                insert(RefreshToken),
+                [
+                    {
+                        "id": uuid.uuid4(),
+                        "user_id": user_id,
+                        "selector": secrets.token_urlsafe(12),
+                        "token_hash": secrets.token_hex(32),
+                        "expires_at": expires_at,
+                    }
+                    for _ in range(chunk)
+                ],
+            )
+            remaining -= chunk
+        await db.commit()
+
+
+async def run(url, sizes, iterations):
+    engine = create_async_engine(url)
+    session_factory = async_sessionmaker(
+        bind=engine, class_=AsyncSession, expire_on_commit=False
+    )
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+        await connection.run_sync(Base.metadata.create_all)
+
+    user_id = uuid.uuid4()
+    refresh_token = create_refresh_token()
+    selector, _ = split_refresh_token(refresh_token)
+    async with session_factory() as db:
+        db.add(
+            User(
+                id=user_id,
+                email="bench@example.com",
+                username="bench",
+                full_name="bench",
+                password="x",
+            )
+        )
+        db.add(
+            RefreshToken(
+                user_id=user_id,
+                selector=selector,
+                token_hash=hash_refresh_token(refresh_token),
+                expires_at=datetime.now(timezone.utc) + timedelta(days=7),
+            )
+        )
+        await db.commit()
+
+    results = []
+    stored = 1
+    for size in sorted(sizes):
+        await seed(session_factory, user_id, size - stored)
+        stored = size
+        samples = []
+        async with session_factory() as db:
+            for _ in range(iterations):
+                start = time.perf_counter()
+                await refresh_access_token(db, refresh_token)
+                samples.append((time.perf_counter() - start) * 1000)
+        samples.sort()
+        results.append(
+            {
+                "stored_tokens": size,
+                "p50_ms": round(statistics.median(samples), 3),
+                "p99_ms": round(samples[int(len(samples) * 0.99) - 1], 3),
+            }
+        )
+    await engine.dispose()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", help="Database URL (defaults to a temp SQLite file)")
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    url = args.url
+    if url is None:
+        path = os.path.join(tempfile.mkdtemp(), "bench_refresh.db")
+        url = f"sqlite+aiosqlite:///{path}"
+    sizes = [int(size) for size in args.sizes.split(",")]
+    print(json.dumps(asyncio.run(run(url, sizes, args.iterations)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
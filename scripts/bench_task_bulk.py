@@ -0,0 +1,94 @@
+"""
+Benchmark creating and completing N tasks one request at a time versus in bulk.
+
+Runs app.main:app in-process against a temp SQLite file (or --db-url) and
+times N POST /tasks/ calls against one POST /tasks/bulk, then N PATCH
+/tasks/{id}/complete calls against one PATCH /tasks/bulk.
+
+Usage:
+    PYTHONPATH=. python scripts/bench_task_bulk.py --tasks 1000
+    PYTHONPATH=. python scripts/bench_task_bulk.py --db-url postgresql+asyncpg://...
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+
+from loadtest import API, in_process_client, register_users
+
+
+async def timed(coroutine):
+    start = time.perf_counter()
+    result = await coroutine
+    return result, round((time.perf_counter() - start) * 1000, 1)
+
+
+async def single_calls(client, headers, count):
+    task_ids = []
+    for index in range(count):
+        response = await client.post(
+            f"{API}/tasks/", json={"title": f"Single {index}"}, headers=headers
+        )
+        response.raise_for_status()
+        task_ids.append(response.json()["id"])
+    for task_id in task_ids:
+        response = await client.patch(
+            f"{API}/tasks/{task_id}/complete", headers=headers
+        )
+        response.raise_for_status()
+
+
+async def bulk_calls(client, headers, count):
+    response = await client.post(
+        f"{API}/tasks/bulk",
+        json={"items": [{"title": f"Bulk {index}"} for index in range(count)]},
+        headers=headers,
+    )
+    response.raise_for_status()
+    task_ids = [result["id"] for result in response.json()["results"]]
+    response = await client.patch(
+        f"{API}/tasks/bulk",
+        json={"items": [{"id": task_id, "is_completed": True} for task_id in task_ids]},
+        headers=headers,
+    )
+    response.raise_for_status()
+
+
+async def run(db_url, count):
+    client, cleanup = await in_process_client(db_url)
+    try:
+        run_id = f"{int(time.time())}{random.randrange(1000)}"
+        single_user, bulk_user = await register_users(client, 2, run_id)
+        _, single_ms = await timed(single_calls(client, single_user.headers, count))
+        _, bulk_ms = await timed(bulk_calls(client, bulk_user.headers, count))
+    finally:
+        await cleanup()
+    return {
+        "tasks": count,
+        "single_calls_ms": single_ms,
+        "bulk_calls_ms": bulk_ms,
+        "speedup": round(single_ms / bulk_ms, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--db-url", help="Database URL (defaults to a temp SQLite file)"
+    )
+    parser.add_argument("--tasks", type=int, default=1000)
+    args = parser.parse_args()
+
+    db_url = args.db_url
+    if db_url is None:
+        path = os.path.join(tempfile.mkdtemp(), "bench_bulk.db")
+        db_url = f"sqlite+aiosqlite:///{path}"
+    print(json.dumps(asyncio.run(run(db_url, args.tasks)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
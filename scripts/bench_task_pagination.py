@@ -0,0 +1,134 @@
+"""
+Benchmark deep task-list pages with OFFSET versus keyset cursors.
+
+Seeds one user with N tasks and times task_service.get_tasks_by_user for the
+first page and for a page deep into the list, once by page number and once by
+cursor. OFFSET cost grows with the page number; the cursor query should cost
+the same at any depth.
+
+Usage:
+    PYTHONPATH=. python scripts/bench_task_pagination.py --tasks 100000 --depth 1000
+    PYTHONPATH=. python scripts/bench_task_pagination.py --url postgresql+asyncpg://...
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.database import Base
+from app.main import app  # noqa: F401  (registers every model on Base.metadata)
+from app.models.task import Task
+from app.models.user import User
+from app.services.task_service import (
+    encode_task_cursor,
+    get_tasks_by_user,
+    recompute_task_counters,
+)
+
+SEED_CHUNK = 10_000
+
+
+async def seed(session_factory, user_id, count):
+    start = datetime.now(timezone.utc) - timedelta(seconds=count)
+    async with session_factory() as db:
+        for offset in range(0, count, SEED_CHUNK):
+            await db.execute(
+                insert(Task),
+                [
+                    {
+                        "id": uuid.uuid4(),
+                        "user_id": user_id,
+                        "title": f"Task {i}",
+                        "created_at": start + timedelta(seconds=i),
+                    }
+                    for i in range(offset, min(offset + SEED_CHUNK, count))
+                ],
+            )
+        # Bulk inserts bypass task_service, so build the counter once here
+        await recompute_task_counters(db, user_id)
+        await db.commit()
+
+
+async def timed(db, iterations, **kwargs):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await get_tasks_by_user(**kwargs, db=db)
+        samples.append((time.perf_counter() - start) * 1000)
+    return round(statistics.median(samples), 3)
+
+
+async def run(url, task_count, size, depth, iterations):
+    engine = create_async_engine(url)
+    session_factory = async_sessionmaker(
+        bind=engine, class_=AsyncSession, expire_on_commit=False
+    )
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+        await connection.run_sync(Base.metadata.create_all)
+
+    user_id = uuid.uuid4()
+    async with session_factory() as db:
+        db.add(
+            User(
+                id=user_id,
+                email="bench@example.com",
+                username="bench",
+                full_name="bench",
+                password="x",
+            )
+        )
+        await db.commit()
+    await seed(session_factory, user_id, task_count)
+
+    results = []
+    async with session_factory() as db:
+        for page in (1, depth):
+            # The cursor for page N is the last task of page N - 1
+            cursor = None
+            if page > 1:
+                previous, _ = await get_tasks_by_user(user_id, db, page - 1, size)
+                cursor = encode_task_cursor(previous[-1])
+            results.append(
+                {
+                    "page": page,
+                    "offset_p50_ms": await timed(
+                        db, iterations, user_id=user_id, page=page, size=size
+                    ),
+                    "cursor_p50_ms": await timed(
+                        db, iterations, user_id=user_id, size=size, cursor=cursor
+                    ),
+                }
+            )
+    await engine.dispose()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", help="Database URL (defaults to a temp SQLite file)")
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--size", type=int, default=10)
+    parser.add_argument("--depth", type=int, default=1000)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    url = args.url
+    if url is None:
+        path = os.path.join(tempfile.mkdtemp(), "bench_pagination.db")
+        url = f"sqlite+aiosqlite:///{path}"
+    results = asyncio.run(run(url, args.tasks, args.size, args.depth, args.iterations))
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Benchmark task full-text search latency against a large tasks table.
+
+Seeds one user with N tasks built from a fixed vocabulary (plus a slice of
+tasks for a second user) and times task_service.search_tasks for a rare term,
+a common term and a two-term query, first page and a cursor page. Uses the
+FTS5 fallback on SQLite and the tsvector/GIN path on Postgres.
+
+Usage:
+    PYTHONPATH=. python scripts/bench_task_search.py --tasks 1000000
+    PYTHONPATH=. python scripts/bench_task_search.py --url postgresql+asyncpg://...
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.database import Base
+from app.main import app  # noqa: F401  (registers every model on Base.metadata)
+from app.models.task import Task
+from app.models.user import User
+from app.services.task_service import search_tasks
+
+SEED_CHUNK = 10_000
+# Zipf-ish: early words are common, late ones rare
+VOCABULARY = [f"word{index}" for index in range(5000)]
+WEIGHTS = [1 / (rank + 1) for rank in range(len(VOCABULARY))]
+QUERIES = {
+    "common": VOCABULARY[0],
+    "rare": VOCABULARY[-1],
+    "two_terms": f"{VOCABULARY[1]} {VOCABULARY[20]}",
+}
+
+
+def text(rng, words):
+    return " ".join(rng.choices(VOCABULARY, WEIGHTS, k=words))
+
+
+async def seed(session_factory, user_ids, count, rng):
+    start = datetime.now(timezone.utc) - timedelta(seconds=count)
+    async with session_factory() as db:
+        for offset in range(0, count, SEED_CHUNK):
+            await db.execute(
+                insert(Task),
+                [
+                    {
+                        "id": uuid.uuid4(),
+                        "user_id": user_ids[i % len(user_ids)],
+                        "title": text(rng, 4),
+                        "description": text(rng, 12),
+                        "created_at": start + timedelta(seconds=i),
+                    }
+                    for i in range(offset, min(offset + SEED_CHUNK, count))
+                ],
+            )
+            await db.commit()
+
+
+async def timed(db, iterations, **kwargs):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        result = await search_tasks(db=db, **kwargs)
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return result, {
+        "p50_ms": round(statistics.median(samples), 3),
+        "p95_ms": round(samples[int(len(samples) * 0.95) - 1], 3),
+    }
+
+
+async def run(url, task_count, iterations):
+    engine = create_async_engine(url)
+    session_factory = async_sessionmaker(
+        bind=engine, class_=AsyncSession, expire_on_commit=False
+    )
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+        await connection.run_sync(Base.metadata.create_all)
+
+    # Most tasks belong to the benchmarked user; the rest prove scoping costs
+    user_ids = [uuid.uuid4() for _ in range(2)]
+    async with session_factory() as db:
+        for index, user_id in enumerate(user_ids):
+            db.add(
+                User(
+                    id=user_id,
+                    email=f"bench{index}@example.com",
+                    username=f"bench{index}",
+                    full_name="bench",
+                    password="x",
+                )
+            )
+        await db.commit()
+    seed_start = time.perf_counter()
+    await seed(
+        session_factory, user_ids[:1] * 9 + user_ids[1:], task_count, random.Random(1)
+    )
+    seed_seconds = round(time.perf_counter() - seed_start, 1)
+
+    results = {"tasks": task_count, "seed_seconds": seed_seconds, "queries": []}
+    async with session_factory() as db:
+        for name, query in QUERIES.items():
+            (_, total, cursor), first = await timed(
+                db, iterations, user_id=user_ids[0], query=query
+            )
+            entry = {"query": name, "matches": total, "first_page": first}
+            if cursor is not None:
+                _, entry["next_page"] = await timed(
+                    db, iterations, user_id=user_ids[0], query=query, cursor=cursor
+                )
+            results["queries"].append(entry)
+    await engine.dispose()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", help="Database URL (defaults to a temp SQLite file)")
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    url = args.url
+    if url is None:
+        path = os.path.join(tempfile.mkdtemp(), "bench_search.db")
+        url = f"sqlite+aiosqlite:///{path}"
+    print(json.dumps(asyncio.run(run(url, args.tasks, args.iterations)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Encode/decode throughput of each access token codec backend.
+
+Usage:
+    PYTHONPATH=. python scripts/bench_token_codec.py --iterations 50000
+"""
+
+import argparse
+import json
+import time
+import uuid
+
+from app.core.security import TOKEN_CODECS, build_token_codec
+
+
+def ops_per_second(fn, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return round(iterations / (time.perf_counter() - start))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=50000)
+    args = parser.parse_args()
+
+    claims = {
+        "sub": str(uuid.uuid4()),
+        "roles": ["user"],
+        "ver": 0,
+        "exp": int(time.time()) + 3600,
+    }
+    results = {}
+    for backend in TOKEN_CODECS:
+        try:
+            codec = build_token_codec(
+                backend, "benchmark-secret-key-of-at-least-32-bytes"
+            )
+        except RuntimeError as error:
+            results[backend] = {"skipped": str(error)}
+            continue
+        token = codec.encode(claims)
+        results[backend] = {
+            "encode_ops_per_s": ops_per_second(
+                lambda: codec.encode(claims), args.iterations
+            ),
+            "decode_ops_per_s": ops_per_second(
+                lambda: codec.decode(token), args.iterations
+            ),
+        }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -22,11 +22,12 @@ echo "Starting FastAPI application..."
 
 # Start the FastAPI application with Uvicorn
 if [ "$ENV" = "production" ]; then
-    # Production settings
+    # Production settings; the app reads WEB_CONCURRENCY to check per-worker caches
+    export WEB_CONCURRENCY="${WEB_CONCURRENCY:-4}"
     uvicorn app.main:app \
         --host 0.0.0.0 \
         --port 8000 \
-        --workers 4 \
+        --workers "$WEB_CONCURRENCY" \
         --log-config logging.conf
 else
     # Development settings
@@ -0,0 +1,330 @@
+"""
+Reproducible load test for the auth and task hot paths.
+
+Runs fixed, weighted request mixes against app.main:app in-process (through
+httpx's ASGI transport) or against a running server, at one or more
+concurrency levels, and prints p50/p95/p99 latency, RPS and error rates per
+operation as JSON so two commits can be compared directly.
+
+Usage:
+    PYTHONPATH=. python scripts/loadtest.py --scenario tasks --concurrency 1,10,50
+    PYTHONPATH=. python scripts/loadtest.py --db-url postgresql+asyncpg://...
+    PYTHONPATH=. python scripts/loadtest.py --base-url http://localhost:8000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import tempfile
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import httpx
+
+API = "/api/v1"
+PASSWORD = "loadtest-password"
+
+# Operation name -> weight; weights are relative within a scenario
+SCENARIOS: Dict[str, Dict[str, int]] = {
+    "auth": {"login": 1, "refresh": 3, "me": 6},
+    "tasks": {"list": 5, "create": 2, "update": 2, "me": 1},
+    "mixed": {"login": 1, "refresh": 1, "me": 2, "list": 4, "create": 1, "update": 1},
+    "login_storm": {"login": 4, "health": 3, "list": 3},
+}
+
+
+@dataclass
+class VirtualUser:
+    email: str
+    access_token: str = ""
+    refresh_token: str = ""
+    task_ids: List[str] = field(default_factory=list)
+
+    @property
+    def headers(self) -> dict:
+        return {"Authorization": f"Bearer {self.access_token}"}
+
+
+async def op_login(client: httpx.AsyncClient, user: VirtualUser) -> httpx.Response:
+    response = await client.post(
+        f"{API}/auth/login", data={"username": user.email, "password": PASSWORD}
+    )
+    if response.status_code == 200:
+        body = response.json()
+        user.access_token = body["access_token"]
+        user.refresh_token = body["refresh_token"]
+    return response
+
+
+async def op_refresh(client: httpx.AsyncClient, user: VirtualUser) -> httpx.Response:
+    return await client.post(
+        f"{API}/auth/refresh", json={"refresh_token": user.refresh_token}
+    )
+
+
+async def op_me(client: httpx.AsyncClient, user: VirtualUser) -> httpx.Response:
+    return await client.get(f"{API}/users/me", headers=user.headers)
+
+
+async def op_list(client: httpx.AsyncClient, user: VirtualUser) -> httpx.Response:
+    return await client.get(f"{API}/tasks/?page=1&size=10", headers=user.headers)
+
+
+async def op_create(client: httpx.AsyncClient, user: VirtualUser) -> httpx.Response:
+    response = await client.post(
+        f"{API}/tasks/",
+        json={"title": "load test task", "description": "created by loadtest"},
+        headers=user.headers,
+    )
+    if response.status_code == 201:
+        user.task_ids.append(response.json()["id"])
+    return response
+
+
+async def op_update(client: httpx.AsyncClient, user: VirtualUser) -> httpx.Response:
+    if not user.task_ids:
+        return await op_create(client, user)
+    task_id = user.task_ids[len(user.task_ids) // 2]
+    return await client.put(
+        f"{API}/tasks/{task_id}",
+        json={"title": "updated by loadtest", "is_completed": True},
+        headers=user.headers,
+    )
+
+
+async def op_health(client: httpx.AsyncClient, user: VirtualUser) -> httpx.Response:
+    return await client.get("/health")
+
+
+OPERATIONS = {
+    "login": op_login,
+    "refresh": op_refresh,
+    "me": op_me,
+    "list": op_list,
+    "create": op_create,
+    "update": op_update,
+    "health": op_health,
+}
+
+
+def percentile(sorted_samples: List[float], fraction: float) -> float:
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, int(len(sorted_samples) * fraction))
+    return round(sorted_samples[index], 3)
+
+
+def summarize(samples: List[float], errors: int, elapsed: float) -> dict:
+    samples = sorted(samples)
+    return {
+        "requests": len(samples),
+        "rps": round(len(samples) / elapsed, 1) if elapsed else 0.0,
+        "error_rate": round(errors / len(samples), 4) if samples else 0.0,
+        "p50_ms": percentile(samples, 0.50),
+        "p95_ms": percentile(samples, 0.95),
+        "p99_ms": percentile(samples, 0.99),
+    }
+
+
+async def register_users(
+    client: httpx.AsyncClient, count: int, run_id: str
+) -> List[VirtualUser]:
+    users = []
+    for index in range(count):
+        user = VirtualUser(email=f"load{run_id}{index}@example.com")
+        response = await client.post(
+            f"{API}/auth/register",
+            json={
+                "email": user.email,
+                "username": f"load{run_id}{index}",
+                "full_name": "Load Test",
+                "password": PASSWORD,
+            },
+        )
+        response.raise_for_status()
+        login = await op_login(client, user)
+        login.raise_for_status()
+        users.append(user)
+    return users
+
+
+async def run_level(
+    client: httpx.AsyncClient,
+    users: List[VirtualUser],
+    weights: Dict[str, int],
+    concurrency: int,
+    total_requests: int,
+    seed: int,
+) -> dict:
+    names = list(weights)
+    rng = random.Random(seed)
+    # The whole operation sequence is drawn up front so runs are identical
+    plan = rng.choices(
+        names, weights=[weights[name] for name in names], k=total_requests
+    )
+    cursor = iter(enumerate(plan))
+    samples: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+
+    async def worker():
+        for index, name in cursor:
+            user = users[index % len(users)]
+            start = time.perf_counter()
+            try:
+                response = await OPERATIONS[name](client, user)
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            samples[name].append((time.perf_counter() - start) * 1000)
+            if failed:
+                errors[name] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    all_samples = [sample for values in samples.values() for sample in values]
+    return {
+        "concurrency": concurrency,
+        "elapsed_s": round(elapsed, 3),
+        "overall": summarize(all_samples, sum(errors.values()), elapsed),
+        "operations": {
+            name: summarize(samples[name], errors[name], elapsed)
+            for name in sorted(samples)
+        },
+    }
+
+
+async def in_process_client(db_url: str):
+    """Point app.main:app at db_url and return an ASGI client plus cleanup."""
+    from sqlalchemy import select
+    from sqlalchemy.ext.asyncio import (
+        AsyncSession,
+        async_sessionmaker,
+        create_async_engine,
+    )
+
+    from app.core.database import Base, get_db
+    from app.main import app
+    from app.models.role import Role
+
+    engine = create_async_engine(db_url)
+    session_factory = async_sessionmaker(
+        bind=engine, class_=AsyncSession, expire_on_commit=False
+    )
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    async with session_factory() as db:
+        existing = await db.execute(select(Role.name))
+        names = set(existing.scalars().all())
+        for name in ("admin", "user"):
+            if name not in names:
+                db.add(Role(name=name, description=name))
+        await db.commit()
+
+    async def override_get_db():
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+    client = httpx.AsyncClient(
+        base_url="http://loadtest", transport=httpx.ASGITransport(app=app)
+    )
+
+    async def cleanup():
+        await client.aclose()
+        app.dependency_overrides.pop(get_db, None)
+        await engine.dispose()
+
+    return client, cleanup
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            text=True,
+            stderr=subprocess.DEVNULL,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def main(args) -> dict:
+    if args.base_url:
+        client = httpx.AsyncClient(base_url=args.base_url, timeout=30)
+        cleanup = client.aclose
+    else:
+        db_url = args.db_url
+        if db_url is None:
+            path = os.path.join(tempfile.mkdtemp(), "loadtest.db")
+            db_url = f"sqlite+aiosqlite:///{path}"
+        client, cleanup = await in_process_client(db_url)
+
+    try:
+        run_id = f"{int(time.time())}{random.randrange(1000)}"
+        users = await register_users(client, args.users, run_id)
+        levels = []
+        for concurrency in args.concurrency:
+            for name in args.scenario:
+                result = await run_level(
+                    client,
+                    users,
+                    SCENARIOS[name],
+                    concurrency,
+                    args.requests,
+                    args.seed,
+                )
+                result["scenario"] = name
+                levels.append(result)
+    finally:
+        await cleanup()
+
+    return {
+        "revision": git_revision(),
+        "target": args.base_url or "in-process",
+        "requests_per_level": args.requests,
+        "users": args.users,
+        "seed": args.seed,
+        "results": levels,
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--scenario",
+        default="mixed",
+        type=lambda value: value.split(","),
+        help=f"Comma separated, from: {', '.join(SCENARIOS)}",
+    )
+    parser.add_argument(
+        "--concurrency",
+        default="1,10,50",
+        type=lambda v: [int(c) for c in v.split(",")],
+    )
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--db-url", help="Database for in-process runs (temp SQLite)")
+    parser.add_argument("--base-url", help="Target a running server instead")
+    parser.add_argument("--output", help="Write JSON here as well as stdout")
+    args = parser.parse_args()
+    unknown = set(args.scenario) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"Unknown scenario(s): {', '.join(sorted(unknown))}")
+    return args
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    report = json.dumps(asyncio.run(main(arguments)), indent=2)
+    if arguments.output:
+        with open(arguments.output, "w") as handle:
+            handle.write(report)
+    print(report)
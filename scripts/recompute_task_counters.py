@@ -0,0 +1,48 @@
+"""
+Recompute per-user task counters from the tasks table.
+
+Counters are maintained by task_service on every write; this repairs them
+after manual SQL, restores or bulk loads that bypassed the service. Prints
+how many counters were wrong.
+
+Usage:
+    PYTHONPATH=. python scripts/recompute_task_counters.py
+    PYTHONPATH=. python scripts/recompute_task_counters.py --user-id <uuid>
+    PYTHONPATH=. python scripts/recompute_task_counters.py --dry-run
+"""
+
+import argparse
+import asyncio
+import uuid
+
+from app.core.database import AsyncSessionLocal, async_engine
+from app.main import app  # noqa: F401  (registers every model on Base.metadata)
+from app.services.task_service import recompute_task_counters
+
+
+async def run(user_id, dry_run):
+    async with AsyncSessionLocal() as db:
+        repaired = await recompute_task_counters(db, user_id)
+        if dry_run:
+            await db.rollback()
+        else:
+            await db.commit()
+    await async_engine.dispose()
+    return repaired
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--user-id", type=uuid.UUID, help="Only this user")
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Report drift without writing"
+    )
+    args = parser.parse_args()
+
+    repaired = asyncio.run(run(args.user_id, args.dry_run))
+    action = "would repair" if args.dry_run else "repaired"
+    print(f"{action} {repaired} task counter(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -17,18 +17,25 @@ from datetime import datetime, timedelta, timezone
 
 import httpx
 import pytest
-from sqlalchemy import text
+from sqlalchemy import event, text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
+from app.core.cache import principal_cache, token_version_cache
 from app.core.config import settings
-from app.core.database import Base, get_db
+from app.core.database import Base, get_db, get_session_factory
+from app.core.events import task_events
+from app.core.rate_limit import login_shield
+from app.core.response_cache import task_list_cache
 from app.core.security import (
     create_access_token,
     create_refresh_token,
     hash_refresh_token,
+    split_refresh_token,
 )
 from app.main import app
 from app.models.refresh_token import RefreshToken
+from app.services.archive_service import task_archiver
+from app.services.revocation_service import revocation_list
 
 # Use SQLite in-memory database for testing
 """
@@ -50,6 +57,29 @@ AsyncSessionLocal = async_sessionmaker(
 )
 
 
+@pytest.fixture(autouse=True)
+def reset_in_process_state():
+    # Each test gets a fresh database, so per-process state must not leak
+    principal_cache.clear()
+    token_version_cache.clear()
+    login_shield.reset()
+    revocation_list.reset()
+    task_list_cache.reset()
+    task_events.reset()
+    task_archiver.reset()
+    yield
+    principal_cache.clear()
+    token_version_cache.clear()
+
+
+@pytest.fixture
+def restore_password_hashing():
+    yield
+    from app.core.security import init_password_hashing
+
+    init_password_hashing()
+
+
 @pytest.fixture(scope="function")
 async def db():
     async with test_engine.begin() as connection:
@@ -71,12 +101,26 @@ async def db():
     await test_engine.dispose()
 
 
+@pytest.fixture
+def sql_statements():
+    """Collects every SQL statement the test engine executes while active."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(test_engine.sync_engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(test_engine.sync_engine, "before_cursor_execute", record)
+
+
 @pytest.fixture(scope="function")
 async def client(db):
     async def override_get_db():
         yield db
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_session_factory] = lambda: AsyncSessionLocal
 
     async with httpx.AsyncClient(
         base_url="http://test", transport=httpx.ASGITransport(app=app)
@@ -138,8 +182,10 @@ async def test_refresh_token(db, test_user):
     expires_at = datetime.now(timezone.utc) + timedelta(
         days=settings.REFRESH_TOKEN_EXPIRE_DAYS
     )
+    selector, _ = split_refresh_token(refresh_token)
     db_refresh_token = RefreshToken(
         user_id=test_user.id,
+        selector=selector,
         token_hash=hash_refresh_token(refresh_token),
         expires_at=expires_at,
     )
@@ -0,0 +1,124 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.background import LeaderLock, PeriodicJob
+
+
+class FakeEngine:
+    """Postgres engine stand-in counting the connections checked out of it."""
+
+    dialect = SimpleNamespace(name="postgresql")
+
+    def __init__(self, lock_free=True, fail=False):
+        self.lock_free = lock_free
+        self.fail = fail
+        self.checked_out = 0
+
+    async def connect(self):
+        self.checked_out += 1
+        return FakeConnection(self)
+
+
+class FakeConnection:
+    def __init__(self, engine):
+        self.engine = engine
+
+    async def execute(self, statement, parameters=None):
+        if self.engine.fail:
+            raise ConnectionError("connection lost")
+        return SimpleNamespace(scalar=lambda: self.engine.lock_free)
+
+    async def commit(self):
+        pass
+
+    async def close(self):
+        self.engine.checked_out -= 1
+
+
+async def test_run_once_records_result():
+    async def job():
+        return 3
+
+    periodic = PeriodicJob(name="test", interval=60, job=job)
+
+    assert await periodic.run_once() == 3
+    assert await periodic.run_once() == 3
+    stats = periodic.stats()
+    assert stats["runs"] == 2
+    assert stats["total"] == 6
+    assert stats["last_result"] == 3
+
+
+async def test_failing_job_keeps_running():
+    calls = 0
+
+    async def job():
+        nonlocal calls
+        calls += 1
+        raise RuntimeError("boom")
+
+    periodic = PeriodicJob(name="test", interval=0.01, job=job)
+    periodic.start()
+    await asyncio.sleep(0.05)
+    await periodic.stop()
+
+    assert calls > 1
+    assert periodic.stats()["failures"] == calls
+
+
+async def test_leader_jobs_share_one_connection():
+    engine, lock = FakeEngine(), LeaderLock(key=1)
+
+    async def job():
+        return 1
+
+    periodic_jobs = [
+        PeriodicJob(
+            name=f"job-{i}",
+            interval=60,
+            job=job,
+            engine=engine,
+            single_leader=True,
+            lock=lock,
+        )
+        for i in range(4)
+    ]
+    for _ in range(2):
+        await asyncio.gather(*(periodic.run_once() for periodic in periodic_jobs))
+
+    assert all(periodic.stats()["runs"] == 2 for periodic in periodic_jobs)
+    assert engine.checked_out == 1
+    await lock.release()
+    assert engine.checked_out == 0
+
+
+async def test_connection_is_closed_when_the_lock_is_taken():
+    engine = FakeEngine(lock_free=False)
+
+    async def job():
+        return 1
+
+    periodic = PeriodicJob(
+        name="job",
+        interval=60,
+        job=job,
+        engine=engine,
+        single_leader=True,
+        lock=LeaderLock(key=1),
+    )
+
+    assert await periodic.run_once() is None
+    assert engine.checked_out == 0
+
+
+async def test_connection_is_closed_when_taking_the_lock_fails():
+    engine = FakeEngine(fail=True)
+    lock = LeaderLock(key=1)
+
+    with pytest.raises(ConnectionError):
+        await lock.acquire(engine)
+
+    assert not lock.held
+    assert engine.checked_out == 0
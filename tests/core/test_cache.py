@@ -0,0 +1,43 @@
+from unittest.mock import patch
+
+from app.core.cache import TTLCache
+
+
+def test_cache_hit_and_miss_counters():
+    cache = TTLCache(max_size=10, ttl=60)
+
+    assert cache.get("a") is None
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_cache_evicts_least_recently_used():
+    cache = TTLCache(max_size=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_cache_entries_expire():
+    cache = TTLCache(max_size=10, ttl=5)
+    with patch("app.core.cache.monotonic", return_value=100.0):
+        cache.set("a", 1)
+    with patch("app.core.cache.monotonic", return_value=106.0):
+        assert cache.get("a") is None
+
+
+def test_disabled_cache_stores_nothing():
+    cache = TTLCache(max_size=10, ttl=60, enabled=False)
+    cache.set("a", 1)
+
+    assert cache.get("a") is None
+    assert cache.stats()["size"] == 0
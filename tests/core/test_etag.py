@@ -0,0 +1,18 @@
+from app.core.etag import etag_matches, parse_etags, weak_etag
+
+
+def test_parse_etags_strips_weak_prefix_and_quotes():
+    assert parse_etags('W/"a", "b" ,W/"c"') == ["a", "b", "c"]
+    assert parse_etags("*") == ["*"]
+    assert parse_etags(" , ") == []
+
+
+def test_etag_matches_uses_weak_comparison():
+    etag = weak_etag("abc")
+
+    assert etag == 'W/"abc"'
+    assert etag_matches('"abc"', etag)
+    assert etag_matches('W/"xyz", W/"abc"', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('W/"abd"', etag)
+    assert not etag_matches(None, etag)
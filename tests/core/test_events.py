@@ -0,0 +1,97 @@
+import asyncio
+import json
+import tracemalloc
+from contextlib import AsyncExitStack
+from uuid import uuid4
+
+from app.core.events import CLOSED, NOTIFY_MAX_BYTES, RESYNC, TaskEventBroker
+
+
+async def test_events_reach_only_the_users_subscribers():
+    broker = TaskEventBroker()
+    user_id, other_user_id = uuid4(), uuid4()
+
+    async with broker.subscribe(user_id) as first, broker.subscribe(
+        user_id
+    ) as second, broker.subscribe(other_user_id) as other:
+        await broker.publish(user_id, [{"type": "created", "id": "1"}])
+
+        assert await first.get() == {"type": "created", "id": "1"}
+        assert await second.get() == {"type": "created", "id": "1"}
+        assert other._events == []
+        assert broker.stats()["subscribers"] == 3
+
+    assert broker.stats()["subscribers"] == 0
+    assert broker.stats()["users"] == 0
+    assert broker.stats()["delivered"] == 2
+
+
+async def test_slow_subscriber_is_told_to_resync():
+    broker = TaskEventBroker(max_pending=3)
+    user_id = uuid4()
+
+    async with broker.subscribe(user_id) as subscription:
+        await broker.publish(user_id, [{"type": "updated", "n": n} for n in range(10)])
+
+        assert await subscription.get() == RESYNC
+        assert subscription._events == []
+    assert broker.stats()["resyncs"] == 1
+
+
+async def test_waiting_subscriber_wakes_on_publish_and_close():
+    broker = TaskEventBroker()
+    user_id = uuid4()
+
+    async with broker.subscribe(user_id) as subscription:
+        waiting = asyncio.create_task(subscription.get())
+        await asyncio.sleep(0)
+        await broker.publish(user_id, [{"type": "deleted", "id": "1"}])
+        assert await waiting == {"type": "deleted", "id": "1"}
+
+        waiting = asyncio.create_task(subscription.get())
+        await asyncio.sleep(0)
+        await broker.close()
+        assert await waiting == CLOSED
+
+
+async def test_notify_payloads_fan_out_to_other_workers():
+    worker_a, worker_b = TaskEventBroker(), TaskEventBroker()
+    user_id = uuid4()
+    events = [
+        {"type": "created", "id": str(n), "task": {"title": "x" * 500}}
+        for n in range(40)
+    ]
+    events.append({"type": "updated", "id": "big", "task": {"title": "x" * 9000}})
+
+    messages = worker_a._messages(user_id, events)
+
+    assert len(messages) > 1
+    assert all(len(message.encode()) <= NOTIFY_MAX_BYTES for message in messages)
+    async with worker_b.subscribe(user_id) as subscription:
+        for message in messages:
+            worker_b._on_notify(None, 0, worker_b.channel, message)
+        worker_b._on_notify(None, 0, worker_b.channel, "not json")
+        received = [await subscription.get() for _ in events]
+    assert received[:-1] == events[:-1]
+    # Too large for NOTIFY, so it arrives without the task body
+    assert received[-1] == {"type": "updated", "id": "big"}
+    assert json.loads(messages[0])["user_id"] == str(user_id)
+
+
+async def test_idle_subscribers_stay_small():
+    broker = TaskEventBroker(max_subscribers=10000)
+    users = [uuid4() for _ in range(1000)]
+
+    async with AsyncExitStack() as stack:
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            for n in range(5000):
+                await stack.enter_async_context(broker.subscribe(users[n % 1000]))
+            per_subscriber = (tracemalloc.get_traced_memory()[0] - before) / 5000
+        finally:
+            tracemalloc.stop()
+        assert broker.full is False
+        assert broker.stats()["subscribers"] == 5000
+
+    assert per_subscriber < 2048
@@ -0,0 +1,108 @@
+import pytest
+
+from app.core.rate_limit import LoginShield, MemoryShieldBackend, ShieldBackend
+
+
+def _shield(**overrides) -> LoginShield:
+    options = dict(
+        backend=MemoryShieldBackend(),
+        email_burst=3,
+        email_per_minute=1,
+        ip_burst=10,
+        ip_per_minute=1,
+        free_failures=2,
+        backoff_base=10,
+        backoff_max=60,
+        failure_window=900,
+    )
+    options.update(overrides)
+    return LoginShield(**options)
+
+
+async def test_email_bucket_sheds_after_burst():
+    shield = _shield()
+
+    results = [await shield.check("a@example.com", "10.0.0.1") for _ in range(4)]
+
+    assert results[:3] == [0.0, 0.0, 0.0]
+    assert results[3] > 0
+    assert shield.stats()["shed_email"] == 1
+
+
+async def test_ip_bucket_sheds_across_emails():
+    shield = _shield(ip_burst=2)
+
+    await shield.check("a@example.com", "10.0.0.1")
+    await shield.check("b@example.com", "10.0.0.1")
+
+    assert await shield.check("c@example.com", "10.0.0.1") > 0
+    assert await shield.check("c@example.com", "10.0.0.2") == 0
+    assert shield.stats()["shed_ip"] == 1
+
+
+async def test_failures_trigger_exponential_backoff():
+    backend = MemoryShieldBackend()
+    shield = _shield(backend=backend, email_burst=100, ip_burst=100)
+
+    for _ in range(2):
+        await shield.record_failure("a@example.com", None)
+    assert await backend.blocked_for("email:a@example.com") == 0
+
+    await shield.record_failure("a@example.com", None)
+    first_block = await backend.blocked_for("email:a@example.com")
+    await shield.record_failure("a@example.com", None)
+    second_block = await backend.blocked_for("email:a@example.com")
+
+    assert 0 < first_block <= 10
+    assert 10 < second_block <= 20
+    assert await shield.check("A@example.com", None) > 0
+    assert shield.stats()["shed_backoff"] == 1
+
+
+async def test_success_clears_backoff():
+    shield = _shield(email_burst=100, ip_burst=100, free_failures=0)
+    await shield.record_failure("a@example.com", None)
+
+    await shield.record_success("a@example.com", None)
+
+    assert await shield.check("a@example.com", None) == 0
+
+
+async def test_memory_backend_is_bounded():
+    backend = MemoryShieldBackend(max_keys=2)
+    for key in ("a", "b", "c"):
+        await backend.consume(key, 1, 1)
+
+    assert len(backend._state) == 2
+
+
+async def test_memory_backend_keeps_blocks_when_flooded():
+    backend = MemoryShieldBackend(max_keys=2)
+    await backend.block("victim", 60)
+    await backend.block("expired", 0)
+
+    for key in ("a", "b", "c"):
+        await backend.consume(key, 1, 1)
+        await backend.block(key, 60)
+
+    assert await backend.blocked_for("victim") > 0
+    assert "expired" not in backend._blocks
+
+
+async def test_failures_from_one_ip_do_not_block_the_email_elsewhere():
+    shield = _shield(email_burst=100, ip_burst=100)
+
+    for _ in range(5):
+        await shield.record_failure("a@example.com", "10.0.0.1")
+
+    assert await shield.check("a@example.com", "10.0.0.1") > 0
+    assert await shield.check("a@example.com", "10.0.0.2") == 0
+
+
+def test_incomplete_backend_fails_on_construction():
+    class ConsumeOnly(ShieldBackend):
+        async def consume(self, key, capacity, refill_per_second):
+            return 0.0
+
+    with pytest.raises(TypeError):
+        ConsumeOnly()
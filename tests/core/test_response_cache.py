@@ -0,0 +1,130 @@
+import time
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+
+from app.core.response_cache import (
+    CacheBackend,
+    MemoryCacheBackend,
+    RedisCacheBackend,
+    ResponseCache,
+    build_cache_backend,
+)
+
+
+class LocalKeyValue:
+    """Stand-in for the redis client: just the commands RedisCacheBackend uses."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        value, expires_at = self.data.get(key, (None, None))
+        if expires_at is not None and expires_at <= time.monotonic():
+            return None
+        return value
+
+    async def set(self, key, value, px=None):
+        expires_at = time.monotonic() + px / 1000 if px else None
+        self.data[key] = (value, expires_at)
+
+    async def incr(self, key):
+        value = int((await self.get(key)) or 0) + 1
+        self.data[key] = (str(value).encode(), None)
+        return value
+
+
+async def test_invalidate_retires_every_page_of_the_user():
+    cache = ResponseCache(MemoryCacheBackend(max_keys=100), ttl=60)
+    user_id, other_user_id = uuid4(), uuid4()
+    for variant in ("page=1", "page=2"):
+        await cache.set(await cache.key(user_id, variant), variant.encode())
+    await cache.set(await cache.key(other_user_id, "page=1"), b"other")
+
+    assert await cache.get(await cache.key(user_id, "page=2")) == b"page=2"
+    await cache.invalidate(user_id)
+
+    assert await cache.get(await cache.key(user_id, "page=1")) is None
+    assert await cache.get(await cache.key(user_id, "page=2")) is None
+    assert await cache.get(await cache.key(other_user_id, "page=1")) == b"other"
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["invalidations"]) == (2, 2, 1)
+    assert stats["hit_ratio"] == 0.5
+
+
+async def test_evicted_generation_is_never_reused():
+    backend = MemoryCacheBackend(max_keys=2)
+    cache = ResponseCache(backend, ttl=60)
+    user_id = uuid4()
+    stale_key = await cache.key(user_id, "page=1")
+    await cache.set(stale_key, b"stale")
+
+    # Two other users push this user's generation (and page) out of the LRU,
+    # then the page is stored again as if it had survived
+    await cache.key(uuid4(), "page=1")
+    await cache.key(uuid4(), "page=1")
+    await backend.set(stale_key, b"stale", 60)
+
+    assert await cache.key(user_id, "page=1") != stale_key
+
+
+async def test_memory_pages_expire():
+    cache = ResponseCache(MemoryCacheBackend(max_keys=10), ttl=5)
+    user_id = uuid4()
+    with patch("app.core.response_cache.time.monotonic", return_value=100.0):
+        key = await cache.key(user_id, "page=1")
+        await cache.set(key, b"page")
+    with patch("app.core.response_cache.time.monotonic", return_value=106.0):
+        assert await cache.get(key) is None
+
+
+async def test_shared_backend_invalidates_across_workers():
+    store = LocalKeyValue()
+    worker_a = ResponseCache(RedisCacheBackend(client=store), ttl=60)
+    worker_b = ResponseCache(RedisCacheBackend(client=store), ttl=60)
+    user_id = uuid4()
+
+    await worker_a.set(await worker_a.key(user_id, "page=1"), b"page")
+    assert await worker_b.get(await worker_b.key(user_id, "page=1")) == b"page"
+
+    await worker_a.invalidate(user_id)
+
+    assert await worker_b.get(await worker_b.key(user_id, "page=1")) is None
+
+
+async def test_disabled_cache_stores_nothing():
+    cache = ResponseCache(MemoryCacheBackend(max_keys=10), ttl=60, enabled=False)
+    key = await cache.key(uuid4(), "page=1")
+    await cache.set(key, b"page")
+
+    assert key is None
+    assert await cache.get(key) is None
+    assert cache.stats()["misses"] == 0
+
+
+async def test_failed_invalidation_is_counted_not_raised():
+    class BrokenBump(MemoryCacheBackend):
+        async def bump(self, key):
+            raise ConnectionError("backend unavailable")
+
+    cache = ResponseCache(BrokenBump(max_keys=100), ttl=60)
+
+    await cache.invalidate(uuid4())
+
+    assert cache.stats()["invalidation_failures"] == 1
+
+
+def test_memory_backend_is_refused_with_several_workers():
+    assert isinstance(build_cache_backend("memory"), MemoryCacheBackend)
+    with pytest.raises(RuntimeError):
+        build_cache_backend("memory", workers=4)
+
+
+def test_incomplete_backend_fails_on_construction():
+    class GetOnly(CacheBackend):
+        async def get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        GetOnly()
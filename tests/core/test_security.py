@@ -0,0 +1,137 @@
+import time
+
+import pytest
+
+from app.core import security
+
+
+def test_calibration_picks_rounds_within_target(monkeypatch):
+    # 50ms at the floor of 10 rounds: 11 -> 100ms, 12 -> 200ms, 13 -> 400ms
+    monkeypatch.setattr(security, "measure_hash_ms", lambda scheme, **params: 50.0)
+
+    params = security.calibrate_password_hashing("bcrypt", target_ms=450)
+
+    assert params["bcrypt_rounds"] == 13
+
+
+def test_calibration_never_goes_below_floor(monkeypatch):
+    monkeypatch.setattr(security, "measure_hash_ms", lambda scheme, **params: 500.0)
+
+    params = security.calibrate_password_hashing("bcrypt", target_ms=100)
+
+    assert params["bcrypt_rounds"] == security.settings.BCRYPT_MIN_ROUNDS
+
+
+def test_lower_cost_hash_needs_rehash(restore_password_hashing):
+    security.configure_password_hashing(
+        "bcrypt",
+        bcrypt_rounds=4,
+        argon2_time_cost=1,
+        argon2_memory_kib=1024,
+        argon2_parallelism=1,
+    )
+    old_hash = security.hash_password("secret")
+    assert not security.password_needs_rehash(old_hash)
+
+    security.configure_password_hashing(
+        "bcrypt",
+        bcrypt_rounds=5,
+        argon2_time_cost=1,
+        argon2_memory_kib=1024,
+        argon2_parallelism=1,
+    )
+
+    assert security.password_needs_rehash(old_hash)
+    assert security.verify_password("secret", old_hash)
+
+
+def test_argon2_scheme_with_memory_limit(restore_password_hashing):
+    pytest.importorskip("argon2")
+    bcrypt_hash = security.hash_password("secret")
+
+    security.configure_password_hashing(
+        "argon2",
+        bcrypt_rounds=4,
+        argon2_time_cost=1,
+        argon2_memory_kib=1024,
+        argon2_parallelism=1,
+    )
+    argon2_hash = security.hash_password("secret")
+
+    assert argon2_hash.startswith("$argon2id$v=19$m=1024,t=1,p=1$")
+    assert security.verify_password("secret", bcrypt_hash)
+    assert security.password_needs_rehash(bcrypt_hash)
+
+
+TOKEN_SECRET = "test-secret-key-of-at-least-32-bytes"
+
+
+def _available_codecs():
+    backends = ["hs256", "jose"]
+    try:
+        import jwt  # noqa: F401
+
+        backends.append("pyjwt")
+    except ImportError:
+        pass
+    return backends
+
+
+@pytest.mark.parametrize("encoder", _available_codecs())
+@pytest.mark.parametrize("decoder", _available_codecs())
+def test_token_codecs_are_interchangeable(encoder, decoder):
+    token = security.build_token_codec(encoder, TOKEN_SECRET).encode(
+        {"sub": "user-id", "exp": int(time.time()) + 60}
+    )
+
+    claims = security.build_token_codec(decoder, TOKEN_SECRET).decode(token)
+
+    assert claims["sub"] == "user-id"
+
+
+@pytest.mark.parametrize("backend", _available_codecs())
+def test_token_codec_rejects_expired_token(backend):
+    codec = security.build_token_codec(backend, TOKEN_SECRET)
+    token = codec.encode({"sub": "user-id", "exp": int(time.time()) - 1})
+
+    with pytest.raises(security.TokenError):
+        codec.decode(token)
+
+
+@pytest.mark.parametrize("backend", _available_codecs())
+def test_token_codec_rejects_wrong_key(backend):
+    token = security.build_token_codec(backend, TOKEN_SECRET).encode(
+        {"sub": "user-id", "exp": int(time.time()) + 60}
+    )
+
+    with pytest.raises(security.TokenError):
+        security.build_token_codec(
+            backend, "another-test-secret-key-of-32-bytes"
+        ).decode(token)
+
+
+def test_hs256_codec_rejects_unsigned_token():
+    codec = security.build_token_codec("hs256", TOKEN_SECRET)
+    header = security._b64url_encode(b'{"alg":"none","typ":"JWT"}')
+    payload = security._b64url_encode(
+        f'{{"sub":"user-id","exp":{int(time.time()) + 60}}}'.encode()
+    )
+
+    with pytest.raises(security.TokenError):
+        codec.decode(f"{header}.{payload}.")
+
+
+def test_hs256_codec_rejects_garbage():
+    codec = security.build_token_codec("hs256", TOKEN_SECRET)
+
+    with pytest.raises(security.TokenError):
+        codec.decode("not-a-token")
+
+
+def test_incomplete_token_codec_fails_on_construction():
+    class EncodeOnly(security.TokenCodec):
+        def encode(self, claims: dict) -> str:
+            return ""
+
+    with pytest.raises(TypeError):
+        EncodeOnly(TOKEN_SECRET)
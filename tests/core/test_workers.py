@@ -0,0 +1,37 @@
+import asyncio
+import time
+
+import pytest
+
+from app.core.workers import BoundedWorkerPool, WorkerPoolSaturated
+
+
+async def test_pool_runs_blocking_work():
+    pool = BoundedWorkerPool(name="test", kind="thread", max_workers=2, max_queue=2)
+
+    result = await pool.run(sum, [1, 2, 3])
+
+    assert result == 6
+    assert pool.stats()["completed"] == 1
+    pool.shutdown()
+
+
+async def test_pool_rejects_work_when_queue_is_full():
+    pool = BoundedWorkerPool(name="test", kind="thread", max_workers=1, max_queue=1)
+
+    results = await asyncio.gather(
+        *(pool.run(time.sleep, 0.1) for _ in range(3)), return_exceptions=True
+    )
+
+    rejected = [r for r in results if isinstance(r, WorkerPoolSaturated)]
+    assert len(rejected) == 1
+    stats = pool.stats()
+    assert stats["rejected"] == 1
+    assert stats["completed"] == 2
+    assert stats["queue_depth"] == 0
+    pool.shutdown()
+
+
+def test_pool_rejects_unknown_kind():
+    with pytest.raises(ValueError):
+        BoundedWorkerPool(name="test", kind="fiber", max_workers=1, max_queue=1)
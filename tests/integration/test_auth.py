@@ -1,5 +1,16 @@
+import asyncio
+import math
+from time import perf_counter
+
 import httpx
 import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.core.database import Base, get_db, get_session_factory
+from app.core.security import create_access_token, hash_password, verify_password
+from app.main import app
+from app.models.user import User
 
 
 @pytest.mark.asyncio
@@ -83,3 +94,208 @@ async def test_refresh_invalid_token(client: httpx.AsyncClient):
     )
     assert response.status_code == 401
     assert response.json()["detail"] == "Invalid or expired refresh token"
+
+
+@pytest.mark.asyncio
+async def test_refresh_with_tampered_verifier(
+    client: httpx.AsyncClient, test_refresh_token
+):
+    selector, _ = test_refresh_token.split(".", 1)
+    response = await client.post(
+        "/api/v1/auth/refresh",
+        json={"refresh_token": f"{selector}.not-the-real-verifier"},
+    )
+    assert response.status_code == 401
+    assert response.json()["detail"] == "Invalid or expired refresh token"
+
+
+@pytest.mark.asyncio
+async def test_refresh_token_issued_at_login(client: httpx.AsyncClient, test_user):
+    login_response = await client.post(
+        "/api/v1/auth/login",
+        data={"username": "testuser@example.com", "password": "testpass"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    refresh_token = login_response.json()["refresh_token"]
+
+    response = await client.post(
+        "/api/v1/auth/refresh",
+        json={"refresh_token": refresh_token},
+    )
+    assert response.status_code == 200
+    assert response.json()["refresh_token"] == refresh_token
+
+
+@pytest.fixture
+async def file_sessions(tmp_path):
+    """
+    Sessions on a file database. Concurrent requests need connections of
+    their own, which the in-memory test database (one shared connection)
+    cannot give them.
+    """
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_health_and_tasks_stay_responsive_during_login_storm(
+    client: httpx.AsyncClient, file_sessions
+):
+    async with file_sessions() as db:
+        user = User(
+            email="testuser@example.com",
+            username="test.user",
+            full_name="test user",
+            password=hash_password("testpass"),
+        )
+        db.add(user)
+        await db.commit()
+
+    async def session_per_request():
+        async with file_sessions() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = session_per_request
+    app.dependency_overrides[get_session_factory] = lambda: file_sessions
+    start = perf_counter()
+    verify_password("testpass", user.password)
+    single_verify = perf_counter() - start
+    headers = {
+        "Authorization": f"Bearer {create_access_token(data={'sub': str(user.id)})}"
+    }
+    # Also warms the principal cache, so the samples below only measure serving
+    assert (await client.get("/api/v1/tasks/", headers=headers)).status_code == 200
+
+    # As many concurrent logins as the per-email limit lets through
+    storm = asyncio.gather(
+        *(
+            client.post(
+                "/api/v1/auth/login",
+                data={"username": "testuser@example.com", "password": "testpass"},
+                headers={"Content-Type": "application/x-www-form-urlencoded"},
+            )
+            for _ in range(settings.LOGIN_EMAIL_BURST)
+        )
+    )
+    latencies = {"/health": [], "/api/v1/tasks/": []}
+    while not storm.done():
+        for path, samples in latencies.items():
+            start = perf_counter()
+            response = await client.get(path, headers=headers)
+            samples.append(perf_counter() - start)
+            assert response.status_code == 200
+
+    assert all(response.status_code == 200 for response in await storm)
+    for samples in latencies.values():
+        assert samples
+        # p99 of the samples; with bcrypt inline, requests would queue
+        # behind whole hashes and take at least one
+        p99 = sorted(samples)[max(0, math.ceil(len(samples) * 0.99) - 1)]
+        assert p99 < single_verify
+
+
+@pytest.mark.asyncio
+async def test_login_storm_is_shed_before_hashing(
+    client: httpx.AsyncClient, test_user, monkeypatch
+):
+    from app.services import auth_service
+
+    verifies = 0
+    original_verify = auth_service.verify_password_async
+
+    async def counting_verify(**kwargs):
+        nonlocal verifies
+        verifies += 1
+        return await original_verify(**kwargs)
+
+    monkeypatch.setattr(auth_service, "verify_password_async", counting_verify)
+
+    statuses = []
+    for _ in range(8):
+        response = await client.post(
+            "/api/v1/auth/login",
+            data={"username": "testuser@example.com", "password": "wrong"},
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+        )
+        statuses.append(response.status_code)
+
+    # Three free failures, the fourth starts a backoff that sheds the rest
+    assert statuses[:4] == [401, 401, 401, 401]
+    assert set(statuses[4:]) == {429}
+    assert verifies == 4
+    assert "Retry-After" in response.headers
+
+
+@pytest.mark.asyncio
+async def test_logout_revokes_access_and_refresh_token(
+    client: httpx.AsyncClient, test_access_token, test_refresh_token
+):
+    headers = {"Authorization": f"Bearer {test_access_token}"}
+
+    response = await client.post(
+        "/api/v1/auth/logout",
+        json={"refresh_token": test_refresh_token},
+        headers=headers,
+    )
+    assert response.status_code == 204
+
+    response = await client.get("/api/v1/users/me", headers=headers)
+    assert response.status_code == 401
+    response = await client.post(
+        "/api/v1/auth/refresh", json={"refresh_token": test_refresh_token}
+    )
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_revoke_own_token(client: httpx.AsyncClient, test_user):
+    from app.core.security import create_access_token
+
+    leaked = create_access_token(data={"sub": str(test_user.id)})
+    current = create_access_token(data={"sub": str(test_user.id)})
+
+    response = await client.post(
+        "/api/v1/auth/revoke",
+        json={"token": leaked},
+        headers={"Authorization": f"Bearer {current}"},
+    )
+    assert response.status_code == 204
+
+    leaked_response = await client.get(
+        "/api/v1/users/me", headers={"Authorization": f"Bearer {leaked}"}
+    )
+    current_response = await client.get(
+        "/api/v1/users/me", headers={"Authorization": f"Bearer {current}"}
+    )
+    assert leaked_response.status_code == 401
+    assert current_response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_cannot_revoke_other_users_token(
+    client: httpx.AsyncClient, test_access_token, test_admin_access_token
+):
+    response = await client.post(
+        "/api/v1/auth/revoke",
+        json={"token": test_admin_access_token},
+        headers={"Authorization": f"Bearer {test_access_token}"},
+    )
+    assert response.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_unrevoked_tokens_skip_the_database(
+    client: httpx.AsyncClient, test_access_token
+):
+    from app.services.revocation_service import revocation_list
+
+    await client.get(
+        "/api/v1/users/me", headers={"Authorization": f"Bearer {test_access_token}"}
+    )
+
+    stats = revocation_list.stats()
+    assert stats["checks"] == 1
+    assert stats["filter_hits"] == 0
@@ -17,3 +17,76 @@ async def test_forbidden_access(client: httpx.AsyncClient, test_access_token):
         "/api/v1/users/", headers={"Authorization": f"Bearer {test_access_token}"}
     )
     assert response.status_code == 403
+
+
+async def _login(client: httpx.AsyncClient, email: str) -> str:
+    response = await client.post(
+        "/api/v1/auth/login",
+        data={"username": email, "password": "testpass"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    return response.json()["access_token"]
+
+
+@pytest.mark.asyncio
+async def test_claims_token_authorizes_admin_without_loading_user(
+    client: httpx.AsyncClient, test_admin_user, monkeypatch
+):
+    from jose import jwt
+
+    from app.core.cache import principal_cache
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "ACCESS_TOKEN_EMBED_CLAIMS", True)
+    token = await _login(client, "admin@example.com")
+    claims = jwt.get_unverified_claims(token)
+    assert claims["roles"] == ["admin"]
+    assert claims["ver"] == 0
+
+    response = await client.get(
+        "/api/v1/metrics/", headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == 200
+    assert principal_cache.stats()["misses"] == 0
+
+
+@pytest.mark.asyncio
+async def test_claims_token_rejected_after_role_change(
+    client: httpx.AsyncClient, test_user, test_admin_access_token, monkeypatch
+):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "ACCESS_TOKEN_EMBED_CLAIMS", True)
+    token = await _login(client, "testuser@example.com")
+    headers = {"Authorization": f"Bearer {token}"}
+    assert (await client.get("/api/v1/tasks/", headers=headers)).status_code == 200
+
+    response = await client.put(
+        f"/api/v1/users/{test_user.id}",
+        json={"role_names": ["admin"]},
+        headers={"Authorization": f"Bearer {test_admin_access_token}"},
+    )
+    assert response.status_code == 200
+
+    assert (await client.get("/api/v1/tasks/", headers=headers)).status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_claims_token_rejected_after_deactivation(
+    client: httpx.AsyncClient, test_user, test_admin_access_token, monkeypatch
+):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "ACCESS_TOKEN_EMBED_CLAIMS", True)
+    token = await _login(client, "testuser@example.com")
+
+    await client.put(
+        f"/api/v1/users/{test_user.id}",
+        json={"is_active": False},
+        headers={"Authorization": f"Bearer {test_admin_access_token}"},
+    )
+
+    response = await client.get(
+        "/api/v1/tasks/", headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == 401
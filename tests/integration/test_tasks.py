@@ -1,9 +1,32 @@
+import asyncio
+import csv
+import io
+import json
+import re
+import time
+from datetime import datetime, timedelta, timezone
 from uuid import uuid4
 
 import httpx
 import pytest
+from sqlalchemy import select, text, update
 
+from app.core.cache import invalidate_user
+from app.core.config import settings
+from app.core.database import get_session_factory
+from app.core.events import task_events
+from app.core.pagination import encode_cursor
+from app.core.response_cache import task_list_cache
+from app.core.security import create_access_token, decode_access_token
+from app.main import app
 from app.models.task import Task
+from app.models.task_tombstone import TaskTombstone
+from app.models.user import User
+from app.services import task_service
+from app.services.archive_service import task_archiver
+from app.services.revocation_service import revoke_token
+from app.services.task_service import compact_task_tombstones
+from tests.conftest import AsyncSessionLocal
 
 
 class TestTasksAPI:
@@ -87,6 +110,590 @@ class TestTasksAPI:
         assert len(data["items"]) == 5
         assert data["meta"]["size"] == 5
 
+    async def test_get_user_tasks_cursor_pagination(
+        self, client: httpx.AsyncClient, test_access_token
+    ):
+        headers = {"Authorization": f"Bearer {test_access_token}"}
+
+        for i in range(15):
+            task_data = {"title": f"Task {i+1}", "description": f"Description {i+1}"}
+            await client.post("/api/v1/tasks/", json=task_data, headers=headers)
+
+        response = await client.get("/api/v1/tasks/?size=10", headers=headers)
+        data = response.json()
+        first_ids = [task["id"] for task in data["items"]]
+        next_cursor = data["meta"]["next_cursor"]
+        assert next_cursor is not None
+
+        # A task created between pages must not shift the second page
+        await client.post("/api/v1/tasks/", json={"title": "Late"}, headers=headers)
+
+        response = await client.get(
+            f"/api/v1/tasks/?size=10&cursor={next_cursor}", headers=headers
+        )
+        assert response.status_code == 200
+        data = response.json()
+        second_ids = [task["id"] for task in data["items"]]
+        assert len(second_ids) == 5
+        assert not set(first_ids) & set(second_ids)
+        assert data["meta"]["page"] is None
+        assert data["meta"]["next_cursor"] is None
+        assert data["meta"]["total"] == 16
+
+    async def test_get_user_tasks_invalid_cursor(
+        self, client: httpx.AsyncClient, test_access_token
+    ):
+        headers = {"Authorization": f"Bearer {test_access_token}"}
+
+        response = await client.get("/api/v1/tasks/?cursor=%%%", headers=headers)
+
+        assert response.status_code == 400
+
+    async def test_bulk_create_tasks(
+        self, client: httpx.AsyncClient, test_access_token
+    ):
+        headers = {"Authorization": f"Bearer {test_access_token}"}
+        items = [{"title": f"Bulk {i}"} for i in range(5)]
+
+        response = await client.post(
+            "/api/v1/tasks/bulk", json={"items": items}, headers=headers
+        )
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [result["status"] for result in results] == [201] * 5
+        assert [result["task"]["title"] for result in results] == [
+            f"Bulk {i}" for i in range(5)
+        ]
+        response = await client.get("/api/v1/tasks/", headers=headers)
+        assert response.json()["meta"]["total"] == 5
+
+    async def test_bulk_update_tasks_reports_each_item(
+        self, client: httpx.AsyncClient, test_access_token
+    ):
+        headers = {"Authorization": f"Bearer {test_access_token}"}
+        response = await client.post(
+            "/api/v1/tasks/bulk",
+            json={"items": [{"title": "A"}, {"title": "B"}, {"title": "C"}]},
+            headers=headers,
+        )
+        a, b, c = [result["id"] for result in response.json()["results"]]
+        missing = str(uuid4())
+
+        response = await client.patch(
+            "/api/v1/tasks/bulk",
+            json={
+                "items": [
+                    {"id": a, "is_completed": True},
+                    {"id": missing, "is_completed": True},
+                    {"id": b, "is_completed": True},
+                    {"id": c, "title": "C2"},
+                ]
+            },
+            headers=headers,
+        )
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [result["status"] for result in results] == [200, 404, 200, 200]
+        assert results[0]["task"]["is_completed"] is True
+        assert results[1]["detail"] == "Task not found"
+        assert results[3]["task"]["title"] == "C2"
+        assert results[3]["task"]["is_completed"] is False
+
+    async def test_bulk_rejects_over_long_titles_per_item(
+        self, client: httpx.AsyncClient, test_access_token
+    ):
+        headers = {"Authorization": f"Bearer {test_access_token}"}
+        too_long = "x" * 201
+
+        response = await client.post(
+            "/api/v1/tasks/bulk",
+            json={"items": [{"title": "A"}, {"title": too_long}, {"title": "B"}]},
+            headers=headers,
+        )
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [result["status"] for result in results] == [201, 422, 201]
+        assert results[1]["detail"] == (
+            "title: String should have at most 200 characters"
+        )
+        a, b = results[0]["id"], results[2]["id"]
+
+        response = await client.patch(
+            "/api/v1/tasks/bulk",
+            json={"items": [{"id": a, "title": too_long}, {"id": b, "title": "B2"}]},
+            headers=headers,
+        )
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [result["status"] for result in results] == [422, 200]
+        assert results[0]["id"] == a
+        assert results[1]["task"]["title"] == "B2"
+        response = await client.get(f"/api/v1/tasks/{a}", headers=headers)
+        assert response.json()["title"] == "A"
+        response = await client.get("/api/v1/tasks/", headers=headers)
+        assert response.json()["meta"]["total"] == 2
+
+    async def test_bulk_update_leaves_items_without_changes_untouched(
+        self, client: httpx.AsyncClient, test_access_token
+    ):
+        headers = {"Authorization": f"Bearer {test_access_token}"}
+        created = await client.post(
+            "/api/v1/tasks/", json={"title": "A"}, headers=headers
+        )
+        task_id = created.json()["id"]
+        missing = str(uuid4())
+
+        response = await client.patch(
+            "/api/v1/tasks/bulk",
+            json={"items": [{"id": task_id}, {"id": missing}]},
+            headers=headers,
+        )
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [result["status"] for result in results] == [200, 404]
+        assert results[0]["task"] == created.json()
+        response = await client.get(f"/api/v1/tasks/{task_id}", headers=headers)
+        assert response.headers["etag"] == created.headers["etag"]
+
+    async def test_bulk_update_rejects_duplicate_ids(
+        self, client: httpx.AsyncClient, test_access_token
+    ):
+        headers = {"Authorization": f"Bearer {test_access_token}"}
+        task_id = str(uuid4())
+
+        response = await client.patch(
+            "/api/v1/tasks/bulk",
+            json={"items": [{"id": task_id}, {"id": task_id}]},
+            headers=headers,
+        )
+
+        assert response.status_code == 422
+
+    async def test_bulk_delete_tasks(
+        self, client: httpx.AsyncClient, test_access_token
+    ):
+        headers = {"Authorization": f"Bearer {test_access_token}"}
+        response = await client.post(
+            "/api/v1/tasks/bulk",
+            json={"items": [{"title": "A"}, {"title": "B"}]},
+            headers=headers,
+        )
+        a, b = [result["id"] for result in response.json()["results"]]
+        missing = str(uuid4())
+
+        response = await client.post(
+            "/api/v1/tasks/bulk/delete", json={"ids": [a, missing]}, headers=headers
+        )
+
+        assert [result["status"] for result in response.json()["results"]] == [
+            204,
+            404,
+        ]
+        response = await client.get("/api/v1/tasks/", headers=headers)
+        assert [task["id"] for task in response.json()["items"]] == [b]
+        assert response.json()["meta"]["total"] == 1
+
+    async def test_bulk_create_enforces_item_limit(
+        self, client: httpx.AsyncClient, test_access_token, monkeypatch
+    ):
+        from app.core.config import settings
+
+        monkeypatch.setattr(settings, "TASK_BULK_MAX_ITEMS", 2)
+        headers = {"Authorization": f"Bearer {test_access_token}"}
+
+        response = await client.post(
+            "/api/v1/tasks/bulk",
+            json={"items": [{"title": "A"}, {"title": "B"}, {"title": "C"}]},
+            headers=headers,
+        )
+
+        assert response.status_code == 422
+
+    async def test_get_tasks_by_ids(
+        self, client: httpx.AsyncClient, test_access_token, test_admin_access_token
+    ):
+        headers = {"Authorization": f"Bearer {test_access_token}"}
+        admin_headers = {"Authorization": f"Bearer {test_admin_access_token}"}
+        response = await client.post(
+            "/api/v1/tasks/bulk",
+            json={"items": [{"title": "A"}, {"title": "B"}, {"title": "C"}]},
+            headers=headers,
+        )
+        a, b, c = [result["id"] for result in response.json()["results"]]
+        response = await client.post(
+            "/api/v1/tasks/", json={"title": "Not yours"}, headers=admin_headers
+        )
+        other = response.json()["id"]
+
+        response = await client.get(
+            f"/api/v1/tasks/?ids={c}&ids={other}&ids={a}", headers=headers
+        )
+
+        assert response.status_code == 200
+        assert [task["id"] for task in response.json()["items"]] == [c, a]
+
+    async def test_get_user_tasks_filters(
+        self, client: httpx.AsyncClient, test_access_token
+    ):
+        headers = {"Authorization": f"Bearer {test_access_token}"}
+        response = await client.post(
+            "/api/v1/tasks/bulk",
+            json={
+                "items": [
+                    {"title": "alpha"},
+                    {"title": "alpine"},
+                    {"title": "beta"},
+                    {"title": "Alps"},
+                ]
+            },
+            headers=headers,
+        )
+        ids = {r["task"]["title"]: r["id"] for r in response.json()["results"]}
+        await client.patch(f"/api/v1/tasks/{ids['beta']}/complete", headers=headers)
+
+        response = await client.get("/api/v1/tasks/?is_completed=true", headers=headers)
+        data = response.json()
+        assert [task["title"] for task in data["items"]] == ["beta"]
+        assert data["meta"]["total"] == 1
+
+        response = await client.get(
+            "/api/v1/tasks/?is_completed=false&sort=title&order=asc", headers=headers
+        )
+        assert [task["title"] for task in response.json()["items"]] == [
+            "Alps",
+            "alpha",
+            "alpine",
+        ]
+
+        # Prefix matching is case-sensitive
+        response = await client.get(
+            "/api/v1/tasks/?title_prefix=alp&sort=title&order=asc", headers=headers
+        )
+        data = response.json()
+        assert [task["title"] for task in data["items"]] == ["alpha", "alpine"]
+        assert data["meta"]["total"] == 2
+
+        # The completed task was modified last
+        response = await client.get("/api/v1/tasks/?sort=updated_at", headers=headers)
+        assert response.json()["items"][0]["title"] == "beta"
+
+        response = await client.get(
+            "/api/v1/tasks/",
+            params={"created_after": "2000-01-01T00:00:00Z"},
+            headers=headers,
+        )
+        assert response.json()["meta"]["total"] == 4
+        response = await client.get(
+            "/api/v1/tasks/",
+            params={"created_before": "2000-01-01T00:00:00Z"},
+            headers=headers,
+        )
+        assert response.json()["items"] == []
+
+    async def test_get_user_tasks_sorted_cursor_walk(
+        self, client: httpx.AsyncClient, test_access_token
+    ):
+        headers = {"Authorization": f"Bearer {test_access_token}"}
+        titles = [f"Task {i:02d}" for i in range(9)]
+        await client.post(
+            "/api/v1/tasks/bulk",
+            json={"items": [{"title": title} for title in reversed(titles)]},
+            headers=headers,
+        )
+
+        seen = []
+        params = {"sort": "title", "order": "asc", "size": 4}
+        while True:
+            response = await client.get(
+                "/api/v1/tasks/", params=params, headers=headers
+            )
+            data = response.json()
+            seen.extend(task["title"] for task in data["items"])
+            if data["meta"]["next_cursor"] is None:
+                break
+            params["cursor"] = data["meta"]["next_cursor"]
+
+        assert seen == titles
+
+        # A cursor only makes sense for the sort it was issued for
+        response = await client.get(
+            "/api/v1/tasks/", params={"cursor": params["cursor"]}, headers=headers
+        )
+        assert response.status_code == 400
+
+    async def test_get_user_tasks_rejects_unknown_sort(
+        self, client: httpx.AsyncClient, test_access_token
+    ):
+        headers = {"Authorization": f"Bearer {test_access_token}"}
+
+        response = await client.get("/api/v1/tasks/?sort=password", headers=headers)
+
+        assert response.status_code == 422
+
+    async def test_search_tasks_ranks_title_matches_first(
+        self, client: httpx.AsyncClient, test_access_token, test_admin_access_token
+    ):
+        headers = {"Authorization": f"Bearer {test_access_token}"}
+        await client.post(
+            "/api/v1/tasks/bulk",
+            json={
+                "items": [
+                    {"title": "Buy groceries", "description": "milk and invoices"},
+                    {"title": "Pay the invoice", "description": "before Friday"},
+                    {"title": "Walk the dog", "description": None},
+                ]
+            },
+            headers=headers,
+        )
+        # Other users' tasks never match
+        await client.post(
+            "/api/v1/tasks/",
+            json={"title": "Invoice for admin"},
+            headers={"Authorization": f"Bearer {test_admin_access_token}"},
+        )
+
+        response = await client.get("/api/v1/tasks/search?q=invoice", headers=headers)
+
+        assert response.status_code == 200
+        data = response.json()
+        # Stemming matches "invoices"; the title hit ranks first
+        assert [task["title"] for task in data["items"]] == [
+            "Pay the invoice",
+            "Buy groceries",
+        ]
+        assert data["meta"]["total"] == 2
+
+    async def test_search_tasks_follows_updates_and_deletes(
+        self, client: httpx.AsyncClient, test_access_token
+    ):
+        headers = {"Authorization": f"Bearer {test_access_token}"}
+        response = await client.post(
+            "/api/v1/tasks/", json={"title": "Draft report"}, headers=headers
+        )
+        task_id = response.json()["id"]
+
+        await client.put(
+            f"/api/v1/tasks/{task_id}", json={"title": "Final memo"}, headers=headers
+        )
+        response = await client.get("/api/v1/tasks/search?q=report", headers=headers)
+        assert response.json()["items"] == []
+        response = await client.get("/api/v1/tasks/search?q=memo", headers=headers)
+        assert [task["id"] for task in response.json()["items"]] == [task_id]
+
+        await client.delete(f"/api/v1/tasks/{task_id}", headers=headers)
+        response = await client.get("/api/v1/tasks/search?q=memo", headers=headers)
+        assert response.json()["items"] == []
+
+    async def test_search_tasks_survives_rowid_renumbering(
+        self, client: httpx.AsyncClient, db, test_access_token
+    ):
+        headers = {"Authorization": f"Bearer {test_access_token}"}
+        ids = []
+        for title in ("Alpha", "Bravo", "Charlie"):
+            response = await client.post(
+                "/api/v1/tasks/", json={"title": title}, headers=headers
+            )
+            ids.append(response.json()["id"])
+        # What VACUUM may do to a table without an INTEGER PRIMARY KEY
+        await db.execute(text("UPDATE tasks SET rowid = rowid + 100"))
+        await db.execute(text("UPDATE tasks SET rowid = (rowid - 100) % 3 + 1"))
+        await db.commit()
+
+        for title, task_id in zip(("Alpha", "Bravo", "Charlie"), ids):
+            response = await client.get(
+                f"/api/v1/tasks/search?q={title}", headers=headers
+            )
+            assert [task["id"] for task in response.json()["items"]] == [task_id]
+
+    async def test_search_tasks_cursor_walk(
+        self, client: httpx.AsyncClient, test_access_token
+    ):
+        headers = {"Authorization": f"Bearer {test_access_token}"}
+        await client.post(
+            "/api/v1/tasks/bulk",
+            json={"items": [{"title": f"Meeting {i}"} for i in range(7)]},
+            headers=headers,
+        )
+
+        seen = []
+        params = {"q": "meeting", "size": 3}
+        while True:
+            response = await client.get(
+                "/api/v1/tasks/search", params=params, headers=headers
+            )
+            data = response.json()
+            seen.extend(task["id"] for task in data["items"])
+            if data["meta"]["next_cursor"] is None:
+                break
+            params["cursor"] = data["meta"]["next_cursor"]
+
+        assert len(seen) == 7
+        assert len(set(seen)) == 7
+
+    @pytest.mark.parametrize("query", ['"unbalanced', "NEAR(a b)", "*", "a OR"])
+    async def test_search_tasks_treats_query_as_plain_text(
+        self, client: httpx.AsyncClient, test_access_token, query
+    ):
+        headers = {"Authorization": f"Bearer {test_access_token}"}
+
+        response = await client.get(
+            "/api/v1/tasks/search", params={"q": query}, headers=headers
+        )
+
+        assert response.status_code == 200
+        assert response.json()["items"] == []
+
+    async def test_export_tasks_ndjson(
+        self, client: httpx.AsyncClient, test_access_token, test_admin_access_token
+    ):
+        headers = {"Authorization": f"Bearer {test_access_token}"}
+        await client.post(
+            "/api/v1/tasks/bulk",
+            json={"items": [{"title": "First"}, {"title": "Second"}]},
+            headers=headers,
+        )
+        await client.post(
+            "/api/v1/tasks/",
+            json={"title": "Not exported"},
+            headers={"Authorization": f"Bearer {test_admin_access_token}"},
+        )
+
+        response = await client.get("/api/v1/tasks/export", headers=headers)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [line["title"] for line in lines] == ["First", "Second"]
+        assert set(lines[0]) == {
+            "id",
+            "title",
+            "description",
+            "is_completed",
+            "created_at",
+            "updated_at",
+        }
+
+    async def test_export_streams_from_a_session_of_its_own(
+        self, client: httpx.AsyncClient, test_access_token, monkeypatch
+    ):
+        headers = {"Authorization": f"Bearer {test_access_token}"}
+        titles = [f"Task {i}" for i in range(5)]
+        await client.post(
+            "/api/v1/tasks/bulk",
+            json={"items": [{"title": title} for title in titles]},
+            headers=headers,
+        )
+        # Several batches, so the body keeps reading after the first chunk
+        monkeypatch.setattr(task_service, "EXPORT_BATCH_SIZE", 2)
+        opened, closed = [], []
+
+        def session_factory():
+            session = AsyncSessionLocal()
+            close = session.close
+
+            async def record_close():
+                closed.append(session)
+                await close()
+
+            session.close = record_close
+            opened.append(session)
+            return session
+
+        app.dependency_overrides[get_session_factory] = lambda: session_factory
+
+        async with client.stream(
+            "GET", "/api/v1/tasks/export", headers=headers
+        ) as response:
+            assert response.status_code == 200
+            lines = [json.loads(line) async for line in response.aiter_lines()]
+
+        assert [line["title"] for line in lines] == titles
+        # Opened and closed by the body itself, around the whole stream
+        assert len(opened) == 1 and closed == opened
+
+    async def test_export_tasks_csv(self, client: httpx.AsyncClient, test_access_token):
+        headers = {"Authorization": f"Bearer {test_access_token}"}
+        await client.post(
+            "/api/v1/tasks/",
+            json={"title": 'Quote, "comma"', "description": "two\nlines"},
+            headers=headers,
+        )
+
+        response = await client.get("/api/v1/tasks/export?format=csv", headers=headers)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert len(rows) == 1
+        assert rows[0]["title"] == 'Quote, "comma"'
+        assert rows[0]["description"] == "two\nlines"
+        assert rows[0]["is_completed"] == "False"
+
+    async def test_import_tasks_ndjson_reports_bad_rows(
+        self, client: httpx.AsyncClient, test_access_token
+    ):
+        headers = {"Authorization": f"Bearer {test_access_token}"}
+        body = "\n".join(
+            [
+                json.dumps({"title": "First", "description": "Imported"}),
+                "{not json",
+                json.dumps({"description": "No title"}),
+                "",
+                json.dumps({"title": "x" * 201}),
+                json.dumps({"title": "Second"}),
+            ]
+        )
+
+        response = await client.post(
+            "/api/v1/tasks/import", content=body.encode(), headers=headers
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["imported"] == 2
+        assert data["failed"] == 3
+        assert [error["line"] for error in data["errors"]] == [2, 3, 5]
+        assert data["errors"][1]["detail"] == "title: Field required"
+        assert data["rows_per_second"] > 0
+        listing = await client.get("/api/v1/tasks/", headers=headers)
+        assert listing.json()["meta"]["total"] == 2
+        assert {task["title"] for task in listing.json()["items"]} == {
+            "First",
+            "Second",
+        }
+
+    async def test_import_tasks_csv_round_trips_export(
+        self, client: httpx.AsyncClient, test_access_token, test_admin_access_token
+    ):
+        headers = {"Authorization": f"Bearer {test_access_token}"}
+        await client.post(
+            "/api/v1/tasks/",
+            json={"title": 'Quote, "comma"', "description": "two\nlines"},
+            headers=headers,
+        )
+        await client.post("/api/v1/tasks/", json={"title": "Plain"}, headers=headers)
+        exported = await client.get("/api/v1/tasks/export?format=csv", headers=headers)
+
+        admin_headers = {"Authorization": f"Bearer {test_admin_access_token}"}
+        response = await client.post(
+            "/api/v1/tasks/import?format=csv",
+            content=exported.content,
+            headers=admin_headers,
+        )
+
+        assert response.status_code == 200
+        assert response.json()["imported"] == 2
+        assert response.json()["failed"] == 0
+        listing = await client.get("/api/v1/tasks/", headers=admin_headers)
+        imported = {task["title"]: task for task in listing.json()["items"]}
+        assert imported['Quote, "comma"']["description"] == "two\nlines"
+        assert imported["Plain"]["description"] is None
+
     async def test_get_user_tasks_unauthorized(self, client: httpx.AsyncClient):
         response = await client.get("/api/v1/tasks/")
         assert response.status_code == 401
@@ -298,3 +905,750 @@ class TestTasksAPI:
         admin_tasks = admin_tasks_response.json()
         assert len(admin_tasks["items"]) == 1
         assert admin_tasks["items"][0]["title"] == "Admin Task"
+
+
+class TestTaskWriteStatements:
+    """Each single-task write is one ownership-scoped statement on tasks."""
+
+    @staticmethod
+    def _split(statements):
+        on_tasks = [sql for sql in statements if re.search(r"\btasks\b", sql)]
+        return on_tasks, [sql for sql in statements if sql not in on_tasks]
+
+    async def _create(self, client, headers):
+        response = await client.post(
+            "/api/v1/tasks/", json={"title": "Task"}, headers=headers
+        )
+        # Also warms the principal cache so auth adds no queries below
+        return response.json()["id"]
+
+    async def test_update_is_one_statement(
+        self, client: httpx.AsyncClient, test_access_token, sql_statements
+    ):
+        headers = {"Authorization": f"Bearer {test_access_token}"}
+        task_id = await self._create(client, headers)
+        sql_statements.clear()
+
+        response = await client.put(
+            f"/api/v1/tasks/{task_id}", json={"title": "Renamed"}, headers=headers
+        )
+
+        assert response.status_code == 200
+        assert response.json()["title"] == "Renamed"
+        on_tasks, others = self._split(sql_statements)
+        assert len(on_tasks) == 1
+        assert on_tasks[0].startswith("UPDATE tasks")
+        assert "RETURNING" in on_tasks[0]
+        # The only other write takes the user's next change sequence number
+        assert len(others) == 1 and others[0].startswith("UPDATE task_counters")
+
+    @pytest.mark.parametrize("action", ["complete", "incomplete"])
+    async def test_toggle_is_one_task_statement(
+        self, client: httpx.AsyncClient, test_access_token, sql_statements, action
+    ):
+        headers = {"Authorization": f"Bearer {test_access_token}"}
+        task_id = await self._create(client, headers)
+        if action == "incomplete":
+            await client.patch(f"/api/v1/tasks/{task_id}/complete", headers=headers)
+        sql_statements.clear()
+
+        response = await client.patch(
+            f"/api/v1/tasks/{task_id}/{action}", headers=headers
+        )
+
+        assert response.status_code == 200
+        on_tasks, others = self._split(sql_statements)
+        assert len(on_tasks) == 1
+        # The change sequence and task counter in one statement, then the rollups
+        assert [sql.split(" ", 3)[:3] for sql in others] == [
+            ["UPDATE", "task_counters", "SET"],
+            ["INSERT", "INTO", "task_system_counters"],
+            ["INSERT", "INTO", "task_daily_stats"],
+            ["INSERT", "INTO", "task_system_daily_stats"],
+        ]
+
+    @pytest.mark.parametrize("completed", [False, True])
+    async def test_delete_is_one_task_statement(
+        self, client: httpx.AsyncClient, test_access_token, sql_statements, completed
+    ):
+        headers = {"Authorization": f"Bearer {test_access_token}"}
+        task_id = await self._create(client, headers)
+        if completed:
+            await client.patch(f"/api/v1/tasks/{task_id}/complete", headers=headers)
+        sql_statements.clear()
+
+        response = await client.delete(f"/api/v1/tasks/{task_id}", headers=headers)
+
+        assert response.status_code == 204
+        on_tasks, others = self._split(sql_statements)
+        assert len(on_tasks) == 1
+        assert on_tasks[0].startswith("DELETE FROM tasks")
+        # Only the deleted row tells whether the completed count moves too
+        counter = [
+            ["UPDATE", "task_counters", "SET"],
+            ["INSERT", "INTO", "task_system_counters"],
+        ]
+        assert [sql.split(" ", 3)[:3] for sql in others] == counter + [
+            ["INSERT", "INTO", "task_tombstones"]
+        ] + (counter if completed else [])
+
+    @pytest.mark.parametrize(
+        "method, path",
+        [
+            ("PUT", "/api/v1/tasks/{}"),
+            ("DELETE", "/api/v1/tasks/{}"),
+            ("PATCH", "/api/v1/tasks/{}/complete"),
+        ],
+    )
+    async def test_other_users_task_is_404_in_one_statement(
+        self,
+        client: httpx.AsyncClient,
+        test_access_token,
+        test_admin_access_token,
+        sql_statements,
+        method,
+        path,
+    ):
+        admin_headers = {"Authorization": f"Bearer {test_admin_access_token}"}
+        headers = {"Authorization": f"Bearer {test_access_token}"}
+        task_id = await self._create(client, admin_headers)
+        # The user's own task also gives them a counter row
+        await self._create(client, headers)
+        sql_statements.clear()
+
+        response = await client.request(
+            method, path.format(task_id), json={"title": "x"}, headers=headers
+        )
+
+        assert response.status_code == 404
+        on_tasks, others = self._split(sql_statements)
+        assert len(on_tasks) == (2 if method == "PATCH" else 1)
+        # The change sequence number and expected counter deltas taken up
+        # front, rolled back with the rest
+        assert others[0].startswith("UPDATE task_counters")
+        assert len(others) == {"PUT": 1, "DELETE": 2, "PATCH": 4}[method]
+
+
+class TestConditionalRequests:
+    """ETags on tasks and task lists, If-None-Match and If-Match."""
+
+    async def _create(self, client, headers, title="Task"):
+        response = await client.post(
+            "/api/v1/tasks/", json={"title": title}, headers=headers
+        )
+        return response.json()["id"], response.headers["etag"]
+
+    async def test_get_task_not_modified_until_it_changes(
+        self, client: httpx.AsyncClient, test_access_token
+    ):
+        headers = {"Authorization": f"Bearer {test_access_token}"}
+        task_id, created_etag = await self._create(client, headers)
+
+        response = await client.get(f"/api/v1/tasks/{task_id}", headers=headers)
+        etag = response.headers["etag"]
+        assert etag == created_etag and etag.startswith('W/"')
+
+        response = await client.get(
+            f"/api/v1/tasks/{task_id}", headers={**headers, "If-None-Match": etag}
+        )
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+        updated = await client.patch(
+            f"/api/v1/tasks/{task_id}/complete", headers=headers
+        )
+        assert updated.headers["etag"] != etag
+        response = await client.get(
+            f"/api/v1/tasks/{task_id}", headers={**headers, "If-None-Match": etag}
+        )
+        assert response.status_code == 200
+        assert response.headers["etag"] == updated.headers["etag"]
+
+    async def test_update_with_if_match(
+        self, client: httpx.AsyncClient, test_access_token, sql_statements
+    ):
+        headers = {"Authorization": f"Bearer {test_access_token}"}
+        task_id, etag = await self._create(client, headers)
+        sql_statements.clear()
+
+        response = await client.put(
+            f"/api/v1/tasks/{task_id}",
+            json={"title": "First writer"},
+            headers={**headers, "If-Match": etag},
+        )
+        assert response.status_code == 200
+        # The precondition rides on the UPDATE itself; the other statement
+        # takes the change sequence number
+        assert len(sql_statements) == 2
+        assert sql_statements[1].startswith("UPDATE tasks")
+        new_etag = response.headers["etag"]
+
+        response = await client.put(
+            f"/api/v1/tasks/{task_id}",
+            json={"title": "Lost update"},
+            headers={**headers, "If-Match": etag},
+        )
+        assert response.status_code == 412
+        current = await client.get(f"/api/v1/tasks/{task_id}", headers=headers)
+        assert current.json()["title"] == "First writer"
+        assert current.headers["etag"] == new_etag
+
+        response = await client.put(
+            f"/api/v1/tasks/{task_id}",
+            json={"title": "Any version"},
+            headers={**headers, "If-Match": "*"},
+        )
+        assert response.status_code == 200
+
+        response = await client.put(
+            f"/api/v1/tasks/{uuid4()}",
+            json={"title": "Missing"},
+            headers={**headers, "If-Match": etag},
+        )
+        assert response.status_code == 404
+
+    async def test_list_not_modified_skips_the_page_query(
+        self, client: httpx.AsyncClient, test_access_token, sql_statements, monkeypatch
+    ):
+        # Without the response cache, which would answer with no query at all
+        monkeypatch.setattr(task_list_cache, "enabled", False)
+        headers = {"Authorization": f"Bearer {test_access_token}"}
+        first_id, _ = await self._create(client, headers, "First")
+        await self._create(client, headers, "Second")
+
+        response = await client.get("/api/v1/tasks/?size=5", headers=headers)
+        etag = response.headers["etag"]
+        sql_statements.clear()
+
+        response = await client.get(
+            "/api/v1/tasks/?size=5", headers={**headers, "If-None-Match": etag}
+        )
+        assert response.status_code == 304
+        assert len(sql_statements) == 1
+
+        other_page = await client.get("/api/v1/tasks/?size=1", headers=headers)
+        assert other_page.headers["etag"] != etag
+
+        seen = {etag}
+        for change in (
+            lambda: client.patch(f"/api/v1/tasks/{first_id}/complete", headers=headers),
+            lambda: client.put(
+                f"/api/v1/tasks/{first_id}", json={"title": "Renamed"}, headers=headers
+            ),
+            lambda: self._create(client, headers, "Third"),
+            lambda: client.delete(f"/api/v1/tasks/{first_id}", headers=headers),
+        ):
+            await change()
+            response = await client.get(
+                "/api/v1/tasks/?size=5", headers={**headers, "If-None-Match": etag}
+            )
+            assert response.status_code == 200
+            etag = response.headers["etag"]
+            assert etag not in seen
+            seen.add(etag)
+
+
+class TestTaskListCache:
+    """GET /tasks/ pages are served from the cache until a task write."""
+
+    @pytest.fixture(autouse=True)
+    def enable_cache(self, monkeypatch):
+        monkeypatch.setattr(task_list_cache, "enabled", True)
+
+    async def test_repeat_read_runs_no_queries(
+        self, client: httpx.AsyncClient, test_access_token, sql_statements
+    ):
+        headers = {"Authorization": f"Bearer {test_access_token}"}
+        await client.post("/api/v1/tasks/", json={"title": "Cached"}, headers=headers)
+        first = await client.get("/api/v1/tasks/?size=5", headers=headers)
+        sql_statements.clear()
+
+        second = await client.get("/api/v1/tasks/?size=5", headers=headers)
+
+        assert second.status_code == 200
+        assert second.json() == first.json()
+        assert second.headers["etag"] == first.headers["etag"]
+        assert sql_statements == []
+        assert task_list_cache.stats()["hits"] == 1
+
+    @pytest.mark.parametrize(
+        "write",
+        [
+            lambda client, headers, task_id: client.post(
+                "/api/v1/tasks/", json={"title": "New"}, headers=headers
+            ),
+            lambda client, headers, task_id: client.put(
+                f"/api/v1/tasks/{task_id}", json={"title": "Renamed"}, headers=headers
+            ),
+            lambda client, headers, task_id: client.patch(
+                f"/api/v1/tasks/{task_id}/complete", headers=headers
+            ),
+            lambda client, headers, task_id: client.delete(
+                f"/api/v1/tasks/{task_id}", headers=headers
+            ),
+            lambda client, headers, task_id: client.post(
+                "/api/v1/tasks/bulk", json={"items": [{"title": "B"}]}, headers=headers
+            ),
+            lambda client, headers, task_id: client.patch(
+                "/api/v1/tasks/bulk",
+                json={"items": [{"id": task_id, "title": "Bulk renamed"}]},
+                headers=headers,
+            ),
+            lambda client, headers, task_id: client.post(
+                "/api/v1/tasks/bulk/delete", json={"ids": [task_id]}, headers=headers
+            ),
+            lambda client, headers, task_id: client.post(
+                "/api/v1/tasks/import",
+                content=json.dumps({"title": "Imported"}).encode(),
+                headers=headers,
+            ),
+        ],
+        ids=[
+            "create",
+            "update",
+            "complete",
+            "delete",
+            "bulk-create",
+            "bulk-update",
+            "bulk-delete",
+            "import",
+        ],
+    )
+    async def test_every_task_write_invalidates(
+        self, client: httpx.AsyncClient, test_access_token, write
+    ):
+        headers = {"Authorization": f"Bearer {test_access_token}"}
+        created = await client.post(
+            "/api/v1/tasks/", json={"title": "Original"}, headers=headers
+        )
+        before = await client.get("/api/v1/tasks/", headers=headers)
+
+        response = await write(client, headers, created.json()["id"])
+        assert response.status_code < 300
+        after = await client.get("/api/v1/tasks/", headers=headers)
+
+        assert after.json() != before.json()
+        assert after.headers["etag"] != before.headers["etag"]
+
+    async def test_other_users_writes_keep_the_page(
+        self, client: httpx.AsyncClient, test_access_token, test_admin_access_token
+    ):
+        headers = {"Authorization": f"Bearer {test_access_token}"}
+        admin_headers = {"Authorization": f"Bearer {test_admin_access_token}"}
+        await client.get("/api/v1/tasks/", headers=headers)
+
+        await client.post(
+            "/api/v1/tasks/", json={"title": "Admin's"}, headers=admin_headers
+        )
+        await client.get("/api/v1/tasks/", headers=headers)
+
+        assert task_list_cache.stats()["hits"] == 1
+        metrics = await client.get("/api/v1/metrics/", headers=admin_headers)
+        assert metrics.json()["task_list_cache"]["hit_ratio"] == 0.5
+
+
+class TestTaskStream:
+    """GET /tasks/stream pushes the caller's task changes as Server-Sent Events."""
+
+    @staticmethod
+    def _events(body: str):
+        events = []
+        for block in body.split("\n\n"):
+            fields = dict(
+                line.split(": ", 1) for line in block.splitlines() if ": " in line
+            )
+            if "event" in fields:
+                events.append((fields["event"], json.loads(fields["data"])))
+        return events
+
+    async def _open_stream(self, client, headers):
+        # Resolve the principal first so the stream is the only open request
+        await client.get("/api/v1/tasks/", headers=headers)
+        stream = asyncio.create_task(
+            client.get("/api/v1/tasks/stream", headers=headers)
+        )
+        for _ in range(500):
+            if task_events.stats()["subscribers"]:
+                break
+            await asyncio.sleep(0.01)
+        return stream
+
+    async def test_stream_pushes_creates_updates_and_deletes(
+        self, client: httpx.AsyncClient, test_access_token, test_admin_access_token
+    ):
+        headers = {"Authorization": f"Bearer {test_access_token}"}
+        admin_headers = {"Authorization": f"Bearer {test_admin_access_token}"}
+        stream = await self._open_stream(client, headers)
+
+        created = await client.post(
+            "/api/v1/tasks/", json={"title": "Pushed"}, headers=headers
+        )
+        task_id = created.json()["id"]
+        await client.patch(f"/api/v1/tasks/{task_id}/complete", headers=headers)
+        await client.post(
+            "/api/v1/tasks/", json={"title": "Someone else's"}, headers=admin_headers
+        )
+        await client.delete(f"/api/v1/tasks/{task_id}", headers=headers)
+        await task_events.close()
+        response = await asyncio.wait_for(stream, timeout=5)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = self._events(response.text)
+        assert [name for name, _ in events] == [
+            "created",
+            "updated",
+            "deleted",
+            "closed",
+        ]
+        assert events[0][1]["task"] == created.json()
+        assert events[1][1]["task"]["is_completed"] is True
+        assert events[2][1] == {"type": "deleted", "id": task_id}
+        assert task_events.stats()["subscribers"] == 0
+
+    async def test_stream_closes_when_the_token_expires(
+        self, client: httpx.AsyncClient, test_user
+    ):
+        token = create_access_token(
+            data={"sub": str(test_user.id)}, expires_delta=timedelta(seconds=2)
+        )
+        # exp has whole seconds, so the token lives between one and two
+        headers = {"Authorization": f"Bearer {token}"}
+        started = time.monotonic()
+
+        stream = await self._open_stream(client, headers)
+        response = await asyncio.wait_for(stream, timeout=5)
+
+        assert self._events(response.text) == [("closed", {"type": "closed"})]
+        assert time.monotonic() - started < 3
+        assert task_events.stats()["subscribers"] == 0
+
+    @pytest.mark.parametrize("change", ["revoked", "superseded", "deactivated"])
+    async def test_stream_ends_at_the_heartbeat_after_the_token_is_withdrawn(
+        self, client: httpx.AsyncClient, test_user, monkeypatch, change
+    ):
+        monkeypatch.setattr(settings, "TASK_EVENTS_HEARTBEAT_SECONDS", 0.05)
+        token = create_access_token(
+            data={"sub": str(test_user.id), "ver": test_user.token_version}
+        )
+        headers = {"Authorization": f"Bearer {token}"}
+        stream = await self._open_stream(client, headers)
+        await asyncio.sleep(0.2)
+        assert not stream.done()
+
+        async with AsyncSessionLocal() as db:
+            if change == "revoked":
+                payload = decode_access_token(token)
+                expires_at = datetime.fromtimestamp(payload["exp"], timezone.utc)
+                await revoke_token(db, payload["jti"], test_user.id, expires_at)
+            else:
+                values = (
+                    {"token_version": User.token_version + 1}
+                    if change == "superseded"
+                    else {"is_active": False}
+                )
+                await db.execute(
+                    update(User).where(User.id == test_user.id).values(**values)
+                )
+                await db.commit()
+                invalidate_user(test_user.id)
+        response = await asyncio.wait_for(stream, timeout=5)
+
+        assert ": keep-alive" in response.text
+        assert self._events(response.text) == [("closed", {"type": "closed"})]
+        assert task_events.stats()["subscribers"] == 0
+
+    async def test_stream_refuses_when_worker_is_full(
+        self, client: httpx.AsyncClient, test_access_token, monkeypatch
+    ):
+        monkeypatch.setattr(task_events, "max_subscribers", 0)
+        headers = {"Authorization": f"Bearer {test_access_token}"}
+
+        response = await client.get("/api/v1/tasks/stream", headers=headers)
+
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "5"
+
+
+class TestTaskChanges:
+    """GET /tasks/changes: delta sync by change sequence, with tombstones."""
+
+    async def _sync(self, client, headers, since=None, size=100):
+        params = {"size": size}
+        if since is not None:
+            params["since"] = since
+        response = await client.get(
+            "/api/v1/tasks/changes", params=params, headers=headers
+        )
+        assert response.status_code == 200
+        return response.json()
+
+    async def test_since_token_returns_only_later_changes(
+        self, client: httpx.AsyncClient, test_access_token, test_admin_access_token
+    ):
+        headers = {"Authorization": f"Bearer {test_access_token}"}
+        admin_headers = {"Authorization": f"Bearer {test_admin_access_token}"}
+        ids = []
+        for title in ("Kept", "Renamed", "Deleted"):
+            response = await client.post(
+                "/api/v1/tasks/", json={"title": title}, headers=headers
+            )
+            ids.append(response.json()["id"])
+
+        full = await self._sync(client, headers)
+        assert [task["id"] for task in full["tasks"]] == ids
+        assert full["deleted"] == [] and full["has_more"] is False
+
+        await client.put(
+            f"/api/v1/tasks/{ids[1]}", json={"title": "New name"}, headers=headers
+        )
+        await client.delete(f"/api/v1/tasks/{ids[2]}", headers=headers)
+        created = await client.post(
+            "/api/v1/tasks/", json={"title": "Created"}, headers=headers
+        )
+        await client.post(
+            "/api/v1/tasks/", json={"title": "Not mine"}, headers=admin_headers
+        )
+        await client.post(
+            "/api/v1/tasks/import",
+            content=json.dumps({"title": "Imported"}).encode(),
+            headers=headers,
+        )
+
+        delta = await self._sync(client, headers, since=full["sync_token"])
+        assert [task["title"] for task in delta["tasks"]] == [
+            "New name",
+            "Created",
+            "Imported",
+        ]
+        assert delta["tasks"][1] == created.json()
+        assert [tombstone["id"] for tombstone in delta["deleted"]] == [ids[2]]
+        assert delta["has_more"] is False
+
+        empty = await self._sync(client, headers, since=delta["sync_token"])
+        assert empty["tasks"] == [] and empty["deleted"] == []
+
+    async def test_pages_through_changes_in_sequence_order(
+        self, client: httpx.AsyncClient, test_access_token
+    ):
+        headers = {"Authorization": f"Bearer {test_access_token}"}
+        await client.post("/api/v1/tasks/", json={"title": "Before"}, headers=headers)
+        start = (await self._sync(client, headers))["sync_token"]
+        # One bulk write shares a sequence number, so pages split inside it
+        bulk = await client.post(
+            "/api/v1/tasks/bulk",
+            json={"items": [{"title": f"Bulk {n}"} for n in range(5)]},
+            headers=headers,
+        )
+        bulk_ids = [result["id"] for result in bulk.json()["results"]]
+        await client.post(
+            "/api/v1/tasks/bulk/delete", json={"ids": bulk_ids[:2]}, headers=headers
+        )
+
+        seen, deleted, token, pages = [], [], start, 0
+        while True:
+            page = await self._sync(client, headers, since=token, size=2)
+            pages += 1
+            seen += [task["id"] for task in page["tasks"]]
+            deleted += [tombstone["id"] for tombstone in page["deleted"]]
+            token = page["sync_token"]
+            if not page["has_more"]:
+                break
+
+        assert pages == 3
+        assert sorted(seen) == sorted(bulk_ids[2:])
+        assert sorted(deleted) == sorted(bulk_ids[:2])
+
+    async def test_rejects_invalid_and_expired_tokens(
+        self, client: httpx.AsyncClient, test_access_token
+    ):
+        headers = {"Authorization": f"Bearer {test_access_token}"}
+        response = await client.get(
+            "/api/v1/tasks/changes?since=not-a-token", headers=headers
+        )
+        assert response.status_code == 400
+
+        expired = encode_cursor(
+            [0, "", (datetime.now(timezone.utc) - timedelta(days=365)).isoformat()]
+        )
+        response = await client.get(
+            "/api/v1/tasks/changes", params={"since": expired}, headers=headers
+        )
+        assert response.status_code == 410
+
+    async def test_compaction_removes_only_expired_tombstones(self, db, test_user):
+        user_id = test_user.id
+        now = datetime.now(timezone.utc)
+        old_id, recent_id = uuid4(), uuid4()
+        db.add_all(
+            [
+                TaskTombstone(
+                    task_id=old_id,
+                    user_id=user_id,
+                    change_seq=1,
+                    deleted_at=now - timedelta(days=365),
+                ),
+                TaskTombstone(
+                    task_id=recent_id, user_id=user_id, change_seq=2, deleted_at=now
+                ),
+            ]
+        )
+        await db.commit()
+
+        removed = await compact_task_tombstones(db, batch_size=1, max_batches=10)
+
+        assert removed == 1
+        remaining = (await db.scalars(select(TaskTombstone.task_id))).all()
+        assert remaining == [recent_id]
+
+
+class TestArchivedTasks:
+    """?include_archived=true reads tasks the archiver moved out of tasks."""
+
+    async def test_archived_tasks_only_with_include_archived(
+        self,
+        client: httpx.AsyncClient,
+        db,
+        test_access_token,
+        test_admin_access_token,
+    ):
+        headers = {"Authorization": f"Bearer {test_access_token}"}
+        admin_headers = {"Authorization": f"Bearer {test_admin_access_token}"}
+        done = await client.post(
+            "/api/v1/tasks/", json={"title": "Done long ago"}, headers=headers
+        )
+        task_id = done.json()["id"]
+        await client.patch(f"/api/v1/tasks/{task_id}/complete", headers=headers)
+        await client.post("/api/v1/tasks/", json={"title": "Open"}, headers=headers)
+        await db.execute(
+            update(Task)
+            .where(Task.is_completed.is_(True))
+            .values(updated_at=datetime.now(timezone.utc) - timedelta(days=365))
+        )
+        await db.commit()
+        assert await task_archiver.run(db) == 1
+
+        live = (await client.get("/api/v1/tasks/", headers=headers)).json()
+        assert [task["title"] for task in live["items"]] == ["Open"]
+        everything = (
+            await client.get("/api/v1/tasks/?include_archived=true", headers=headers)
+        ).json()
+        assert [task["title"] for task in everything["items"]] == [
+            "Open",
+            "Done long ago",
+        ]
+        assert everything["meta"]["total"] == 2
+
+        response = await client.get(f"/api/v1/tasks/{task_id}", headers=headers)
+        assert response.status_code == 404
+        response = await client.get(
+            f"/api/v1/tasks/{task_id}?include_archived=true", headers=headers
+        )
+        assert response.status_code == 200
+        assert response.json()["is_completed"] is True
+
+        metrics = (await client.get("/api/v1/metrics/", headers=admin_headers)).json()
+        assert metrics["task_archive"]["rows_moved"] == 1
+        assert metrics["task_archive"]["table_sizes"]["archived_tasks"]["table_bytes"]
+
+
+class TestTaskStats:
+    """Per-user and system-wide task statistics from the rollup tables."""
+
+    async def test_user_and_system_stats(
+        self, client: httpx.AsyncClient, test_access_token, test_admin_access_token
+    ):
+        headers = {"Authorization": f"Bearer {test_access_token}"}
+        admin_headers = {"Authorization": f"Bearer {test_admin_access_token}"}
+        for title in ("One", "Two", "Three"):
+            await client.post("/api/v1/tasks/", json={"title": title}, headers=headers)
+        admin_task = await client.post(
+            "/api/v1/tasks/", json={"title": "Admin"}, headers=admin_headers
+        )
+        await client.patch(
+            f"/api/v1/tasks/{admin_task.json()['id']}/complete", headers=admin_headers
+        )
+
+        response = await client.get("/api/v1/tasks/stats?days=3", headers=headers)
+        assert response.status_code == 200
+        stats = response.json()
+        assert (stats["total"], stats["open"], stats["completed"]) == (3, 3, 0)
+        assert stats["completion_rate"] == 0.0
+        assert [day["created"] for day in stats["daily"]] == [0, 0, 3]
+
+        response = await client.get("/api/v1/admin/stats?days=1", headers=headers)
+        assert response.status_code == 403
+
+        response = await client.get("/api/v1/admin/stats?days=1", headers=admin_headers)
+        assert response.status_code == 200
+        system = response.json()
+        assert (system["total"], system["completed"]) == (4, 1)
+        assert system["completion_rate"] == 0.25
+        assert system["daily"] == [
+            {"day": stats["daily"][-1]["day"], "created": 4, "completed": 1}
+        ]
+
+
+class TestBatchedUserTasks:
+    """GET /tasks/users: the first page of several users' tasks in one query."""
+
+    async def test_first_page_per_user_in_one_round_trip(
+        self,
+        client: httpx.AsyncClient,
+        test_user,
+        test_admin_user,
+        test_access_token,
+        test_admin_access_token,
+        sql_statements,
+    ):
+        headers = {"Authorization": f"Bearer {test_access_token}"}
+        admin_headers = {"Authorization": f"Bearer {test_admin_access_token}"}
+        for i in range(5):
+            await client.post(
+                "/api/v1/tasks/", json={"title": f"User {i}"}, headers=headers
+            )
+        await client.post(
+            "/api/v1/tasks/", json={"title": "Admin"}, headers=admin_headers
+        )
+        user_ids = [test_user.id, uuid4(), test_admin_user.id]
+        query = "&".join(f"user_ids={user_id}" for user_id in user_ids)
+        sql_statements.clear()
+
+        response = await client.get(
+            f"/api/v1/tasks/users?{query}&size=2&sort=title&order=asc",
+            headers=admin_headers,
+        )
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["round_trips"] == 1
+        assert len(sql_statements) == 1
+        user_page, admin_page = body["results"]
+        assert user_page["user_id"] == str(test_user.id)
+        assert [task["title"] for task in user_page["items"]] == ["User 0", "User 1"]
+        assert user_page["meta"]["total"] == 5 and user_page["meta"]["pages"] == 3
+        assert [task["title"] for task in admin_page["items"]] == ["Admin"]
+        assert admin_page["meta"]["next_cursor"] is None
+
+        # The cursor carries on in the single-user admin listing
+        response = await client.get(
+            f"/api/v1/tasks/users/{test_user.id}?size=2&sort=title&order=asc"
+            f"&cursor={user_page['meta']['next_cursor']}",
+            headers=admin_headers,
+        )
+        assert [task["title"] for task in response.json()["items"]] == [
+            "User 2",
+            "User 3",
+        ]
+
+        response = await client.get(
+            f"/api/v1/tasks/users?{query}&title_prefix=User%201", headers=admin_headers
+        )
+        body = response.json()
+        # Prefix filters are counted by a grouped count the counters cannot answer
+        assert body["round_trips"] == 2
+        assert [page["meta"]["total"] for page in body["results"]] == [1, 0]
+
+        response = await client.get(f"/api/v1/tasks/users?{query}", headers=headers)
+        assert response.status_code == 403
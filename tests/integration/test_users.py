@@ -219,3 +219,37 @@ async def test_admin_endpoints_require_authentication(
     # Test delete user without auth
     response = await client.delete(f"/api/v1/users/{test_user.id}")
     assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_current_user_is_served_from_cache(
+    client: httpx.AsyncClient, test_access_token
+):
+    from app.core.cache import principal_cache
+
+    headers = {"Authorization": f"Bearer {test_access_token}"}
+    await client.get("/api/v1/users/me", headers=headers)
+    await client.get("/api/v1/users/me", headers=headers)
+
+    stats = principal_cache.stats()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_role_change_invalidates_cached_user(
+    client: httpx.AsyncClient, test_admin_access_token, test_access_token, test_user
+):
+    user_headers = {"Authorization": f"Bearer {test_access_token}"}
+    response = await client.get("/api/v1/users/", headers=user_headers)
+    assert response.status_code == 403
+
+    response = await client.put(
+        f"/api/v1/users/{test_user.id}",
+        json={"role_names": ["admin"]},
+        headers={"Authorization": f"Bearer {test_admin_access_token}"},
+    )
+    assert response.status_code == 200
+
+    response = await client.get("/api/v1/users/", headers=user_headers)
+    assert response.status_code == 200
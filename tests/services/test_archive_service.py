@@ -0,0 +1,158 @@
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.events import task_events
+from app.models.archived_task import ArchivedTask
+from app.models.task import Task
+from app.models.task_counter import TaskCounter
+from app.schemas.task import TaskCreate, TaskFilter, TaskSort
+from app.services import task_service
+from app.services.archive_service import TaskArchiver
+
+
+async def _tasks(db: AsyncSession, user_id, count: int, completed_days_ago=None):
+    """Create count tasks; completed that many days ago if given."""
+    ids = []
+    for _ in range(count):
+        task = await task_service.create_task(
+            TaskCreate(title=f"Task {uuid4().hex[:8]}"), user_id, db
+        )
+        ids.append(task.id)
+    if completed_days_ago is not None:
+        await db.execute(
+            update(Task)
+            .where(Task.id.in_(ids))
+            .values(
+                is_completed=True,
+                updated_at=datetime.now(timezone.utc)
+                - timedelta(days=completed_days_ago),
+            )
+        )
+        await task_service.recompute_task_counters(db, user_id)
+        await db.commit()
+    return ids
+
+
+async def test_archiver_moves_only_long_completed_tasks(db: AsyncSession, test_user):
+    user_id = test_user.id
+    old = await _tasks(db, user_id, 5, completed_days_ago=120)
+    recent = await _tasks(db, user_id, 2, completed_days_ago=10)
+    open_ids = await _tasks(db, user_id, 3)
+    archiver = TaskArchiver(after_days=90, batch_size=2, max_batches=10)
+
+    moved = await archiver.run(db)
+
+    assert moved == 5
+    live = set((await db.scalars(select(Task.id))).all())
+    archived = set((await db.scalars(select(ArchivedTask.id))).all())
+    assert live == set(recent + open_ids)
+    assert archived == set(old)
+    counter = await db.get(TaskCounter, user_id)
+    await db.refresh(counter)
+    assert (counter.total, counter.completed) == (5, 2)
+    assert await task_service.recompute_task_counters(db, user_id) == 0
+
+    stats = archiver.stats()
+    assert stats["rows_moved"] == 5 and stats["runs"] == 1
+    sizes = stats["table_sizes"]
+    assert sizes["archived_tasks"]["table_bytes"] > 0
+    assert sizes["tasks"]["index_bytes"] > 0
+
+    assert await archiver.run(db) == 0
+    assert archiver.stats()["rows_moved"] == 5
+
+
+async def test_include_archived_lists_both_tables(db: AsyncSession, test_user):
+    user_id = test_user.id
+    archived_ids = await _tasks(db, user_id, 4, completed_days_ago=120)
+    live_ids = await _tasks(db, user_id, 3)
+    await TaskArchiver(after_days=90, batch_size=100, max_batches=1).run(db)
+
+    live, total = await task_service.get_tasks_by_user(user_id, db, size=100)
+    assert {task.id for task in live} == set(live_ids) and total == 3
+
+    filters = TaskFilter(include_archived=True, sort=TaskSort.title, order="asc")
+    everything, total = await task_service.get_tasks_by_user(
+        user_id, db, size=100, filters=filters
+    )
+    assert total == 7
+    assert [task.title for task in everything] == sorted(
+        task.title for task in everything
+    )
+    assert {task.id for task in everything} == set(archived_ids + live_ids)
+
+    # Cursor pages merge the two tables without gaps or repeats
+    seen, cursor = [], None
+    while True:
+        page, _ = await task_service.get_tasks_by_user(
+            user_id, db, size=3, cursor=cursor, filters=filters
+        )
+        seen += [task.id for task in page]
+        if len(page) < 3:
+            break
+        cursor = task_service.encode_task_cursor(page[-1], filters.sort)
+    assert seen == [task.id for task in everything]
+
+    page, _ = await task_service.get_tasks_by_user(
+        user_id, db, page=2, size=3, filters=filters
+    )
+    assert [task.id for task in page] == seen[3:6]
+
+    completed = TaskFilter(include_archived=True, is_completed=True)
+    _, total = await task_service.get_tasks_by_user(user_id, db, filters=completed)
+    assert total == 4
+    still_open = TaskFilter(include_archived=True, is_completed=False)
+    _, total = await task_service.get_tasks_by_user(user_id, db, filters=still_open)
+    assert total == 3
+
+    assert await task_service.get_task_by_id(archived_ids[0], user_id, db) is None
+    archived = await task_service.get_task_by_id(
+        archived_ids[0], user_id, db, include_archived=True
+    )
+    assert archived.id == archived_ids[0] and archived.is_completed is True
+    assert await db.scalar(select(func.count(ArchivedTask.id))) == 4
+
+
+async def test_include_archived_total_comes_from_counter(
+    db: AsyncSession, test_user, sql_statements
+):
+    await _tasks(db, test_user.id, 2, completed_days_ago=120)
+    await _tasks(db, test_user.id, 1)
+    await TaskArchiver(after_days=90, batch_size=100, max_batches=1).run(db)
+    sql_statements.clear()
+
+    _, total = await task_service.get_tasks_by_user(
+        test_user.id, db, filters=TaskFilter(include_archived=True)
+    )
+
+    assert total == 3
+    assert not any("count(" in sql for sql in sql_statements)
+
+
+async def test_archiving_is_recorded_for_delta_sync(
+    db: AsyncSession, test_user, monkeypatch
+):
+    user_id = test_user.id
+    archived_ids = await _tasks(db, user_id, 2, completed_days_ago=120)
+    live_ids = await _tasks(db, user_id, 1)
+    before = await task_service.get_task_changes(user_id, db)
+    published = []
+
+    async def publish(owner, events):
+        published.append((owner, events))
+
+    monkeypatch.setattr(task_events, "publish", publish)
+    await TaskArchiver(after_days=90, batch_size=100, max_batches=1).run(db)
+
+    delta = await task_service.get_task_changes(user_id, db, since=before.sync_token)
+    assert delta.tasks == []
+    assert {tombstone.id for tombstone in delta.deleted} == set(archived_ids)
+    full = await task_service.get_task_changes(user_id, db)
+    assert [task.id for task in full.tasks] == live_ids
+    [(owner, events)] = published
+    assert owner == user_id
+    assert {event["type"] for event in events} == {"archived"}
+    assert {event["id"] for event in events} == {str(id) for id in archived_ids}
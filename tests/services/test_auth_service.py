@@ -0,0 +1,105 @@
+import secrets
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.refresh_token import RefreshToken
+from app.services import auth_service
+
+
+async def _add_tokens(db: AsyncSession, user_id, count: int, expires_in: timedelta):
+    for _ in range(count):
+        db.add(
+            RefreshToken(
+                user_id=user_id,
+                selector=secrets.token_urlsafe(12),
+                token_hash=secrets.token_hex(32),
+                expires_at=datetime.now(timezone.utc) + expires_in,
+            )
+        )
+    await db.commit()
+
+
+async def _count_tokens(db: AsyncSession) -> int:
+    result = await db.execute(select(func.count(RefreshToken.id)))
+    return result.scalar()
+
+
+async def test_delete_expired_refresh_tokens(db: AsyncSession, test_user):
+    await _add_tokens(db, test_user.id, 5, timedelta(days=-1))
+    await _add_tokens(db, test_user.id, 2, timedelta(days=1))
+
+    removed = await auth_service.delete_expired_refresh_tokens(
+        db, batch_size=2, max_batches=10
+    )
+
+    assert removed == 5
+    assert await _count_tokens(db) == 2
+
+
+async def test_delete_expired_refresh_tokens_is_bounded(db: AsyncSession, test_user):
+    await _add_tokens(db, test_user.id, 5, timedelta(days=-1))
+
+    removed = await auth_service.delete_expired_refresh_tokens(
+        db, batch_size=2, max_batches=1
+    )
+
+    assert removed == 2
+    assert await _count_tokens(db) == 3
+
+
+async def test_login_rehashes_stale_password(
+    db: AsyncSession, test_user, restore_password_hashing
+):
+    from app.core.security import configure_password_hashing, pwd_context
+
+    test_user.password = pwd_context.handler("bcrypt").using(rounds=4).hash("testpass")
+    await db.commit()
+    configure_password_hashing(
+        "bcrypt",
+        bcrypt_rounds=5,
+        argon2_time_cost=1,
+        argon2_memory_kib=1024,
+        argon2_parallelism=1,
+    )
+
+    await auth_service.authenticate_user(db, "testuser@example.com", "testpass")
+    await auth_service.wait_for_pending_rehashes()
+
+    await db.refresh(test_user)
+    assert test_user.password.startswith("$2b$05$")
+
+
+async def test_revocation_filter_refresh_loads_revoked_tokens(
+    db: AsyncSession, test_user
+):
+    from app.services.revocation_service import revocation_list, revoke_token
+
+    expires_at = datetime.now(timezone.utc) + timedelta(minutes=5)
+    await revoke_token(db, "revoked-jti", test_user.id, expires_at)
+    revocation_list.reset()
+    assert not await revocation_list.is_revoked("revoked-jti", db)
+
+    loaded = await revocation_list.refresh(db)
+
+    assert loaded == 1
+    assert await revocation_list.is_revoked("revoked-jti", db)
+
+
+async def test_revocation_filter_refresh_keeps_tokens_revoked_meanwhile(
+    db: AsyncSession, monkeypatch
+):
+    from app.services.revocation_service import revocation_list
+
+    execute = db.execute
+
+    async def revoke_during_query(*args, **kwargs):
+        # Revoked on this worker while the refresh query is in flight
+        revocation_list.add("revoked-meanwhile")
+        return await execute(*args, **kwargs)
+
+    monkeypatch.setattr(db, "execute", revoke_during_query)
+    await revocation_list.refresh(db)
+
+    assert "revoked-meanwhile" in revocation_list.filter
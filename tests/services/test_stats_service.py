@@ -0,0 +1,140 @@
+import re
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.task import Task
+from app.models.task_daily_stat import TaskDailyStat
+from app.models.task_system_counter import TaskSystemCounter
+from app.models.task_system_daily_stat import TaskSystemDailyStat
+from app.schemas.task import TaskCreate
+from app.services import stats_service, task_service
+from app.services.archive_service import TaskArchiver
+
+
+async def test_rollups_follow_task_writes(db: AsyncSession, test_user):
+    user_id = test_user.id
+    tasks = [
+        await task_service.create_task(TaskCreate(title=f"Task {i}"), user_id, db)
+        for i in range(5)
+    ]
+    await task_service.mark_task_completed(tasks[0].id, user_id, db)
+    await task_service.mark_task_completed(tasks[1].id, user_id, db)
+    # A no-op toggle takes back the completion it counted up front
+    await task_service.mark_task_completed(tasks[1].id, user_id, db)
+    await task_service.delete_task(tasks[4].id, user_id, db)
+
+    stats = await stats_service.get_user_task_stats(user_id, db, days=7)
+
+    assert (stats.total, stats.open, stats.completed, stats.archived) == (4, 2, 2, 0)
+    assert stats.completion_rate == 0.5
+    assert len(stats.daily) == 7
+    today = stats.daily[-1]
+    assert today.day == datetime.now(timezone.utc).date()
+    # Daily counts record events, so the deleted task still counts as created
+    assert (today.created, today.completed) == (5, 2)
+    assert all(day.created == 0 for day in stats.daily[:-1])
+
+    system = await stats_service.get_system_task_stats(db, days=7)
+    assert (system.total, system.completed) == (4, 2)
+    assert (system.daily[-1].created, system.daily[-1].completed) == (5, 2)
+
+
+async def test_archived_tasks_move_between_rollups(db: AsyncSession, test_user):
+    user_id = test_user.id
+    for i in range(3):
+        task = await task_service.create_task(
+            TaskCreate(title=f"Task {i}"), user_id, db
+        )
+        await task_service.mark_task_completed(task.id, user_id, db)
+    await db.execute(
+        update(Task).values(updated_at=datetime.now(timezone.utc) - timedelta(days=120))
+    )
+    await db.commit()
+    await TaskArchiver(after_days=90, batch_size=100, max_batches=1).run(db)
+
+    for stats in (
+        await stats_service.get_user_task_stats(user_id, db),
+        await stats_service.get_system_task_stats(db),
+    ):
+        assert (stats.total, stats.completed, stats.archived) == (3, 3, 3)
+        assert stats.open == 0 and stats.completion_rate == 1.0
+
+
+async def test_stats_reads_never_touch_tasks(
+    db: AsyncSession, test_user, sql_statements
+):
+    for i in range(3):
+        await task_service.create_task(TaskCreate(title=f"Task {i}"), test_user.id, db)
+    sql_statements.clear()
+
+    await stats_service.get_user_task_stats(test_user.id, db)
+    await stats_service.get_system_task_stats(db)
+
+    assert len(sql_statements) == 4
+    assert not any(re.search(r"\btasks\b", sql) for sql in sql_statements)
+
+
+async def test_uncompleting_never_makes_a_day_negative(db: AsyncSession, test_user):
+    task = await task_service.create_task(TaskCreate(title="Task"), test_user.id, db)
+    await task_service.mark_task_completed(task.id, test_user.id, db)
+    # As if the task had been created and completed yesterday
+    yesterday = datetime.now(timezone.utc).date() - timedelta(days=1)
+    for model in (TaskDailyStat, TaskSystemDailyStat):
+        await db.execute(update(model).values(day=yesterday))
+    await db.commit()
+
+    await task_service.mark_task_incomplete(task.id, test_user.id, db)
+
+    for stats in (
+        await stats_service.get_user_task_stats(test_user.id, db, days=2),
+        await stats_service.get_system_task_stats(db, days=2),
+    ):
+        assert [(day.created, day.completed) for day in stats.daily] == [
+            (1, 1),
+            (0, 0),
+        ]
+
+
+async def test_reconciliation_repairs_system_drift(db: AsyncSession, test_user):
+    for i in range(4):
+        await task_service.create_task(TaskCreate(title=f"Task {i}"), test_user.id, db)
+    shard = stats_service.stats_shard(test_user.id)
+    await db.execute(
+        update(TaskSystemCounter)
+        .where(TaskSystemCounter.shard == shard)
+        .values(total=40, completed=9)
+    )
+    db.add(TaskSystemCounter(shard=shard + 1, total=1, completed=0, archived=0))
+    await db.commit()
+
+    assert await stats_service.recompute_system_counters(db) == 2
+
+    system = await stats_service.get_system_task_stats(db)
+    assert (system.total, system.completed) == (4, 0)
+    assert await stats_service.recompute_system_counters(db) == 0
+
+
+async def test_reconciliation_keeps_writes_made_while_it_runs(
+    db: AsyncSession, test_user, monkeypatch
+):
+    await task_service.create_task(TaskCreate(title="Before"), test_user.id, db)
+    await db.execute(update(TaskSystemCounter).values(total=40))
+    await db.commit()
+    add_to_row = stats_service._add_to_row
+    pending = [TaskCreate(title="During")]
+
+    async def write_first(*args, **kwargs):
+        # A task write landing between the read and the repair
+        if pending:
+            await task_service.create_task(pending.pop(), test_user.id, db)
+        await add_to_row(*args, **kwargs)
+
+    monkeypatch.setattr(stats_service, "_add_to_row", write_first)
+    assert await stats_service.recompute_system_counters(db) == 1
+    monkeypatch.undo()
+
+    system = await stats_service.get_system_task_stats(db)
+    assert system.total == 2
+    assert await stats_service.recompute_system_counters(db) == 0
@@ -0,0 +1,145 @@
+"""
+Query-plan checks for the task list: every supported filter and sort must
+seek on a (user_id, ...) index instead of scanning tasks.
+
+Plans come from SQLite's EXPLAIN QUERY PLAN on the statement the service
+actually sends; the same indexes exist on Postgres through the migrations.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.schemas.task import TaskCreate, TaskFilter
+from app.services import task_service
+from tests.conftest import test_engine
+
+NOW = datetime.now(timezone.utc)
+
+FILTERS = [
+    TaskFilter(),
+    TaskFilter(is_completed=True),
+    TaskFilter(is_completed=False),
+    TaskFilter(created_after=NOW - timedelta(days=1)),
+    TaskFilter(created_after=NOW - timedelta(days=1), created_before=NOW),
+    TaskFilter(is_completed=False, created_before=NOW),
+    TaskFilter(sort="updated_at"),
+    TaskFilter(sort="updated_at", updated_after=NOW - timedelta(days=1)),
+    TaskFilter(sort="title", order="asc"),
+    TaskFilter(sort="title", title_prefix="Task 1"),
+    TaskFilter(title_prefix="Task"),
+    TaskFilter(sort="created_at", order="asc"),
+]
+
+# Combinations whose sort comes straight off the index, with no extra sort step
+INDEX_ORDERED = [
+    TaskFilter(),
+    TaskFilter(is_completed=False),
+    TaskFilter(sort="updated_at"),
+    TaskFilter(sort="title", order="asc"),
+    TaskFilter(sort="title", title_prefix="Task 1"),
+]
+
+
+async def _first_plan(db: AsyncSession, call, prefix: str):
+    """Plan of the first statement starting with prefix that call() sends."""
+    captured = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith(prefix):
+            captured.append((statement, parameters))
+
+    event.listen(test_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        await call()
+    finally:
+        event.remove(test_engine.sync_engine, "before_cursor_execute", record)
+
+    statement, parameters = captured[0]
+    connection = await db.connection()
+    result = await connection.exec_driver_sql(
+        f"EXPLAIN QUERY PLAN {statement}", parameters
+    )
+    return [row[-1] for row in result]
+
+
+async def _plan(db: AsyncSession, test_user, filters: TaskFilter, **kwargs):
+    return await _first_plan(
+        db,
+        lambda: task_service.get_tasks_by_user(
+            test_user.id, db, filters=filters, **kwargs
+        ),
+        "SELECT tasks.id",
+    )
+
+
+@pytest.fixture
+async def tasks(db: AsyncSession, test_user):
+    for i in range(20):
+        await task_service.create_task(TaskCreate(title=f"Task {i}"), test_user.id, db)
+    await db.execute(text("ANALYZE"))
+
+
+@pytest.mark.parametrize("filters", FILTERS, ids=repr)
+async def test_task_filters_use_an_index(db: AsyncSession, test_user, tasks, filters):
+    plan = await _plan(db, test_user, filters)
+
+    task_steps = [step for step in plan if " tasks " in f"{step} "]
+    assert task_steps, plan
+    for step in task_steps:
+        assert step.startswith("SEARCH tasks USING"), plan
+
+
+@pytest.mark.parametrize("filters", INDEX_ORDERED, ids=repr)
+async def test_task_sorts_come_from_the_index(
+    db: AsyncSession, test_user, tasks, filters
+):
+    page, _ = await task_service.get_tasks_by_user(test_user.id, db, filters=filters)
+    cursor = task_service.encode_task_cursor(page[-1], filters.sort)
+
+    for kwargs in ({}, {"cursor": cursor}):
+        plan = await _plan(db, test_user, filters, **kwargs)
+        assert not any("TEMP B-TREE" in step for step in plan), plan
+
+
+async def test_task_list_etag_reads_only_indexes(db: AsyncSession, test_user, tasks):
+    plan = await _first_plan(
+        db, lambda: task_service.task_list_etag(test_user.id, db), "SELECT (SELECT"
+    )
+
+    assert any("ix_tasks_user_id_modified_at_id" in step for step in plan), plan
+    assert not any(step.startswith("SCAN task") for step in plan), plan
+
+
+@pytest.mark.parametrize("prefix", ["SELECT tasks.", "SELECT task_tombstones."])
+async def test_task_changes_come_from_the_index(
+    db: AsyncSession, test_user, tasks, prefix
+):
+    since = (await task_service.get_task_changes(test_user.id, db, size=5)).sync_token
+
+    plan = await _first_plan(
+        db,
+        lambda: task_service.get_task_changes(test_user.id, db, since=since),
+        prefix,
+    )
+
+    assert any("change_seq" in step for step in plan), plan
+    assert not any("TEMP B-TREE" in step for step in plan), plan
+
+
+@pytest.mark.parametrize("filters", INDEX_ORDERED, ids=repr)
+async def test_include_archived_seeks_both_tables(
+    db: AsyncSession, test_user, tasks, filters
+):
+    filters = filters.model_copy(update={"include_archived": True})
+    plan = await _first_plan(
+        db,
+        lambda: task_service.get_tasks_by_user(test_user.id, db, filters=filters),
+        "SELECT anon_1.id",
+    )
+
+    for table in ("tasks", "archived_tasks"):
+        assert any(step.startswith(f"SEARCH {table} USING") for step in plan), plan
+        assert not any(step.startswith(f"SCAN {table}") for step in plan), plan
@@ -1,9 +1,23 @@
+import json
+import os
+import random
 from uuid import uuid4
 
 import pytest
+from fastapi import HTTPException
+from sqlalchemy import delete, func, select, text, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.schemas.task import TaskCreate, TaskUpdate
+from app.core.response_cache import task_list_cache
+from app.models.task import Task
+from app.models.task_counter import TaskCounter
+from app.schemas.task import (
+    TaskBulkUpdateItem,
+    TaskCreate,
+    TaskFilter,
+    TaskSort,
+    TaskUpdate,
+)
 from app.services import task_service
 
 
@@ -17,6 +31,22 @@ async def test_create_task_service_works(db: AsyncSession, test_user):
     assert created_task.is_completed is False
 
 
+async def test_writes_survive_cache_invalidation_failures(
+    db: AsyncSession, test_user, monkeypatch
+):
+    async def unavailable(key):
+        raise ConnectionError("cache backend unavailable")
+
+    monkeypatch.setattr(task_list_cache, "enabled", True)
+    monkeypatch.setattr(task_list_cache.backend, "bump", unavailable)
+
+    task = await task_service.create_task(TaskCreate(title="Task"), test_user.id, db)
+    await task_service.mark_task_completed(task.id, test_user.id, db)
+    assert await task_service.delete_task(task.id, test_user.id, db)
+
+    assert task_list_cache.stats()["invalidation_failures"] == 3
+
+
 async def test_get_tasks_by_user(db: AsyncSession, test_user):
     # Create multiple tasks
     task1 = TaskCreate(title="Task 1", description="First task")
@@ -167,3 +197,317 @@ async def test_mark_task_incomplete(db: AsyncSession, test_user):
     )
 
     assert incomplete_task.is_completed is False
+
+
+async def test_get_tasks_by_user_cursor_walks_every_task_once(
+    db: AsyncSession, test_user
+):
+    for i in range(15):
+        task = TaskCreate(title=f"Task {i+1}", description=f"Description {i+1}")
+        await task_service.create_task(task, test_user.id, db)
+
+    seen = []
+    cursor = None
+    while True:
+        tasks, total = await task_service.get_tasks_by_user(
+            test_user.id, db, size=4, cursor=cursor
+        )
+        assert total == 15
+        seen.extend(tasks)
+        if len(tasks) < 4:
+            break
+        cursor = task_service.encode_task_cursor(tasks[-1])
+
+    assert len(seen) == 15
+    assert len({task.id for task in seen}) == 15
+    offset_tasks, _ = await task_service.get_tasks_by_user(test_user.id, db, size=15)
+    assert [task.id for task in seen] == [task.id for task in offset_tasks]
+
+
+async def test_get_tasks_by_user_invalid_cursor(db: AsyncSession, test_user):
+    with pytest.raises(HTTPException) as exc_info:
+        await task_service.get_tasks_by_user(test_user.id, db, cursor="not-a-cursor")
+
+    assert exc_info.value.status_code == 400
+
+
+async def _counter(db: AsyncSession, user_id):
+    result = await db.execute(
+        select(TaskCounter.total, TaskCounter.completed).where(
+            TaskCounter.user_id == user_id
+        )
+    )
+    return tuple(result.one())
+
+
+async def _actual(db: AsyncSession, user_id):
+    total = await db.scalar(select(func.count(Task.id)).where(Task.user_id == user_id))
+    completed = await db.scalar(
+        select(func.count(Task.id)).where(
+            Task.user_id == user_id, Task.is_completed.is_(True)
+        )
+    )
+    return total, completed
+
+
+async def test_task_counters_never_drift(db: AsyncSession, test_user):
+    rng = random.Random(1234)
+    task_ids = []
+
+    for _ in range(60):
+        operation = rng.choice(["create", "create", "complete", "incomplete", "delete"])
+        if operation == "create" or not task_ids:
+            task = await task_service.create_task(
+                TaskCreate(title="Task"), test_user.id, db
+            )
+            task_ids.append(task.id)
+        elif operation == "complete":
+            # Repeated toggles of the same task must not double count
+            await task_service.mark_task_completed(
+                rng.choice(task_ids), test_user.id, db
+            )
+        elif operation == "incomplete":
+            await task_service.mark_task_incomplete(
+                rng.choice(task_ids), test_user.id, db
+            )
+        else:
+            task_id = task_ids.pop(rng.randrange(len(task_ids)))
+            await task_service.delete_task(task_id, test_user.id, db)
+
+        assert await _counter(db, test_user.id) == await _actual(db, test_user.id)
+
+    _, total = await task_service.get_tasks_by_user(test_user.id, db)
+    assert total == len(task_ids)
+    assert await task_service.recompute_task_counters(db) == 0
+
+
+async def test_get_tasks_by_user_total_comes_from_counter(db: AsyncSession, test_user):
+    await task_service.create_task(TaskCreate(title="Task"), test_user.id, db)
+    await db.execute(
+        update(TaskCounter).where(TaskCounter.user_id == test_user.id).values(total=42)
+    )
+    await db.commit()
+
+    _, total = await task_service.get_tasks_by_user(test_user.id, db)
+    assert total == 42
+    # Past the last page there is no row to carry the subquery
+    _, total = await task_service.get_tasks_by_user(test_user.id, db, page=5)
+    assert total == 42
+
+
+async def test_recompute_task_counters_repairs_drift(db: AsyncSession, test_user):
+    for _ in range(3):
+        task = await task_service.create_task(
+            TaskCreate(title="Task"), test_user.id, db
+        )
+    await task_service.mark_task_completed(task.id, test_user.id, db)
+    await db.execute(
+        update(TaskCounter)
+        .where(TaskCounter.user_id == test_user.id)
+        .values(total=0, completed=7)
+    )
+    await db.commit()
+
+    assert await task_service.recompute_task_counters(db, test_user.id) == 1
+    await db.commit()
+
+    assert await _counter(db, test_user.id) == (3, 1)
+    assert await task_service.recompute_task_counters(db) == 0
+
+
+async def test_reconcile_task_counters_goes_through_users_in_batches(
+    db: AsyncSession, test_user, test_admin_user
+):
+    for user in (test_user, test_admin_user):
+        await task_service.create_task(TaskCreate(title="Task"), user.id, db)
+    await db.execute(update(TaskCounter).values(total=5))
+    await db.commit()
+
+    assert await task_service.reconcile_task_counters(db, batch_size=1) == 2
+
+    for user in (test_user, test_admin_user):
+        assert await _counter(db, user.id) == (1, 0)
+    assert await task_service.reconcile_task_counters(db, batch_size=1) == 0
+
+
+async def test_bulk_operations_keep_counters_in_step(db: AsyncSession, test_user):
+    created = await task_service.create_tasks_bulk(
+        [TaskCreate(title=f"Task {i}") for i in range(6)], test_user.id, db
+    )
+    ids = [result.id for result in created]
+
+    await task_service.update_tasks_bulk(
+        [
+            TaskBulkUpdateItem(id=task_id, is_completed=True)
+            for task_id in ids[:4] + [uuid4()]
+        ],
+        test_user.id,
+        db,
+    )
+    # Re-completing an already completed task must not count twice
+    await task_service.update_tasks_bulk(
+        [TaskBulkUpdateItem(id=ids[0], is_completed=True)], test_user.id, db
+    )
+    await task_service.delete_tasks_bulk([ids[0], ids[5]], test_user.id, db)
+
+    assert await _counter(db, test_user.id) == (4, 3)
+    assert await _counter(db, test_user.id) == await _actual(db, test_user.id)
+
+
+async def _chunked(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+async def test_import_tasks_in_batches_from_split_chunks(
+    db: AsyncSession, test_user, monkeypatch
+):
+    monkeypatch.setattr(task_service.settings, "TASK_IMPORT_BATCH_SIZE", 3)
+    monkeypatch.setattr(task_service.settings, "TASK_IMPORT_MAX_ERRORS", 1)
+    lines = ["\ufefftitle,description"]
+    lines += [f"Tâche {index},Row {index}" for index in range(10)]
+    lines += ['"Multi, line","first\nsecond"', ",missing title", "too,many,fields"]
+    # Three-byte chunks split the BOM, the multi-byte characters and the lines
+    data = "\r\n".join(lines).encode()
+
+    result = await task_service.import_tasks(
+        _chunked(data, 3), test_user.id, db, import_format="csv"
+    )
+
+    assert result.imported == 11
+    assert result.failed == 2
+    assert len(result.errors) == 1
+    assert result.errors[0].line == 14
+    assert await _counter(db, test_user.id) == (11, 0)
+    assert await _counter(db, test_user.id) == await _actual(db, test_user.id)
+    multi_line = await db.scalar(
+        select(Task).where(Task.user_id == test_user.id, Task.title == "Multi, line")
+    )
+    assert multi_line.description == "first\nsecond"
+    assert await db.scalar(select(Task.title).where(Task.description == "Row 9")) == (
+        "Tâche 9"
+    )
+
+
+async def test_import_rows_track_quotes_across_long_fields():
+    long_field = "\n".join(f'say ""{index}""' for index in range(5000))
+    data = f'title,description\nLong,"{long_field}"\nNext,row\nOpen,"never closed\n'
+
+    rows = [
+        row
+        async for row in task_service._iter_import_rows(
+            _chunked(data.encode(), 4096), "csv"
+        )
+    ]
+
+    assert rows[0] == (
+        2,
+        {"title": "Long", "description": long_field.replace('""', '"')},
+    )
+    assert rows[1] == (5002, {"title": "Next", "description": "row"})
+    assert rows[2] == (5003, "Unterminated quoted field")
+
+
+async def test_import_tasks_rejects_non_utf8(db: AsyncSession, test_user):
+    user_id = test_user.id
+    with pytest.raises(HTTPException) as exc_info:
+        await task_service.import_tasks(_chunked(b'{"title": "\xff"}', 64), user_id, db)
+
+    assert exc_info.value.status_code == 400
+    assert await _actual(db, user_id) == (0, 0)
+
+
+async def test_import_tasks_reads_the_whole_upload_before_loading(
+    db: AsyncSession, test_user, sql_statements
+):
+    async def slow_upload():
+        for index in range(3):
+            # Nothing reaches the database while the client is still sending
+            assert sql_statements == []
+            yield json.dumps({"title": f"Task {index}"}).encode() + b"\n"
+
+    result = await task_service.import_tasks(slow_upload(), test_user.id, db)
+
+    assert result.imported == 3
+    assert await _actual(db, test_user.id) == (3, 0)
+
+
+@pytest.mark.parametrize(
+    "setting, limit", [("TASK_IMPORT_MAX_ROWS", 2), ("TASK_IMPORT_MAX_BYTES", 40)]
+)
+async def test_import_tasks_refuses_oversized_uploads(
+    db: AsyncSession, test_user, monkeypatch, setting, limit
+):
+    monkeypatch.setattr(task_service.settings, setting, limit)
+    data = b"".join(b'{"title": "Task"}\n' for _ in range(3))
+
+    with pytest.raises(HTTPException) as exc_info:
+        await task_service.import_tasks(_chunked(data, 8), test_user.id, db)
+
+    assert exc_info.value.status_code == 413
+    assert await _actual(db, test_user.id) == (0, 0)
+
+
+def _rss_bytes() -> int:
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+@pytest.mark.slow
+@pytest.mark.skipif(not os.path.exists("/proc/self/statm"), reason="needs Linux /proc")
+async def test_stream_tasks_export_memory_stays_flat(db: AsyncSession, test_user):
+    rows = 500_000
+    await db.execute(
+        text(
+            """
+            WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < :rows)
+            INSERT INTO tasks (id, title, description, is_completed, user_id, created_at)
+            SELECT 'a' || substr(lower(hex(randomblob(16))), 2), 'Task ' || i, 'Exported task ' || i,
+                   i % 2, :user_id, datetime('now', '-' || i || ' seconds')
+            FROM n
+            """
+        ),
+        {"rows": rows, "user_id": test_user.id.hex},
+    )
+    await db.commit()
+
+    # Resident set size sampled per chunk; tracemalloc would slow this 7x
+    baseline = _rss_bytes()
+    peak = baseline
+    exported = 0
+    async for chunk in task_service.stream_tasks_export(test_user.id, db):
+        exported += chunk.count(b"\n")
+        peak = max(peak, _rss_bytes())
+
+    assert exported == rows
+    # Materializing the rows alone would take hundreds of megabytes
+    assert peak - baseline < 32 * 1024 * 1024
+
+
+async def test_get_tasks_for_users_matches_per_user_pages(
+    db: AsyncSession, test_user, test_admin_user
+):
+    for i in range(7):
+        await task_service.create_task(TaskCreate(title=f"Task {i}"), test_user.id, db)
+    await task_service.create_task(TaskCreate(title="Admin"), test_admin_user.id, db)
+    # A user whose counter row is missing is counted separately
+    await db.execute(delete(TaskCounter).where(TaskCounter.user_id == test_user.id))
+    await db.commit()
+    user_ids = [test_admin_user.id, test_user.id]
+
+    for filters in (
+        TaskFilter(),
+        TaskFilter(sort=TaskSort.title, order="asc"),
+        TaskFilter(sort=TaskSort.updated_at, is_completed=False),
+    ):
+        pages, round_trips = await task_service.get_tasks_for_users(
+            user_ids, db, size=3, filters=filters
+        )
+        assert list(pages) == user_ids
+        assert round_trips == 2
+        for user_id, (tasks, total) in pages.items():
+            expected, expected_total = await task_service.get_tasks_by_user(
+                user_id, db, size=3, filters=filters
+            )
+            assert [task.id for task in tasks] == [task.id for task in expected]
+            assert total == expected_total
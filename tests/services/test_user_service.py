@@ -4,6 +4,7 @@ import pytest
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.models.task_counter import TaskCounter
 from app.schemas.user import UserCreate, UserUpdate
 from app.services import user_service
 
@@ -18,6 +19,8 @@ async def test_create_user_service_works(db: AsyncSession):
     created_user = await user_service.create_user(new_user, db)
 
     assert created_user.full_name == "John Doe"
+    counter = await db.get(TaskCounter, created_user.id)
+    assert (counter.total, counter.completed) == (0, 0)
 
 
 async def test_get_user_by_id_success(db: AsyncSession):